@@ -2,23 +2,34 @@
 
 from __future__ import annotations
 
-import dataclasses
+import asyncio
+import time
+from collections.abc import Mapping
 from datetime import timedelta
 from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_HOST, Platform
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from ta_cmi import CoE
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers.start import async_at_started
+from ta_cmi import ApiError, CoE, CoEServerConfig
 
 from .const import (
     ANALOG_DOMAINS,
     CONF_ANALOG_ENTITIES,
     CONF_CAN_IDS,
+    CONF_CAN_SCAN_INTERVALS,
     CONF_DIGITAL_ENTITIES,
     CONF_ENTITIES_TO_SEND,
+    CONF_REFRESH_INTERVAL,
     CONF_SCAN_INTERVAL,
+    CONF_SEND_DELAY,
+    CONF_SEND_MAX_DELAY,
+    DATA_SCHEDULER,
+    DEFAULT_REFRESH_INTERVAL,
+    DEFAULT_SEND_DELAY,
+    DEFAULT_SEND_MAX_DELAY,
     DIGITAL_DOMAINS,
     DOMAIN,
     FREE_SLOT_MARKER_ANALOG,
@@ -31,10 +42,16 @@ from .coordinator import CoEDataUpdateCoordinator
 from .issues import check_coe_server_2x_issue
 from .panel import async_register_panel
 from .refresh_task import RefreshTask
+from .scheduler import RefreshScheduler
+from .server_config import ServerConfigCache
+from .session import create_coe_session
+from .snapshot_store import SnapshotStore
 from .state_observer import StateObserver
 from .state_sender import StateSender
 from .state_sender_v1 import StateSenderV1
 from .state_sender_v2 import StateSenderV2
+from .stats import CoEStats, StatsTransport
+from .transport import CoETransport
 from .websocket import async_register_websocket_commands
 
 PLATFORMS: list[str] = [Platform.SENSOR, Platform.BINARY_SENSOR]
@@ -51,8 +68,21 @@ def prepare_send_config(send_config: dict[str, Any]) -> dict[str, Any]:
     }
 
 
+def create_sender(
+    coe: CoETransport,
+    server_config: CoEServerConfig,
+    send_config: dict[str, list[ConfEntityToSend]],
+) -> StateSender:
+    """Create the sender for the protocol version of the server."""
+    if server_config.coe_version == 1:
+        return StateSenderV1(coe, send_config)
+
+    return StateSenderV2(coe, send_config)
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up platform from a ConfigEntry."""
+    setup_start = time.monotonic()
 
     check_coe_server_2x_issue(hass, entry)
 
@@ -63,76 +93,287 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if entry.data.get(CONF_SCAN_INTERVAL, None) is not None:
         update_interval = timedelta(minutes=entry.data.get(CONF_SCAN_INTERVAL))
 
-    coe = CoE(host, async_get_clientsession(hass))
+    session = create_coe_session(hass, entry)
+
+    stats = CoEStats()
+    coe = StatsTransport(CoE(host, session), stats)
 
     can_ids: list[int] = entry.data.get(CONF_CAN_IDS, [])
 
-    coordinator = CoEDataUpdateCoordinator(hass, entry, coe, can_ids, update_interval)
+    can_update_intervals: dict[int, timedelta] = {
+        int(can_id): timedelta(minutes=interval)
+        for can_id, interval in entry.data.get(CONF_CAN_SCAN_INTERVALS, {}).items()
+    }
+
+    scheduler: RefreshScheduler = hass.data.setdefault(
+        DATA_SCHEDULER, RefreshScheduler()
+    )
+
+    snapshot_store = SnapshotStore(hass, entry.entry_id)
+
+    coordinator = CoEDataUpdateCoordinator(
+        hass,
+        entry,
+        coe,
+        can_ids,
+        update_interval,
+        can_update_intervals,
+        scheduler,
+        stats,
+        snapshot_store,
+    )
 
     entry.async_on_unload(entry.add_update_listener(_async_update_listener))
 
-    await coordinator.async_config_entry_first_refresh()
+    server_config_cache = ServerConfigCache(hass, entry.entry_id)
+    cached_server_config = await server_config_cache.async_load()
 
-    server_config = await coe.get_server_config()
+    async def _async_first_refresh() -> None:
+        """Restore the last snapshot or wait for the first poll."""
+        if await coordinator.async_restore_snapshot():
+            # The entities start with the stored values and the live poll
+            # catches up in the background.
+            entry.async_create_background_task(
+                hass, coordinator.async_refresh(), f"{DOMAIN} first refresh"
+            )
+        else:
+            await coordinator.async_config_entry_first_refresh()
+
+            # The entities of a CAN-ID are only created with its first data.
+            if missing_can_ids := coordinator.get_missing_can_ids():
+                raise ConfigEntryNotReady(
+                    f"Could not update CAN-IDs {missing_can_ids}"
+                )
+
+    async def _async_get_server_config() -> CoEServerConfig:
+        """Get the server config or retry the setup later."""
+        try:
+            return await coe.get_server_config()
+        except (TimeoutError, ApiError) as err:
+            raise ConfigEntryNotReady(
+                f"Could not get the CoE server config: {err}"
+            ) from err
+
+    if cached_server_config is None:
+        # A failed job cancels the other one, so nothing keeps polling after
+        # the setup failed.
+        try:
+            async with asyncio.TaskGroup() as group:
+                group.create_task(_async_first_refresh())
+                server_config_task = group.create_task(_async_get_server_config())
+        except ExceptionGroup as err:
+            raise err.exceptions[0] from err
+
+        server_config = server_config_task.result()
+        await server_config_cache.async_save(server_config)
+    else:
+        await _async_first_refresh()
+        server_config = cached_server_config
 
-    _LOGGER.debug(f"CoE server config: Version={server_config.coe_version}")
+    scheduler.register(entry.entry_id)
+
+    _LOGGER.debug("CoE server config: Version=%s", server_config.coe_version)
 
     send_config: dict[str, list[ConfEntityToSend]] = prepare_send_config(
         entry.data.get(CONF_ENTITIES_TO_SEND, {})
     )
 
-    sender: StateSender
+    sender = create_sender(coe, server_config, send_config)
 
-    if server_config.coe_version == 1:
-        sender = StateSenderV1(coe, send_config)
-    else:
-        sender = StateSenderV2(coe, send_config)
+    observer = StateObserver(
+        hass,
+        coe,
+        sender,
+        send_config,
+        entry.data.get(CONF_SEND_DELAY, DEFAULT_SEND_DELAY),
+        entry.data.get(CONF_SEND_MAX_DELAY, DEFAULT_SEND_MAX_DELAY),
+    )
 
-    observer = StateObserver(hass, coe, sender, send_config)
+    refresh_interval: timedelta = DEFAULT_REFRESH_INTERVAL
 
-    task = RefreshTask(sender)
+    if entry.data.get(CONF_REFRESH_INTERVAL, None) is not None:
+        refresh_interval = timedelta(minutes=entry.data.get(CONF_REFRESH_INTERVAL))
+
+    task = RefreshTask(sender, refresh_interval, scheduler, entry.entry_id, stats)
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {
         "coordinator": coordinator,
         "observer": observer,
+        "sender": sender,
         "task": task,
+        "stats": stats,
+        "session": session,
+        "config": dict(entry.data),
     }
 
+    if cached_server_config is not None:
+        entry.async_create_background_task(
+            hass,
+            _async_revalidate_server_config(
+                hass, entry, coe, server_config_cache, cached_server_config
+            ),
+            f"{DOMAIN} revalidate server config",
+        )
+
     async_register_websocket_commands(hass)
-    await async_register_panel(hass)
 
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    await asyncio.gather(
+        async_register_panel(hass),
+        hass.config_entries.async_forward_entry_setups(entry, PLATFORMS),
+    )
 
-    if (
-        len(send_config.get(CONF_ANALOG_ENTITIES, []))
-        + len(send_config.get(CONF_DIGITAL_ENTITIES, []))
-        > 0
-    ):
-        await observer.get_all_states()
-        await task.start()
+    if sender.has_entities():
+
+        @callback
+        def _async_start_sending(_hass: HomeAssistant) -> None:
+            """Send all exposed states once Home Assistant has started."""
+            entry.async_create_background_task(
+                hass, _async_send_all_states(observer, task), f"{DOMAIN} initial send"
+            )
+
+        entry.async_on_unload(async_at_started(hass, _async_start_sending))
+
+    stats.setup_time = time.monotonic() - setup_start
+    _LOGGER.debug("Setup of %s took %.3f s", entry.title, stats.setup_time)
 
     return True
 
 
+async def _async_revalidate_server_config(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    coe: CoETransport,
+    server_config_cache: ServerConfigCache,
+    cached_server_config: CoEServerConfig,
+) -> None:
+    """Check the cached server config and swap the sender if it changed."""
+    try:
+        server_config = await coe.get_server_config()
+    except (TimeoutError, ApiError) as err:
+        _LOGGER.debug("Failed to revalidate the CoE server config: %s", err)
+        return
+
+    if server_config == cached_server_config:
+        return
+
+    _LOGGER.info(
+        "CoE server version changed from %s to %s",
+        cached_server_config.coe_version,
+        server_config.coe_version,
+    )
+
+    await server_config_cache.async_save(server_config)
+
+    entry_data: dict[str, Any] | None = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+
+    if entry_data is None:
+        return
+
+    observer: StateObserver = entry_data["observer"]
+    task: RefreshTask = entry_data["task"]
+
+    send_config: dict[str, list[ConfEntityToSend]] = prepare_send_config(
+        entry.data.get(CONF_ENTITIES_TO_SEND, {})
+    )
+    sender = create_sender(coe, server_config, send_config)
+
+    entry_data["sender"] = sender
+    observer.set_sender(sender)
+    task.set_sender(sender)
+
+    if not sender.has_entities():
+        return
+
+    try:
+        await observer.get_all_states()
+    except (TimeoutError, ApiError) as err:
+        # The refresh task sends the states later with the new sender.
+        _LOGGER.warning("Failed to send all states to the server: %s", err)
+
+
+async def _async_send_all_states(observer: StateObserver, task: RefreshTask) -> None:
+    """Send all exposed states and start the refresh task."""
+    try:
+        await observer.get_all_states()
+    except (TimeoutError, ApiError) as err:
+        _LOGGER.warning("Failed to send all states to the server: %s", err)
+    finally:
+        # The refresh task sends the states later if the server is unreachable.
+        await task.start()
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     task: RefreshTask = hass.data[DOMAIN][entry.entry_id]["task"]
+    observer: StateObserver = hass.data[DOMAIN][entry.entry_id]["observer"]
 
     await task.stop()
+    observer.stop()
+
+    hass.data[DATA_SCHEDULER].unregister(entry.entry_id)
 
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the cached data of a config entry."""
+    await ServerConfigCache(hass, entry.entry_id).async_remove()
+    await SnapshotStore(hass, entry.entry_id).async_remove()
+
+
 async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Handle options update."""
     config = dict(entry.data)
     if entry.options:
         config.update(entry.options)
+        # The update calls this listener again with the merged data.
         hass.config_entries.async_update_entry(entry, data=config, options={})
+        return
+
+    entry_data: dict[str, Any] | None = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+
+    if entry_data is not None and _is_only_send_config_changed(
+        entry_data["config"], entry.data
+    ):
+        await _async_update_send_config(hass, entry, entry_data)
+        return
 
     await hass.config_entries.async_reload(entry.entry_id)
 
 
+def _is_only_send_config_changed(
+    old_config: Mapping[str, Any], new_config: Mapping[str, Any]
+) -> bool:
+    """Check if the configs differ only in the exposed entities."""
+    return {k: v for k, v in old_config.items() if k != CONF_ENTITIES_TO_SEND} == {
+        k: v for k, v in new_config.items() if k != CONF_ENTITIES_TO_SEND
+    }
+
+
+async def _async_update_send_config(
+    hass: HomeAssistant, entry: ConfigEntry, entry_data: dict[str, Any]
+) -> None:
+    """Apply a changed exposed entity config without reloading the entry."""
+    _LOGGER.debug("Apply exposed entities without reload")
+
+    observer: StateObserver = entry_data["observer"]
+    sender: StateSender = entry_data["sender"]
+    task: RefreshTask = entry_data["task"]
+
+    entry_data["config"] = dict(entry.data)
+
+    try:
+        await observer.async_set_entity_config(
+            prepare_send_config(entry.data.get(CONF_ENTITIES_TO_SEND, {}))
+        )
+    except (TimeoutError, ApiError) as err:
+        _LOGGER.warning("Failed to send the changed states to the server: %s", err)
+    finally:
+        # The refresh task sends the states later if the server is unreachable.
+        if sender.has_entities():
+            await task.start()
+
+
 async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Migrate the config to the new format."""
 
@@ -166,12 +407,12 @@ async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         domain = entity_id.split(".")[0]
         if domain in DIGITAL_DOMAINS:
             new_sending_data[CONF_DIGITAL_ENTITIES].append(
-                dataclasses.asdict(ConfEntityToSend(digital_id, entity_id))
+                ConfEntityToSend(digital_id, entity_id).to_dict()
             )
             digital_id += 1
         elif domain in ANALOG_DOMAINS:
             new_sending_data[CONF_ANALOG_ENTITIES].append(
-                dataclasses.asdict(ConfEntityToSend(analog_id, entity_id))
+                ConfEntityToSend(analog_id, entity_id).to_dict()
             )
             analog_id += 1
 
@@ -2,19 +2,17 @@
 
 from __future__ import annotations
 
-from typing import Any
-
 from homeassistant.components.binary_sensor import BinarySensorEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import CoEDataUpdateCoordinator
 from .const import (
     DOMAIN,
     TYPE_BINARY,
 )
+from .entity import CoEChannelEntity
 
 
 async def async_setup_entry(
@@ -39,28 +37,20 @@ async def async_setup_entry(
     async_add_entities(entities)
 
 
-class DeviceChannelBinary(CoordinatorEntity, BinarySensorEntity):
+class DeviceChannelBinary(CoEChannelEntity, BinarySensorEntity):
     """Representation of an CoE channel."""
 
+    _channel_type = TYPE_BINARY
+
     def __init__(
         self, coordinator: CoEDataUpdateCoordinator, can_id: int, channel_id: int
     ) -> None:
         """Initialize."""
-        super().__init__(coordinator)
-        self._id = channel_id
-        self._can_id = can_id
-        self._coordinator = coordinator
+        super().__init__(coordinator, can_id, channel_id)
 
         self._attr_name: str = f"CoE Digital - CAN{self._can_id} {self._id}"
         self._attr_unique_id: str = f"ta-coe-digital-can{self._can_id}-{self._id}"
 
-    @property
-    def is_on(self) -> bool:
-        """Return the state of the sensor."""
-        channel_raw: dict[str, Any] = self._coordinator.data[self._can_id][TYPE_BINARY][
-            self._id
-        ]
-
-        value: str = channel_raw["value"]
-
-        return value in ("on", "yes")
+    def _update_from_channel(self) -> None:
+        """Update the state from the channel."""
+        self._attr_is_on = self._channel.value in ("on", "yes")
@@ -1,6 +1,7 @@
 """Config flow for Technische Alternative CoE integration."""
 from __future__ import annotations
 
+import math
 from datetime import timedelta
 from typing import Any
 
@@ -19,7 +20,14 @@ from .const import (
     ADDON_HOSTNAME,
     ALLOWED_DOMAINS,
     CONF_CAN_IDS,
+    CONF_CAN_SCAN_INTERVALS,
+    CONF_REFRESH_INTERVAL,
     CONF_SCAN_INTERVAL,
+    CONF_SEND_DELAY,
+    CONF_SEND_MAX_DELAY,
+    DEFAULT_REFRESH_INTERVAL,
+    DEFAULT_SEND_DELAY,
+    DEFAULT_SEND_MAX_DELAY,
     DOMAIN,
     SCAN_INTERVAL,
     _LOGGER,
@@ -50,6 +58,35 @@ def split_can_ids(raw_ids: str) -> list[int]:
     return can_ids
 
 
+def split_can_scan_intervals(raw_intervals: str) -> dict[str, float]:
+    """Split string to scan intervals per CAN-ID."""
+    intervals: dict[str, float] = {}
+
+    for interval_str in raw_intervals.split(","):
+        if not interval_str.strip():
+            continue
+
+        id_str, _, minutes_str = interval_str.partition("=")
+        can_id = split_can_ids(id_str)[0]
+
+        try:
+            minutes = float(minutes_str)
+        except ValueError as err:
+            raise ScanIntervalError(interval_str) from err
+
+        if not math.isfinite(minutes) or minutes < 0.1 or minutes > 60.0:
+            raise ScanIntervalError(interval_str)
+
+        intervals[str(can_id)] = minutes
+
+    return intervals
+
+
+def join_can_scan_intervals(intervals: dict[str, float]) -> str:
+    """Join scan intervals per CAN-ID to a string."""
+    return ",".join(f"{can_id}={minutes}" for can_id, minutes in intervals.items())
+
+
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Technische Alternative CoE."""
 
@@ -145,12 +182,43 @@ def get_schema(config: dict[str, Any]) -> vol.Schema:
 
     default_can_ids = ",".join(str(i) for i in config.get(CONF_CAN_IDS, []))
 
+    default_can_intervals = join_can_scan_intervals(
+        config.get(CONF_CAN_SCAN_INTERVALS, {})
+    )
+
     return vol.Schema(
         {
             vol.Required(
                 CONF_SCAN_INTERVAL, default=default_interval.seconds / 60
             ): vol.All(cv.positive_float, vol.Range(min=0.1, max=60.0)),
             vol.Required(CONF_CAN_IDS, default=default_can_ids): cv.string,
+            vol.Optional(
+                CONF_CAN_SCAN_INTERVALS,
+                description={"suggested_value": default_can_intervals},
+            ): cv.string,
+            vol.Optional(
+                CONF_SEND_DELAY,
+                description={
+                    "suggested_value": config.get(CONF_SEND_DELAY, DEFAULT_SEND_DELAY)
+                },
+            ): vol.All(vol.Coerce(float), vol.Range(min=0.0, max=60.0)),
+            vol.Optional(
+                CONF_SEND_MAX_DELAY,
+                description={
+                    "suggested_value": config.get(
+                        CONF_SEND_MAX_DELAY, DEFAULT_SEND_MAX_DELAY
+                    )
+                },
+            ): vol.All(vol.Coerce(float), vol.Range(min=0.0, max=300.0)),
+            vol.Optional(
+                CONF_REFRESH_INTERVAL,
+                description={
+                    "suggested_value": config.get(
+                        CONF_REFRESH_INTERVAL,
+                        DEFAULT_REFRESH_INTERVAL.total_seconds() / 60,
+                    )
+                },
+            ): vol.All(vol.Coerce(float), vol.Range(min=1.0, max=60.0)),
         }
     )
 
@@ -171,12 +239,33 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
         if user_input is not None and not errors:
             self.data[CONF_SCAN_INTERVAL] = user_input[CONF_SCAN_INTERVAL]
 
+            for key in (
+                CONF_SEND_DELAY,
+                CONF_SEND_MAX_DELAY,
+                CONF_REFRESH_INTERVAL,
+            ):
+                self.data.pop(key, None)
+                if user_input.get(key) is not None:
+                    self.data[key] = user_input[key]
+
             try:
                 self.data[CONF_CAN_IDS] = split_can_ids(user_input[CONF_CAN_IDS])
+                can_intervals = split_can_scan_intervals(
+                    user_input.get(CONF_CAN_SCAN_INTERVALS, "")
+                )
             except CANIDError:
                 errors["base"] = "invalid_can_id"
+            except ScanIntervalError:
+                errors["base"] = "invalid_scan_interval"
             else:
-                return self.async_create_entry(title="", data=self.data)
+                if any(int(x) not in self.data[CONF_CAN_IDS] for x in can_intervals):
+                    errors["base"] = "invalid_can_id"
+                else:
+                    self.data.pop(CONF_CAN_SCAN_INTERVALS, None)
+                    if len(can_intervals) > 0:
+                        self.data[CONF_CAN_SCAN_INTERVALS] = can_intervals
+
+                    return self.async_create_entry(title="", data=self.data)
 
         return self.async_show_form(
             step_id="init",
@@ -192,3 +281,12 @@ class CANIDError(Exception):
         """Initialize."""
         super().__init__(status)
         self.status = status
+
+
+class ScanIntervalError(Exception):
+    """Raised when invalid scan interval detected."""
+
+    def __init__(self, status: str) -> None:
+        """Initialize."""
+        super().__init__(status)
+        self.status = status
@@ -2,23 +2,56 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from datetime import timedelta
 from logging import Logger, getLogger
+from typing import Any
 
 from homeassistant.components.sensor import SensorDeviceClass
 
 _LOGGER: Logger = getLogger(__package__)
+_TRACE_LOGGER: Logger = getLogger(f"{__package__}.trace")
+
+TRACE_SAMPLE_RATE = 100
 
 SCAN_INTERVAL: timedelta = timedelta(minutes=1)
 
+MAX_PARALLEL_CAN_REQUESTS = 4
+MAX_RETRY_BACKOFF: timedelta = timedelta(minutes=30)
+
+# The polls may use all parallel requests while the send queue and the
+# refresh task send values.
+HTTP_MAX_CONNECTIONS = MAX_PARALLEL_CAN_REQUESTS + 2
+HTTP_KEEPALIVE_TIMEOUT = 75.0
+HTTP_CONNECT_TIMEOUT = 5.0
+HTTP_REQUEST_TIMEOUT = 15.0
+MAX_ERROR_HISTORY = 10
+RECENT_TIMINGS = 20
+
+DEFAULT_SEND_DELAY = 0.0
+DEFAULT_SEND_MAX_DELAY = 5.0
+
+DEFAULT_REFRESH_INTERVAL: timedelta = timedelta(minutes=10)
+REFRESH_STEPS = 10
+
 DOMAIN: str = "ta_coe"
 
+DATA_SCHEDULER: str = f"{DOMAIN}_scheduler"
+
+STORAGE_VERSION = 1
+STORAGE_KEY_SERVER_CONFIG = f"{DOMAIN}.{{entry_id}}.server_config"
+STORAGE_KEY_SNAPSHOT = f"{DOMAIN}.{{entry_id}}.snapshot"
+SNAPSHOT_SAVE_DELAY = 60
+
 ADDON_HOSTNAME = "a824d5a9-ta-coe"
 ADDON_DEFAULT_PORT = 9000
 
 CONF_CAN_IDS = "can_ids"
 CONF_SCAN_INTERVAL = "scan_interval"
+CONF_CAN_SCAN_INTERVALS = "can_scan_intervals"
+CONF_SEND_DELAY = "send_delay"
+CONF_SEND_MAX_DELAY = "send_max_delay"
+CONF_REFRESH_INTERVAL = "refresh_interval"
 CONF_ENTITIES_TO_SEND = "entities_to_send"
 CONF_SLOT_COUNT = "slot_count"
 CONF_ANALOG_ENTITIES = "analog"
@@ -32,6 +65,13 @@ FREE_SLOT_MARKER_DIGITAL = "--FREE_SLOT_MARKER_D--"
 class ConfEntityToSend:
     id: int
     entity_id: str
+    min_send_interval: float | None = None
+    deadband: float | None = None
+    deadband_percent: float | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to a dict without the unset options."""
+        return {key: value for key, value in asdict(self).items() if value is not None}
 
 
 DIGITAL_DOMAINS = ["binary_sensor", "input_boolean"]
@@ -40,6 +80,7 @@ ALLOWED_DOMAINS = tuple(DIGITAL_DOMAINS + ANALOG_DOMAINS)
 
 ATTR_ANALOG_ORDER = "analog_order"
 ATTR_DIGITAL_ORDER = "digital_order"
+ATTR_STALE = "stale"
 
 DEFAULT_DEVICE_CLASS_MAP: dict[str, SensorDeviceClass] = {
     "°C": SensorDeviceClass.TEMPERATURE,
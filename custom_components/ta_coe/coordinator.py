@@ -1,27 +1,58 @@
 from __future__ import annotations
 
+import asyncio
+from collections import deque
+from dataclasses import dataclass
 from datetime import timedelta
-from typing import Any
+from typing import TYPE_CHECKING
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import STATE_OFF, STATE_ON
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-from ta_cmi import ApiError, ChannelMode, CoE, CoEChannel
+from homeassistant.util import dt as dt_util
+from ta_cmi import ApiError, ChannelMode, CoEChannel
 
-from .const import DOMAIN, TYPE_BINARY, TYPE_SENSOR, _LOGGER
+from .const import (
+    DOMAIN,
+    MAX_ERROR_HISTORY,
+    MAX_PARALLEL_CAN_REQUESTS,
+    MAX_RETRY_BACKOFF,
+    TYPE_BINARY,
+    TYPE_SENSOR,
+    _LOGGER,
+)
+from .scheduler import RefreshScheduler
+from .stats import CoEStats
+from .transport import CoETransport
 
+if TYPE_CHECKING:
+    from .snapshot_store import SnapshotStore
 
-class CoEDataUpdateCoordinator(DataUpdateCoordinator):
+
+@dataclass(slots=True)
+class ChannelData:
+    value: str | float
+    unit: str
+
+
+type CoESnapshot = dict[int, dict[str, dict[int, ChannelData]]]
+
+
+class CoEDataUpdateCoordinator(DataUpdateCoordinator[CoESnapshot]):
     """Class to manage fetching CoE data."""
 
     def __init__(
         self,
         hass: HomeAssistant,
         config_entry: ConfigEntry,
-        coe: CoE,
+        coe: CoETransport,
         can_ids: list[int],
         update_interval: timedelta,
+        can_update_intervals: dict[int, timedelta] | None = None,
+        scheduler: RefreshScheduler | None = None,
+        stats: CoEStats | None = None,
+        snapshot_store: SnapshotStore | None = None,
     ) -> None:
         """Initialize."""
         self.config_entry = config_entry
@@ -29,9 +60,41 @@ class CoEDataUpdateCoordinator(DataUpdateCoordinator):
         self.coe = coe
         self.can_ids = can_ids
 
+        self._request_limit = asyncio.Semaphore(MAX_PARALLEL_CAN_REQUESTS)
+        self._scheduler = scheduler
+        self.stats = stats if stats is not None else CoEStats()
+        self._snapshot_store = snapshot_store
+        self._phase_aligned = False
+
+        self._can_update_intervals: dict[int, timedelta] = {
+            can_id: (can_update_intervals or {}).get(can_id, update_interval)
+            for can_id in can_ids
+        }
+
+        self._failures: dict[int, int] = {}
+        self._error_history: dict[int, deque[tuple[str, str]]] = {}
+        self._next_update: dict[int, float] = {}
+
+        self._changed_channels: set[tuple[int, str, int]] = set()
+
+        self._snapshot: CoESnapshot = {
+            can_id: {TYPE_BINARY: {}, TYPE_SENSOR: {}} for can_id in can_ids
+        }
+
+        self._poll_interval: timedelta = min(
+            [update_interval, *self._can_update_intervals.values()]
+        )
+
         _LOGGER.debug("Used update interval: %s", update_interval)
+        _LOGGER.debug("Used CAN-ID update intervals: %s", self._can_update_intervals)
 
-        super().__init__(hass, _LOGGER, name=DOMAIN, update_interval=update_interval)
+        super().__init__(
+            hass,
+            _LOGGER,
+            config_entry=config_entry,
+            name=DOMAIN,
+            update_interval=self._poll_interval,
+        )
 
     @staticmethod
     def _format_input(target_channel: CoEChannel) -> tuple[str, str]:
@@ -63,25 +126,192 @@ class CoEDataUpdateCoordinator(DataUpdateCoordinator):
 
         return TYPE_BINARY
 
-    async def _async_update_data(self) -> dict[int, Any]:
+    async def async_restore_snapshot(self) -> bool:
+        """Fill the snapshot with the stored channels of the last run."""
+        if self._snapshot_store is None:
+            return False
+
+        stored_snapshot = await self._snapshot_store.async_load()
+        restored = False
+
+        # The entities are only created at the setup, so every CAN-ID needs
+        # stored channels. Otherwise the setup waits for the first poll.
+        if any(
+            not any(stored_snapshot.get(can_id, {}).values())
+            for can_id in self.can_ids
+        ):
+            return False
+
+        for can_id in self.can_ids:
+            for channel_type, channels in stored_snapshot[can_id].items():
+                if channel_type in self._snapshot[can_id] and len(channels) > 0:
+                    self._snapshot[can_id][channel_type].update(channels)
+                    restored = True
+
+        if restored:
+            _LOGGER.debug("Restored the snapshot of the last run")
+            self.data = self._snapshot
+
+        return restored
+
+    def has_channel_changed(self, can_id: int, channel_type: str, index: int) -> bool:
+        """Check if the value or unit of a channel changed in the last update."""
+        return (can_id, channel_type, index) in self._changed_channels
+
+    def is_stale(self, can_id: int) -> bool:
+        """Check if the last update of a CAN-ID failed."""
+        return can_id in self._failures
+
+    def get_missing_can_ids(self) -> list[int]:
+        """Return the failed CAN-IDs without any channel data."""
+        return [
+            can_id
+            for can_id in self.can_ids
+            if self.is_stale(can_id)
+            and not any(self._snapshot[can_id].values())
+        ]
+
+    def get_error_history(self) -> dict[int, list[dict[str, str]]]:
+        """Return a copy of the last errors of every CAN-ID."""
+        return {
+            can_id: [{"time": time, "error": error} for time, error in errors]
+            for can_id, errors in self._error_history.items()
+        }
+
+    def _get_retry_delay(self, can_id: int, failures: int) -> float:
+        """Get the exponential backoff delay in seconds."""
+        interval = self._can_update_intervals[can_id]
+        delay = interval.total_seconds() * 2 ** (failures - 1)
+
+        return min(delay, MAX_RETRY_BACKOFF.total_seconds())
+
+    def _is_update_due(self, can_id: int, now: float) -> bool:
+        """Check if a CAN-ID should be fetched in this update."""
+        # Allow one second of tolerance because the coordinator rounds the
+        # scheduled refresh time down to full seconds.
+        return self._next_update.get(can_id, now) <= now + 1
+
+    def _schedule_next_poll(self, start: float) -> None:
+        """Move the next poll to the phase of this entry in the shared scheduler."""
+        if self._scheduler is None:
+            return
+
+        period = self._poll_interval.total_seconds()
+
+        # The first aligned poll must not come earlier than a full period, or
+        # the CAN-IDs fetched in this update would not be due yet.
+        delay = self._scheduler.get_delay(
+            self.config_entry.entry_id,
+            "poll",
+            period,
+            start,
+            period / 2 if self._phase_aligned else period,
+        )
+        self._phase_aligned = True
+
+        now = self.hass.loop.time()
+
+        # A slow poll can take longer than the delay to the next phase. A zero
+        # interval would stop the polling, so skip to the following phase.
+        if start + delay <= now:
+            delay = self._scheduler.get_delay(
+                self.config_entry.entry_id, "poll", period, now, period / 2
+            )
+            start = now
+
+        self.update_interval = timedelta(seconds=start + delay - now)
+
+    async def _async_update_can_id(self, can_id: int, now: float) -> bool:
+        """Fetch the data of a single CAN-ID."""
+        try:
+            async with self._request_limit:
+                await self.coe.update(can_id)
+        except (ApiError, TimeoutError) as err:
+            failures = self._failures.get(can_id, 0) + 1
+            delay = self._get_retry_delay(can_id, failures)
+            # A timeout has no message.
+            error = str(err) or type(err).__name__
+
+            self._failures[can_id] = failures
+            self._next_update[can_id] = now + delay
+            self._error_history.setdefault(
+                can_id, deque(maxlen=MAX_ERROR_HISTORY)
+            ).append((dt_util.utcnow().isoformat(), error))
+
+            _LOGGER.warning(
+                "Could not update CAN-ID %s, retry in %s seconds: %s",
+                can_id,
+                delay,
+                error,
+            )
+            return False
+
+        self._failures.pop(can_id, None)
+        self._next_update[can_id] = (
+            now + self._can_update_intervals[can_id].total_seconds()
+        )
+        return True
+
+    def _update_snapshot(self, can_id: int) -> None:
+        """Update the channels of a CAN-ID in place."""
+        for mode in ChannelMode:
+            channel_type = self._get_type(mode)
+            channels = self._snapshot[can_id][channel_type]
+
+            for index, channel in self.coe.get_channels(can_id, mode).items():
+                value, unit = self._format_input(channel)
+                channel_data = channels.get(index)
+
+                if channel_data is None:
+                    channels[index] = ChannelData(value, unit)
+                elif channel_data.value != value or channel_data.unit != unit:
+                    channel_data.value = value
+                    channel_data.unit = unit
+                else:
+                    continue
+
+                self._changed_channels.add((can_id, channel_type, index))
+
+    async def _async_update_data(self) -> CoESnapshot:
         """Update data."""
+        _LOGGER.debug("Try to update CoE")
+
+        now = self.hass.loop.time()
+        self.stats.polls += 1
+
         try:
-            return_data: dict[int, dict[str, Any]] = {}
-            _LOGGER.debug("Try to update CoE")
+            return await self._async_update_due_can_ids(now)
+        except UpdateFailed:
+            self.stats.poll_errors += 1
+            raise
+        finally:
+            self.stats.poll_latency.record(self.hass.loop.time() - now)
 
-            for can_id in self.can_ids:
-                return_data[can_id] = {TYPE_BINARY: {}, TYPE_SENSOR: {}}
+    async def _async_update_due_can_ids(self, now: float) -> CoESnapshot:
+        """Fetch all due CAN-IDs and update the snapshot."""
+        self._changed_channels = set()
 
-                await self.coe.update(can_id)
+        due_can_ids = [x for x in self.can_ids if self._is_update_due(x, now)]
+
+        try:
+            results = await asyncio.gather(
+                *(self._async_update_can_id(can_id, now) for can_id in due_can_ids)
+            )
+        finally:
+            self._schedule_next_poll(now)
+
+        if len(self.can_ids) > 0 and all(
+            self.is_stale(can_id) for can_id in self.can_ids
+        ):
+            raise UpdateFailed("Could not update any CAN-ID")
+
+        for can_id, success in zip(due_can_ids, results):
+            if success:
+                self._update_snapshot(can_id)
+
+        _LOGGER.debug("Changed channels: %s", len(self._changed_channels))
+
+        if self._snapshot_store is not None and len(self._changed_channels) > 0:
+            self._snapshot_store.async_delay_save(self._snapshot)
 
-                for mode in ChannelMode:
-                    for index, channel in self.coe.get_channels(can_id, mode).items():
-                        value, unit = self._format_input(channel)
-                        return_data[can_id][self._get_type(mode)][index] = {
-                            "value": value,
-                            "unit": unit,
-                        }
-
-            return return_data
-        except ApiError as err:
-            raise UpdateFailed(err) from err
+        return self._snapshot
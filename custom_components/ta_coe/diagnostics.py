@@ -0,0 +1,59 @@
+"""Diagnostics support for the Technische Alternative CoE integration."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import CoEDataUpdateCoordinator
+from .state_observer import StateObserver
+from .state_sender import StateSender
+from .stats import CoEStats
+
+TO_REDACT = {CONF_HOST}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry.
+
+    The data is copied in one pass without awaiting, so the dump is consistent
+    and does not hold the event loop longer than copying the tables.
+    """
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+
+    coordinator: CoEDataUpdateCoordinator = entry_data["coordinator"]
+    observer: StateObserver = entry_data["observer"]
+    sender: StateSender = entry_data["sender"]
+    stats: CoEStats = entry_data["stats"]
+
+    return {
+        "config_entry": async_redact_data(dict(entry.data), TO_REDACT),
+        "snapshot": {
+            can_id: {
+                channel_type: {
+                    index: asdict(channel) for index, channel in channels.items()
+                }
+                for channel_type, channels in can_data.items()
+            }
+            for can_id, can_data in (coordinator.data or {}).items()
+        },
+        "stale_can_ids": [x for x in coordinator.can_ids if coordinator.is_stale(x)],
+        "error_history": coordinator.get_error_history(),
+        "sender": {
+            "type": type(sender).__name__,
+            **sender.get_slot_tables(),
+        },
+        "stats": {
+            **stats.as_dict(),
+            "queue_depth": observer.queue_depth,
+            "queue_dropped": observer.dropped_states,
+        },
+    }
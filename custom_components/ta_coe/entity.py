@@ -0,0 +1,72 @@
+"""Base entity for the Technische Alternative CoE integration."""
+
+from __future__ import annotations
+
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import ATTR_STALE
+from .coordinator import ChannelData, CoEDataUpdateCoordinator
+
+
+class CoEChannelEntity(CoordinatorEntity[CoEDataUpdateCoordinator]):
+    """Base representation of an CoE channel."""
+
+    _channel_type: str
+
+    def __init__(
+        self, coordinator: CoEDataUpdateCoordinator, can_id: int, channel_id: int
+    ) -> None:
+        """Initialize."""
+        super().__init__(coordinator)
+        self._id = channel_id
+        self._can_id = can_id
+        self._coordinator = coordinator
+
+        self._last_available: bool | None = None
+        self._last_stale: bool | None = None
+
+        self._update_from_channel()
+
+    @property
+    def _channel(self) -> ChannelData:
+        """Return the current data of the channel."""
+        return self._coordinator.data[self._can_id][self._channel_type][self._id]
+
+    @property
+    def extra_state_attributes(self) -> dict[str, bool]:
+        """Return if the value is kept from before the last failed update."""
+        return {ATTR_STALE: self._coordinator.is_stale(self._can_id)}
+
+    def _update_from_channel(self) -> None:
+        """Update the entity attributes from the channel."""
+        raise NotImplementedError("Method _update_from_channel is not implemented")
+
+    async def async_added_to_hass(self) -> None:
+        """When entity is added to hass."""
+        await super().async_added_to_hass()
+        self._last_available = self.available
+        self._last_stale = self._coordinator.is_stale(self._can_id)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only if the channel, availability or staleness changed."""
+        available = self.available
+        stale = self._coordinator.is_stale(self._can_id)
+        changed = self._coordinator.has_channel_changed(
+            self._can_id, self._channel_type, self._id
+        )
+
+        if (
+            not changed
+            and available == self._last_available
+            and stale == self._last_stale
+        ):
+            return
+
+        if changed:
+            self._update_from_channel()
+
+        self._last_available = available
+        self._last_stale = stale
+        super()._handle_coordinator_update()
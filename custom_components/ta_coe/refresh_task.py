@@ -1,19 +1,51 @@
 """CoE server value refresh task."""
 import asyncio
+import time
 from contextlib import suppress
+from datetime import timedelta
 
-from .const import _LOGGER
+from .const import DEFAULT_REFRESH_INTERVAL, REFRESH_STEPS, _LOGGER
+from .scheduler import RefreshScheduler
+from .state_sender import StateSender
+from .stats import CoEStats
 
 
 class RefreshTask:
     """Handle the refresh of values to the CoE server."""
 
-    def __init__(self, sender):
+    def __init__(
+        self,
+        sender: StateSender,
+        interval: timedelta = DEFAULT_REFRESH_INTERVAL,
+        scheduler: RefreshScheduler | None = None,
+        entry_id: str = "",
+        stats: CoEStats | None = None,
+    ):
         """Initialize."""
         self._sender = sender
+        self._scheduler = scheduler
+        self._entry_id = entry_id
+        self._stats = stats if stats is not None else CoEStats()
+        self._interval = interval.total_seconds()
+        self._step = self._interval / REFRESH_STEPS
         self.is_started = False
         self._task = None
 
+        self._sender.set_refresh_spread(self._get_spread())
+
+    def set_sender(self, sender: StateSender) -> None:
+        """Replace the sender of the refreshed values."""
+        self._sender = sender
+        self._sender.set_refresh_spread(self._get_spread())
+
+    def _get_spread(self) -> float:
+        """Get the time over which the refreshes of slots sent together are spread.
+
+        A slot marked as sent this much earlier is still not outdated at the
+        next step, so it is never refreshed right after it was sent.
+        """
+        return max(self._interval - 2 * self._step, 0)
+
     async def start(self):
         """Start the task."""
         _LOGGER.debug("Try to start refresh task")
@@ -35,7 +67,39 @@ class RefreshTask:
     async def _run(self):
         """Run action."""
         _LOGGER.info("Refresh task started")
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+
         while True:
-            await asyncio.sleep(10 * 60)
-            if self._sender.has_entities():
-                await self._sender.update()
+            await asyncio.sleep(max(start + self._get_delay(start) - loop.time(), 0))
+            start = loop.time()
+
+            if not self._sender.has_entities():
+                continue
+
+            try:
+                await self._refresh()
+            except Exception:  # ruff: ignore[blind-except]
+                # Keep refreshing, the server may be reachable at the next step.
+                _LOGGER.exception("Failed to refresh the values on the server")
+
+    def _get_delay(self, start: float) -> float:
+        """Get the delay of the next step relative to the start of the last one."""
+        if self._scheduler is None:
+            return self._step
+
+        return self._scheduler.get_delay(
+            self._entry_id, "refresh", self._step, start, self._step / 2
+        )
+
+    async def _refresh(self) -> None:
+        """Resend the values which would be outdated before the next step."""
+        start = time.monotonic()
+
+        try:
+            self._stats.refreshed_slots += await self._sender.refresh(
+                self._interval - self._step
+            )
+        finally:
+            self._stats.refreshes += 1
+            self._stats.refresh_latency.record(time.monotonic() - start)
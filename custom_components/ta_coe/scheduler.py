@@ -0,0 +1,44 @@
+"""Shared scheduler to stagger the periodic jobs of all config entries."""
+
+from __future__ import annotations
+
+import zlib
+
+
+class RefreshScheduler:
+    """Spread the polls and refreshes of all config entries over their period."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._entry_ids: set[str] = set()
+
+    def register(self, entry_id: str) -> None:
+        """Register a config entry."""
+        self._entry_ids.add(entry_id)
+
+    def unregister(self, entry_id: str) -> None:
+        """Unregister a config entry."""
+        self._entry_ids.discard(entry_id)
+
+    def get_phase(self, entry_id: str, job: str, period: float) -> float:
+        """Get the offset of a job inside its period.
+
+        Every entry gets its own share of the period and a deterministic jitter
+        inside the share, so the phases do not depend on the setup order.
+        """
+        entry_ids = sorted(self._entry_ids | {entry_id})
+        share = period / len(entry_ids)
+        jitter = zlib.crc32(f"{entry_id}_{job}".encode()) / 2**32
+
+        return (entry_ids.index(entry_id) + jitter) * share
+
+    def get_delay(
+        self, entry_id: str, job: str, period: float, now: float, min_delay: float
+    ) -> float:
+        """Get the delay until the next phase of a job which is at least min_delay."""
+        delay = (self.get_phase(entry_id, job, period) - now) % period
+
+        while delay < min_delay:
+            delay += period
+
+        return delay
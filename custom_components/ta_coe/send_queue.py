@@ -0,0 +1,206 @@
+"""CoE send queue to merge state changes before sending."""
+
+from __future__ import annotations
+
+import asyncio
+
+from homeassistant.core import HomeAssistant, callback
+from ta_cmi import ApiError
+
+from .const import _LOGGER
+from .state_sender import AnalogValue, StateSender
+
+
+class SendQueue:
+    """Merge state changes and send them as one batch.
+
+    A single worker sends the batches in order. While it is busy, newer
+    states replace the pending state of the same entity.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        sender: StateSender,
+        delay: float,
+        max_delay: float,
+        min_send_intervals: dict[str, float] | None = None,
+    ):
+        """Initialize."""
+        self._hass = hass
+        self._sender = sender
+        self._delay = delay
+        self._max_delay = max_delay
+        self._min_send_intervals = min_send_intervals or {}
+
+        self._analog_states: dict[str, AnalogValue] = {}
+        self._digital_states: dict[str, bool] = {}
+        self._last_sent: dict[str, float] = {}
+
+        self._dropped_count = 0
+
+        self._first_change: float | None = None
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._flush_lock = asyncio.Lock()
+        self._flush_event = asyncio.Event()
+        self._worker: asyncio.Task | None = None
+
+    @property
+    def pending_count(self) -> int:
+        """Return the number of states waiting to be sent."""
+        return len(self._analog_states) + len(self._digital_states)
+
+    @property
+    def dropped_count(self) -> int:
+        """Return the number of states replaced by a newer state before sending."""
+        return self._dropped_count
+
+    def is_pending(self, entity_id: str) -> bool:
+        """Check if a state of the entity is waiting to be sent."""
+        return entity_id in self._analog_states or entity_id in self._digital_states
+
+    @callback
+    def add_analog(self, entity_id: str, state: float, unit: str) -> None:
+        """Add an analog state to the queue."""
+        if entity_id in self._analog_states:
+            self._dropped_count += 1
+
+        self._analog_states[entity_id] = AnalogValue(state, unit)
+        self._schedule_flush()
+
+    @callback
+    def add_digital(self, entity_id: str, state: bool) -> None:
+        """Add a digital state to the queue."""
+        if entity_id in self._digital_states:
+            self._dropped_count += 1
+
+        self._digital_states[entity_id] = state
+        self._schedule_flush()
+
+    @callback
+    def set_sender(self, sender: StateSender) -> None:
+        """Replace the sender of the queued states."""
+        self._sender = sender
+
+    @callback
+    def set_min_send_intervals(self, min_send_intervals: dict[str, float]) -> None:
+        """Replace the minimum send intervals of the entities."""
+        self._min_send_intervals = min_send_intervals
+
+    @callback
+    def discard(self, entity_ids: set[str]) -> None:
+        """Drop the pending states of the entities."""
+        for entity_id in entity_ids:
+            self._analog_states.pop(entity_id, None)
+            self._digital_states.pop(entity_id, None)
+            self._last_sent.pop(entity_id, None)
+
+    @callback
+    def cancel(self) -> None:
+        """Drop all pending states and stop the worker."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+
+        self._analog_states.clear()
+        self._digital_states.clear()
+        self._first_change = None
+
+    def _get_next_send_time(self, entity_id: str) -> float:
+        """Get the earliest time the entity is allowed to be sent again."""
+        last_sent = self._last_sent.get(entity_id)
+
+        if last_sent is None:
+            return 0
+
+        return last_sent + self._min_send_intervals.get(entity_id, 0)
+
+    @callback
+    def _schedule_flush(self) -> None:
+        """Schedule the next flush of the queue."""
+        now = self._hass.loop.time()
+
+        if self._first_change is None:
+            self._first_change = now
+
+        flush_at = min(now + self._delay, self._first_change + self._max_delay)
+        self._schedule_flush_at(flush_at)
+
+    @callback
+    def _schedule_flush_at(self, flush_at: float) -> None:
+        """Schedule the flush of the queue at a loop time."""
+        if self._worker is None:
+            self._worker = asyncio.ensure_future(self._run())
+
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+
+        self._flush_handle = self._hass.loop.call_at(flush_at, self._flush_callback)
+
+    @callback
+    def _flush_callback(self) -> None:
+        """Wake up the worker to flush the queue."""
+        self._flush_handle = None
+        self._flush_event.set()
+
+    async def _run(self) -> None:
+        """Send the queued states each time the worker is woken up."""
+        while True:
+            await self._flush_event.wait()
+            self._flush_event.clear()
+
+            try:
+                await self.async_flush()
+            except (TimeoutError, ApiError) as err:
+                _LOGGER.warning("Failed to send queued states: %s", err)
+            except Exception:  # ruff: ignore[blind-except]
+                # The worker must keep running or no state is sent anymore.
+                _LOGGER.exception("Unexpected error while sending queued states")
+
+    async def async_flush(self) -> None:
+        """Send all pending states which are allowed to be sent."""
+        async with self._flush_lock:
+            now = self._hass.loop.time()
+
+            analog_states = {
+                entity_id: state
+                for entity_id, state in self._analog_states.items()
+                if self._get_next_send_time(entity_id) <= now
+            }
+            digital_states = {
+                entity_id: state
+                for entity_id, state in self._digital_states.items()
+                if self._get_next_send_time(entity_id) <= now
+            }
+
+            for entity_id in analog_states:
+                del self._analog_states[entity_id]
+                self._last_sent[entity_id] = now
+
+            for entity_id in digital_states:
+                del self._digital_states[entity_id]
+                self._last_sent[entity_id] = now
+
+            self._first_change = None
+
+            if self.pending_count > 0:
+                self._schedule_flush_at(
+                    min(
+                        self._get_next_send_time(entity_id)
+                        for entity_id in [*self._analog_states, *self._digital_states]
+                    )
+                )
+
+            if len(analog_states) + len(digital_states) == 0:
+                return
+
+            _LOGGER.debug(
+                "Send %s queued states to server",
+                len(analog_states) + len(digital_states),
+            )
+
+            await self._sender.update_batch(analog_states, digital_states)
@@ -1,20 +1,74 @@
 """CoE sensor platform."""
 from __future__ import annotations
 
-from typing import Any
+from collections.abc import Callable
+from dataclasses import dataclass
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
+    SensorEntityDescription,
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import CoEDataUpdateCoordinator
 from .const import DEFAULT_DEVICE_CLASS_MAP, DOMAIN, TYPE_SENSOR
+from .entity import CoEChannelEntity
+from .state_observer import StateObserver
+from .stats import CoEStats
+
+
+@dataclass(frozen=True, kw_only=True)
+class CoEStatsSensorEntityDescription(SensorEntityDescription):
+    """Describe a sensor with a value of the integration stats."""
+
+    value_fn: Callable[[CoEStats, StateObserver], int]
+
+
+STATS_SENSORS: tuple[CoEStatsSensorEntityDescription, ...] = (
+    CoEStatsSensorEntityDescription(
+        key="polls",
+        name="CoE Polls",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda stats, _: stats.polls,
+    ),
+    CoEStatsSensorEntityDescription(
+        key="poll-errors",
+        name="CoE Poll errors",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda stats, _: stats.poll_errors,
+    ),
+    CoEStatsSensorEntityDescription(
+        key="request-errors",
+        name="CoE Request errors",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda stats, _: stats.request_errors,
+    ),
+    CoEStatsSensorEntityDescription(
+        key="sent-messages",
+        name="CoE Sent messages",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda stats, _: stats.sent_messages,
+    ),
+    CoEStatsSensorEntityDescription(
+        key="send-errors",
+        name="CoE Send errors",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda stats, _: stats.send_errors,
+    ),
+    CoEStatsSensorEntityDescription(
+        key="send-queue-depth",
+        name="CoE Send queue depth",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda _, observer: observer.queue_depth,
+    ),
+)
 
 
 async def async_setup_entry(
@@ -26,8 +80,9 @@ async def async_setup_entry(
     coordinator: CoEDataUpdateCoordinator = hass.data[DOMAIN][config_entry.entry_id][
         "coordinator"
     ]
+    observer: StateObserver = hass.data[DOMAIN][config_entry.entry_id]["observer"]
 
-    entities: list[DeviceChannelSensor] = []
+    entities: list[SensorEntity] = []
 
     for can_id in coordinator.data:
         for index in coordinator.data[can_id][TYPE_SENSOR]:
@@ -36,63 +91,92 @@ async def async_setup_entry(
             )
             entities.append(channel)
 
+    for description in STATS_SENSORS:
+        entities.append(
+            CoEStatsSensor(coordinator, observer, config_entry, description)
+        )
+
     async_add_entities(entities)
 
 
-class DeviceChannelSensor(CoordinatorEntity, SensorEntity):
+class DeviceChannelSensor(CoEChannelEntity, SensorEntity):
     """Representation of an CoE channel."""
 
+    _channel_type = TYPE_SENSOR
+
     def __init__(
         self, coordinator: CoEDataUpdateCoordinator, can_id: int, channel_id: str
     ) -> None:
         """Initialize."""
-        super().__init__(coordinator)
-        self._id = channel_id
-        self._can_id = can_id
-        self._coordinator = coordinator
+        self._unit: str | None = None
+
+        super().__init__(coordinator, can_id, channel_id)
 
         self._attr_name: str = f"CoE Analog - CAN{self._can_id} {self._id}"
         self._attr_unique_id: str = f"ta-coe-analog-can{self._can_id}-{self._id}"
 
-    @property
-    def native_value(self) -> str:
-        """Return the state of the sensor."""
-        channel_raw: dict[str, Any] = self._coordinator.data[self._can_id][TYPE_SENSOR][
-            self._id
-        ]
+    def _update_from_channel(self) -> None:
+        """Update the value and the unit based attributes from the channel."""
+        channel = self._channel
+        self._attr_native_value = channel.value
 
-        value: str = channel_raw["value"]
+        if channel.unit == self._unit:
+            return
 
-        return value
+        self._unit = channel.unit
 
-    @property
-    def native_unit_of_measurement(self) -> str:
-        """Return the unit of measurement of this entity, if any."""
+        if self._unit == "l":
+            self._attr_native_unit_of_measurement = self._unit.upper()
+        else:
+            self._attr_native_unit_of_measurement = self._unit
 
-        channel_raw: dict[str, Any] = self._coordinator.data[self._can_id][TYPE_SENSOR][
-            self._id
-        ]
+        self._attr_device_class = DEFAULT_DEVICE_CLASS_MAP.get(self._unit, None)
 
-        unit: str = channel_raw["unit"]
+        if self._attr_device_class in [
+            SensorDeviceClass.ENERGY,
+            SensorDeviceClass.WATER,
+        ]:
+            self._attr_state_class = SensorStateClass.TOTAL
+        else:
+            self._attr_state_class = SensorStateClass.MEASUREMENT
 
-        if unit == "l":
-            return unit.upper()
 
-        return unit
+class CoEStatsSensor(CoordinatorEntity[CoEDataUpdateCoordinator], SensorEntity):
+    """Representation of a value of the integration stats."""
 
-    @property
-    def state_class(self) -> str:
-        """Return the state class of the sensor."""
-        if self.device_class in [SensorDeviceClass.ENERGY, SensorDeviceClass.WATER]:
-            return SensorStateClass.TOTAL
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
 
-        return SensorStateClass.MEASUREMENT
+    entity_description: CoEStatsSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: CoEDataUpdateCoordinator,
+        observer: StateObserver,
+        config_entry: ConfigEntry,
+        description: CoEStatsSensorEntityDescription,
+    ) -> None:
+        """Initialize."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._observer = observer
+
+        self._attr_unique_id: str = (
+            f"ta-coe-stats-{config_entry.entry_id}-{description.key}"
+        )
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, config_entry.entry_id)},
+            name=config_entry.title,
+            entry_type=DeviceEntryType.SERVICE,
+        )
 
     @property
-    def device_class(self) -> SensorDeviceClass | None:
-        """Return the device class of this entity, if any."""
-        channel_raw: dict[str, Any] = self._coordinator.data[self._can_id][TYPE_SENSOR][
-            self._id
-        ]
+    def available(self) -> bool:
+        """Return if the stats are available."""
+        return True
 
-        return DEFAULT_DEVICE_CLASS_MAP.get(channel_raw["unit"], None)
+    @property
+    def native_value(self) -> int:
+        """Return the current value of the stats."""
+        return self.entity_description.value_fn(
+            self.coordinator.stats, self._observer
+        )
@@ -0,0 +1,43 @@
+"""Cache of the detected CoE server config."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from ta_cmi import CoEServerConfig
+
+from .const import STORAGE_KEY_SERVER_CONFIG, STORAGE_VERSION
+
+
+class ServerConfigCache:
+    """Store the server config of a config entry across restarts."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY_SERVER_CONFIG.format(entry_id=entry_id)
+        )
+
+    async def async_load(self) -> CoEServerConfig | None:
+        """Load the cached server config."""
+        data = await self._store.async_load()
+
+        if data is None:
+            return None
+
+        try:
+            return CoEServerConfig(**data)
+        except TypeError:
+            # Stored by a library version with other fields.
+            return None
+
+    async def async_save(self, server_config: CoEServerConfig) -> None:
+        """Save the server config."""
+        await self._store.async_save(asdict(server_config))
+
+    async def async_remove(self) -> None:
+        """Remove the cached server config."""
+        await self._store.async_remove()
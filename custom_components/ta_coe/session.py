@@ -0,0 +1,62 @@
+"""Dedicated HTTP session for the requests to a CoE server."""
+
+from __future__ import annotations
+
+import aiohttp
+from aiohttp.hdrs import USER_AGENT
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant
+from homeassistant.helpers.aiohttp_client import SERVER_SOFTWARE
+
+from .const import (
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_KEEPALIVE_TIMEOUT,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_REQUEST_TIMEOUT,
+)
+
+
+def create_coe_session(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> aiohttp.ClientSession:
+    """Create a session with its own connection pool for one CoE server.
+
+    The connections are kept open longer than the default poll interval, so
+    every poll and send reuses them instead of opening new ones. The session
+    is closed when the entry is unloaded or Home Assistant is shut down.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=HTTP_MAX_CONNECTIONS,
+        limit_per_host=HTTP_MAX_CONNECTIONS,
+        keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+    )
+
+    session = aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(
+            total=HTTP_REQUEST_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT
+        ),
+        headers={USER_AGENT: SERVER_SOFTWARE},
+    )
+
+    remove_close_listener: CALLBACK_TYPE | None = None
+
+    async def _async_close_on_shutdown(event: Event) -> None:
+        """Close the session when Home Assistant is shut down."""
+        nonlocal remove_close_listener
+        remove_close_listener = None
+        await session.close()
+
+    async def _async_close_on_unload() -> None:
+        """Close the session and stop listening for the shutdown."""
+        if remove_close_listener is not None:
+            remove_close_listener()
+        await session.close()
+
+    remove_close_listener = hass.bus.async_listen_once(
+        EVENT_HOMEASSISTANT_CLOSE, _async_close_on_shutdown
+    )
+    entry.async_on_unload(_async_close_on_unload)
+
+    return session
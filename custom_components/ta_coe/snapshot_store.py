@@ -0,0 +1,79 @@
+"""Storage of the last known channels of the coordinator."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    SNAPSHOT_SAVE_DELAY,
+    STORAGE_KEY_SNAPSHOT,
+    STORAGE_VERSION,
+    _LOGGER,
+)
+from .coordinator import ChannelData, CoESnapshot
+
+
+class SnapshotStore:
+    """Store the snapshot of a config entry across restarts."""
+
+    def __init__(
+        self, hass: HomeAssistant, entry_id: str, delay: float = SNAPSHOT_SAVE_DELAY
+    ) -> None:
+        """Initialize."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY_SNAPSHOT.format(entry_id=entry_id)
+        )
+        self._delay = delay
+
+    @staticmethod
+    def _encode(snapshot: CoESnapshot) -> dict[str, Any]:
+        """Convert the snapshot to value and unit pairs."""
+        return {
+            str(can_id): {
+                channel_type: {
+                    str(index): [channel.value, channel.unit]
+                    for index, channel in channels.items()
+                }
+                for channel_type, channels in can_data.items()
+            }
+            for can_id, can_data in snapshot.items()
+        }
+
+    @staticmethod
+    def _decode(data: dict[str, Any]) -> CoESnapshot:
+        """Convert the stored value and unit pairs to a snapshot."""
+        return {
+            int(can_id): {
+                channel_type: {
+                    int(index): ChannelData(value, unit)
+                    for index, (value, unit) in channels.items()
+                }
+                for channel_type, channels in can_data.items()
+            }
+            for can_id, can_data in data.items()
+        }
+
+    async def async_load(self) -> CoESnapshot:
+        """Load the stored snapshot."""
+        data = await self._store.async_load()
+
+        if data is None:
+            return {}
+
+        try:
+            return self._decode(data)
+        except (AttributeError, TypeError, ValueError) as err:
+            _LOGGER.warning("Ignore invalid stored snapshot: %s", err)
+            return {}
+
+    @callback
+    def async_delay_save(self, snapshot: CoESnapshot) -> None:
+        """Save the snapshot after the delay, merging all changes until then."""
+        self._store.async_delay_save(lambda: self._encode(snapshot), self._delay)
+
+    async def async_remove(self) -> None:
+        """Remove the stored snapshot."""
+        await self._store.async_remove()
@@ -1,21 +1,50 @@
 """CoE state observer to track state changes."""
 
+from dataclasses import dataclass
+
 from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT, STATE_ON
-from homeassistant.core import Event, HomeAssistant, State, callback
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, State, callback
 from homeassistant.helpers.event import async_track_state_change_event
-from ta_cmi import CoE
 
 from .const import (
     ANALOG_DOMAINS,
     CONF_ANALOG_ENTITIES,
     CONF_DIGITAL_ENTITIES,
+    DEFAULT_SEND_DELAY,
+    DEFAULT_SEND_MAX_DELAY,
     DIGITAL_DOMAINS,
-    TYPE_BINARY,
-    TYPE_SENSOR,
+    TRACE_SAMPLE_RATE,
     _LOGGER,
+    _TRACE_LOGGER,
     ConfEntityToSend,
 )
-from .state_sender import StateSender
+from .send_queue import SendQueue
+from .state_sender import AnalogValue, StateSender
+from .trace import SampledTrace
+from .transport import CoETransport
+
+
+@dataclass(slots=True)
+class ObservedEntity:
+    """Precomputed record of an exposed entity and its last value."""
+
+    entity_id: str
+    is_digital: bool
+    deadband: float = 0.0
+    deadband_percent: float = 0.0
+    value: float | bool | None = None
+    unit: str | None = None
+
+    def is_in_deadband(self, value: float, unit: str) -> bool:
+        """Check if an analog value is too close to the last value to be sent."""
+        if self.value is None or unit != self.unit:
+            return False
+
+        difference = abs(value - self.value)
+
+        return difference <= self.deadband or (
+            difference <= abs(self.value) * self.deadband_percent / 100
+        )
 
 
 class StateObserver:
@@ -24,94 +53,225 @@ class StateObserver:
     def __init__(
         self,
         hass: HomeAssistant,
-        coe: CoE,
+        coe: CoETransport,
         sender: StateSender,
         entity_config: dict[str, list[ConfEntityToSend]],
+        send_delay: float = DEFAULT_SEND_DELAY,
+        send_max_delay: float = DEFAULT_SEND_MAX_DELAY,
     ):
         """Initialize."""
         self._hass = hass
         self._coe = coe
         self._sender = sender
         self._entity_dict = entity_config
-        self._entity_list = [
-            x.entity_id
-            for x in entity_config.get(CONF_ANALOG_ENTITIES, [])
-            + entity_config.get(CONF_DIGITAL_ENTITIES, [])
-        ]
+        self._entity_list: list[str] = []
+        self._entities: dict[str, ObservedEntity] = {}
+
+        self._trace = SampledTrace(_TRACE_LOGGER, TRACE_SAMPLE_RATE)
+
+        self._queue = SendQueue(hass, sender, send_delay, send_max_delay)
+
+        self._unsub_state_changes = self._init_entities(entity_config)
+
+    @staticmethod
+    def _get_entities(
+        entity_config: dict[str, list[ConfEntityToSend]],
+    ) -> list[ConfEntityToSend]:
+        """Return the analog and digital entities of a config."""
+        return entity_config.get(CONF_ANALOG_ENTITIES, []) + entity_config.get(
+            CONF_DIGITAL_ENTITIES, []
+        )
+
+    def _init_entities(
+        self, entity_config: dict[str, list[ConfEntityToSend]]
+    ) -> CALLBACK_TYPE:
+        """Build the entity records and track the state changes of the entities."""
+        entities = self._get_entities(entity_config)
+        old_entities = self._entities
+
+        self._entity_dict = entity_config
+        self._entity_list = [x.entity_id for x in entities]
+        self._entities = {}
+
+        for entity in entities:
+            domain = entity.entity_id.partition(".")[0]
 
-        self._states = {TYPE_BINARY: {}, TYPE_SENSOR: {}}
+            if domain in DIGITAL_DOMAINS or domain in ANALOG_DOMAINS:
+                record = ObservedEntity(
+                    entity.entity_id,
+                    domain in DIGITAL_DOMAINS,
+                    entity.deadband or 0.0,
+                    entity.deadband_percent or 0.0,
+                )
+
+                if (old_record := old_entities.get(entity.entity_id)) is not None:
+                    record.value = old_record.value
+                    record.unit = old_record.unit
 
-        async_track_state_change_event(
+                self._entities[entity.entity_id] = record
+
+        self._queue.set_min_send_intervals(
+            {
+                x.entity_id: x.min_send_interval
+                for x in entities
+                if x.min_send_interval is not None
+            }
+        )
+
+        return async_track_state_change_event(
             self._hass, self._entity_list, self._update_listener
         )
 
+    async def async_set_entity_config(
+        self, entity_config: dict[str, list[ConfEntityToSend]]
+    ) -> None:
+        """Apply a new entity config and send only the added or changed entities."""
+        old_entities = {x.entity_id: x for x in self._get_entities(self._entity_dict)}
+        new_entities = {x.entity_id: x for x in self._get_entities(entity_config)}
+
+        changed = {
+            entity_id
+            for entity_id, entity in new_entities.items()
+            if old_entities.get(entity_id) != entity
+        }
+        removed = old_entities.keys() - new_entities.keys()
+
+        _LOGGER.debug(
+            "Update entity config: %s added or changed, %s removed",
+            len(changed),
+            len(removed),
+        )
+
+        self._unsub_state_changes()
+        self._queue.discard(removed)
+        self._sender.set_entity_config(entity_config)
+        self._unsub_state_changes = self._init_entities(entity_config)
+
+        analog_states: dict[str, AnalogValue] = {}
+        digital_states: dict[str, bool] = {}
+
+        for entity_id in changed:
+            record = self._entities.get(entity_id)
+
+            if record is None or not self._read_state(record):
+                continue
+
+            if record.is_digital:
+                digital_states[entity_id] = record.value
+            else:
+                analog_states[entity_id] = AnalogValue(record.value, record.unit)
+
+        await self._sender.update_batch(analog_states, digital_states)
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of states waiting to be sent."""
+        return self._queue.pending_count
+
+    @property
+    def dropped_states(self) -> int:
+        """Return the number of states replaced before they were sent."""
+        return self._queue.dropped_count
+
+    @callback
+    def set_sender(self, sender: StateSender) -> None:
+        """Replace the sender, e.g. after the server was upgraded."""
+        self._sender = sender
+        self._queue.set_sender(sender)
+
+    @callback
+    def stop(self) -> None:
+        """Stop tracking state changes and drop pending states."""
+        self._unsub_state_changes()
+        self._queue.cancel()
+
     @staticmethod
     def _is_state_valid(state: str) -> bool:
         """Check if a state is valid."""
         return state not in ["unavailable", "unknown"]
 
-    def _has_state_changed(self, state: State) -> bool:
-        """Check if a state is new."""
-        return (
-            self._states[TYPE_BINARY].get(state.entity_id) != state.state
-            and self._states[TYPE_SENSOR].get(state.entity_id) != state.state
-        )
-
     async def get_all_states(self) -> None:
         """Get all states from entities."""
         _LOGGER.debug("Update all states")
 
-        for entity_id in self._entity_list:
-
-            state = self._hass.states.get(entity_id)
-            domain = entity_id[0 : entity_id.find(".")]
-
-            if state is None or not self._is_state_valid(state.state):
+        for record in self._entities.values():
+            if not self._read_state(record):
                 continue
 
-            if domain in ANALOG_DOMAINS:
-                state_value = float(state.state)
-                self._states[TYPE_SENSOR][entity_id] = state_value
+            if record.is_digital:
+                self._sender.update_digital_manuel(record.entity_id, record.value)
+            else:
                 self._sender.update_analog_manuel(
-                    entity_id,
-                    state_value,
-                    str(state.attributes.get(ATTR_UNIT_OF_MEASUREMENT, "")),
+                    record.entity_id, record.value, record.unit
                 )
 
-            if domain in DIGITAL_DOMAINS:
-                state_value = state.state is STATE_ON
-                self._states[TYPE_BINARY][entity_id] = state_value
-                self._sender.update_digital_manuel(entity_id, state_value)
-
         await self._sender.update()
 
+    def _read_state(self, record: ObservedEntity) -> bool:
+        """Store the current state of the entity in its record."""
+        state = self._hass.states.get(record.entity_id)
+
+        if state is None or not self._is_state_valid(state.state):
+            return False
+
+        if record.is_digital:
+            record.value = state.state == STATE_ON
+        else:
+            record.value = float(state.state)
+            record.unit = str(state.attributes.get(ATTR_UNIT_OF_MEASUREMENT, ""))
+
+        return True
+
     @callback
-    async def _update_listener(self, event: Event) -> None:
+    def _update_listener(self, event: Event) -> None:
         """Handle state updates."""
         new_state: State | None = event.data.get("new_state", None)
 
-        if (
-            new_state is None
-            or not self._is_state_valid(new_state.state)
-            or not self._has_state_changed(new_state)
-        ):
+        if new_state is None or not self._is_state_valid(new_state.state):
             return
 
-        _LOGGER.debug(f"Handle new state {new_state.entity_id}: {new_state.state}")
+        record = self._entities.get(new_state.entity_id)
 
-        if new_state.domain in ANALOG_DOMAINS:
-            state_value = float(new_state.state)
+        if record is None:
+            return
 
-            self._states[TYPE_SENSOR][new_state.entity_id] = state_value
+        if record.is_digital:
+            value = new_state.state == STATE_ON
 
-            await self._sender.update_analog(
-                new_state.entity_id,
-                state_value,
-                str(new_state.attributes.get(ATTR_UNIT_OF_MEASUREMENT, "")),
-            )
+            if value == record.value:
+                return
 
-        if new_state.domain in DIGITAL_DOMAINS:
-            state_value = new_state.state is STATE_ON
-            self._states[TYPE_BINARY][new_state.entity_id] = state_value
+            record.value = value
+            self._log_new_state(new_state)
+            self._queue.add_digital(record.entity_id, value)
+            return
 
-            await self._sender.update_digital(new_state.entity_id, state_value)
+        value = float(new_state.state)
+        unit = str(new_state.attributes.get(ATTR_UNIT_OF_MEASUREMENT, ""))
+
+        if value == record.value and unit == record.unit:
+            return
+
+        if record.is_in_deadband(value, unit):
+            # Keep the last sent value as reference, so slow drifts are still
+            # sent. The sender gets the new value for the next refresh.
+            if self._queue.is_pending(record.entity_id):
+                self._queue.add_analog(record.entity_id, value, unit)
+            else:
+                self._sender.update_analog_manuel(record.entity_id, value, unit)
+            return
+
+        record.value = value
+        record.unit = unit
+        self._log_new_state(new_state)
+        self._queue.add_analog(record.entity_id, value, unit)
+
+    def _log_new_state(self, new_state: State) -> None:
+        """Log a new state to the debug log and the sampled trace."""
+        _LOGGER.debug("Handle new state %s: %s", new_state.entity_id, new_state.state)
+        self._trace(
+            "Handle new state %s: %s, queue depth %s",
+            new_state.entity_id,
+            new_state.state,
+            self._queue.pending_count,
+        )
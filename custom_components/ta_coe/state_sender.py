@@ -1,9 +1,13 @@
 """CoE state sender base."""
 
-from abc import ABCMeta, abstractmethod
-from dataclasses import dataclass
+import math
+import time
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+from typing import Any
 
-from ta_cmi import CoE
+from ta_cmi import ChannelMode
+from ta_cmi.const import UNITS_EN
 
 from custom_components.ta_coe.const import (
     CONF_ANALOG_ENTITIES,
@@ -12,6 +16,7 @@ from custom_components.ta_coe.const import (
     _LOGGER,
     ConfEntityToSend,
 )
+from custom_components.ta_coe.transport import CoETransport
 
 
 @dataclass
@@ -20,10 +25,23 @@ class AnalogValue:
     unit: str
 
 
-class StateSender(metaclass=ABCMeta):
+type SlotKey = tuple[ChannelMode, int]
+
+
+def build_unit_id_map(remap: dict[str, str]) -> dict[str, str]:
+    """Build a lookup table from the unit to the unit id."""
+    unit_ids: dict[str, str] = {}
+
+    for key, value in UNITS_EN.items():
+        unit_ids.setdefault(value, remap.get(key, key))
+
+    return unit_ids
+
+
+class StateSender(ABC):
     """Base class to handle the transfer to the CoE server."""
 
-    def __init__(self, coe: CoE, entity_config: dict[str, list[ConfEntityToSend]]):
+    def __init__(self, coe: CoETransport, entity_config: dict[str, list[ConfEntityToSend]]):
         """Initialize."""
         self._coe = coe
 
@@ -33,6 +51,9 @@ class StateSender(metaclass=ABCMeta):
         self._digital_states: dict[str, bool] = {}
         self._analog_states: dict[str, AnalogValue] = {}
 
+        self._last_sent: dict[SlotKey, float] = {}
+        self._refresh_spread: float = 0.0
+
         self._init_generate_id_mapping()
 
     def _init_generate_id_mapping(self) -> None:
@@ -44,12 +65,50 @@ class StateSender(metaclass=ABCMeta):
         for entity in self._entity_config.get(CONF_DIGITAL_ENTITIES, []):
             self._index_from_id[entity.entity_id] = str(entity.id - 1)
 
+    def _get_config_slots(self) -> set[SlotKey]:
+        """Return the channel keys of all configured entities."""
+        return {
+            (ChannelMode.ANALOG, entity.id - 1)
+            for entity in self._entity_config.get(CONF_ANALOG_ENTITIES, [])
+        } | {
+            (ChannelMode.DIGITAL, entity.id - 1)
+            for entity in self._entity_config.get(CONF_DIGITAL_ENTITIES, [])
+        }
+
+    def set_entity_config(
+        self, entity_config: dict[str, list[ConfEntityToSend]]
+    ) -> None:
+        """Replace the configured entities and clear the channels no longer used."""
+        old_slots = self._get_config_slots()
+
+        self._entity_config = entity_config
+        self._index_from_id = {}
+        self._init_generate_id_mapping()
+
+        for mode, index in old_slots - self._get_config_slots():
+            self._clear_channel(mode, index)
+
+    def _clear_channel(self, mode: ChannelMode, index: int) -> None:
+        """Remove the state of a channel which is no longer configured."""
+        if mode is ChannelMode.ANALOG:
+            self._analog_states.pop(str(index), None)
+        else:
+            self._digital_states.pop(str(index), None)
+
     @staticmethod
     def _is_domain_digital(entity_id: str) -> bool:
         """Check if an entity domain is digital."""
         domain = entity_id[0 : entity_id.find(".")]
         return domain in DIGITAL_DOMAINS
 
+    def get_slot_tables(self) -> dict[str, Any]:
+        """Return a copy of the slot tables."""
+        return {
+            "analog_states": {x: asdict(y) for x, y in self._analog_states.items()},
+            "digital_states": dict(self._digital_states),
+            "index_from_id": dict(self._index_from_id),
+        }
+
     def has_entities(self) -> bool:
         """Check if the sender has entities in the entity_list"""
         return (
@@ -65,7 +124,7 @@ class StateSender(metaclass=ABCMeta):
 
     def update_digital_manuel(self, entity_id: str, state: bool):
         """Update a digital state without sending update."""
-        _LOGGER.debug(f"Update digital value without update {entity_id}: {state}")
+        _LOGGER.debug("Update digital value without update %s: %s", entity_id, state)
         index = self._index_from_id[entity_id]
         self._digital_states[index] = state
 
@@ -76,7 +135,9 @@ class StateSender(metaclass=ABCMeta):
 
     def update_analog_manuel(self, entity_id: str, state: float, unit: str):
         """Update analog state without sending update."""
-        _LOGGER.debug(f"Update analog value without update {entity_id}: {state} {unit}")
+        _LOGGER.debug(
+            "Update analog value without update %s: %s %s", entity_id, state, unit
+        )
         index = self._index_from_id[entity_id]
         self._analog_states[index] = AnalogValue(state, unit)
 
@@ -85,7 +146,66 @@ class StateSender(metaclass=ABCMeta):
         """Update an analog state with sending update."""
         raise NotImplementedError("Method update_analog is not implemented")
 
+    async def update_batch(
+        self, analog_states: dict[str, AnalogValue], digital_states: dict[str, bool]
+    ) -> None:
+        """Update multiple states with sending updates."""
+        for entity_id, state in analog_states.items():
+            await self.update_analog(entity_id, state.value, state.unit)
+
+        for entity_id, value in digital_states.items():
+            await self.update_digital(entity_id, value)
+
     @abstractmethod
     async def update(self) -> None:
         """Send all values to the server."""
         raise NotImplementedError("Method update is not implemented")
+
+    @abstractmethod
+    def _get_slots(self) -> list[SlotKey]:
+        """Return the keys of all slots which are sent on an update."""
+        raise NotImplementedError("Method _get_slots is not implemented")
+
+    @abstractmethod
+    async def _send_slots(self, slots: list[SlotKey]) -> None:
+        """Send the values of the given slots to the server."""
+        raise NotImplementedError("Method _send_slots is not implemented")
+
+    def _mark_sent(self, slots: list[SlotKey]) -> None:
+        """Remember the time the slots were sent."""
+        now = time.monotonic()
+        for slot in slots:
+            self._last_sent[slot] = now
+
+    def set_refresh_spread(self, spread: float) -> None:
+        """Set the time over which the refreshes of slots sent together are spread."""
+        self._refresh_spread = spread
+
+    def _spread_last_sent(self, slots: list[SlotKey]) -> None:
+        """Mark slots sent together as sent up to the refresh spread earlier.
+
+        The slots are then refreshed in several smaller steps instead of all
+        together. They are only refreshed earlier, never later than required.
+        """
+        now = time.monotonic()
+        for position, slot in enumerate(slots):
+            self._last_sent[slot] = now - self._refresh_spread * position / len(slots)
+
+    async def refresh(self, max_age: float) -> int:
+        """Resend only the slots not sent within max_age seconds, oldest first."""
+        now = time.monotonic()
+        stale_slots = sorted(
+            (
+                x
+                for x in self._get_slots()
+                if now - self._last_sent.get(x, -math.inf) >= max_age
+            ),
+            key=lambda x: self._last_sent.get(x, -math.inf),
+        )
+
+        if len(stale_slots) > 0:
+            _LOGGER.debug("Refresh %s slots on server", len(stale_slots))
+            await self._send_slots(stale_slots)
+            self._spread_last_sent(stale_slots)
+
+        return len(stale_slots)
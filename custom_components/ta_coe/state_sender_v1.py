@@ -2,22 +2,57 @@
 
 from typing import Any
 
-from ta_cmi import CoE, CoEChannel
-from ta_cmi.const import UNITS_EN, ChannelMode
+from ta_cmi import CoEChannel
+from ta_cmi.const import ChannelMode
 
 from custom_components.ta_coe.const import (
     CONF_ANALOG_ENTITIES,
     CONF_DIGITAL_ENTITIES,
     _LOGGER,
 )
-from custom_components.ta_coe.state_sender import AnalogValue, StateSender
+from custom_components.ta_coe.state_sender import (
+    AnalogValue,
+    SlotKey,
+    StateSender,
+    build_unit_id_map,
+)
+from custom_components.ta_coe.transport import CoETransport
+
+UNIT_IDS: dict[str, str] = build_unit_id_map({"1": "46"})
 
 
 class StateSenderV1(StateSender):
     """Handle the transfer to the CoE server V1."""
 
-    def __init__(self, coe: CoE, entity_config: dict[str, Any]):
+    ANALOG_PAGE_SIZE = 4
+    ANALOG_PAGE_COUNT = 8
+    DIGITAL_PAGE_SIZE = 16
+    DIGITAL_PAGE_COUNT = 2
+
+    def __init__(self, coe: CoETransport, entity_config: dict[str, Any]):
         """Initialize."""
+        self._analog_pages: list[list[CoEChannel]] = [
+            [
+                CoEChannel(
+                    ChannelMode.ANALOG, page_nr * self.ANALOG_PAGE_SIZE + i, 0, "0"
+                )
+                for i in range(self.ANALOG_PAGE_SIZE)
+            ]
+            for page_nr in range(self.ANALOG_PAGE_COUNT)
+        ]
+        self._digital_pages: list[list[CoEChannel]] = [
+            [
+                CoEChannel(
+                    ChannelMode.DIGITAL, page_nr * self.DIGITAL_PAGE_SIZE + i, False, ""
+                )
+                for i in range(self.DIGITAL_PAGE_SIZE)
+            ]
+            for page_nr in range(self.DIGITAL_PAGE_COUNT)
+        ]
+
+        self._dirty_analog_pages: set[int] = set()
+        self._dirty_digital_pages: set[int] = set()
+
         super().__init__(coe, entity_config)
 
         self._init_digital_states()
@@ -25,114 +60,177 @@ class StateSenderV1(StateSender):
 
     def _init_digital_states(self) -> None:
         """Create an empty digital states dict."""
-        index = 0
         for config in self._entity_config.get(CONF_DIGITAL_ENTITIES, []):
             if self._is_domain_digital(config.entity_id):
-                self._digital_states[str(index)] = False
-                index += 1
+                self._digital_states.setdefault(
+                    self._index_from_id[config.entity_id], False
+                )
 
     def _init_analog_states(self) -> None:
         """Create an empty analog states dict."""
-        index = 0
         for config in self._entity_config.get(CONF_ANALOG_ENTITIES, []):
             if not self._is_domain_digital(config.entity_id):
-                self._analog_states[str(index)] = AnalogValue(0, "0")
-                index += 1
+                self._analog_states.setdefault(
+                    self._index_from_id[config.entity_id], AnalogValue(0, "0")
+                )
+
+    def set_entity_config(self, entity_config: dict[str, Any]) -> None:
+        """Replace the configured entities and add the states of new channels."""
+        super().set_entity_config(entity_config)
+
+        self._init_digital_states()
+        self._init_analog_states()
+
+    def _clear_channel(self, mode: ChannelMode, index: int) -> None:
+        """Reset an unused channel to the default value in its page."""
+        super()._clear_channel(mode, index)
+
+        if mode is ChannelMode.ANALOG:
+            page_nr, position = divmod(index, self.ANALOG_PAGE_SIZE)
+
+            if page_nr < self.ANALOG_PAGE_COUNT:
+                self._analog_pages[page_nr][position] = CoEChannel(
+                    ChannelMode.ANALOG, index, 0, "0"
+                )
+                self._dirty_analog_pages.add(page_nr)
+        else:
+            page_nr, position = divmod(index, self.DIGITAL_PAGE_SIZE)
+
+            if page_nr < self.DIGITAL_PAGE_COUNT:
+                self._digital_pages[page_nr][position] = CoEChannel(
+                    ChannelMode.DIGITAL, index, False, ""
+                )
+                self._dirty_digital_pages.add(page_nr)
 
     @staticmethod
     def _convert_unit_to_id(unit: str) -> str:
         """Convert the unit to an id."""
-        unit_id: str = "0"
-        for key, value in UNITS_EN.items():
-            if unit == value:
-                unit_id = key
-                break
-
-        if unit_id == "1":
-            unit_id = "46"
-
-        return unit_id
-
-    def _build_digital_page(self):
-        """Build the digital page."""
-        page = [
-            CoEChannel(ChannelMode.DIGITAL, i, state, "")
-            for i, state in enumerate(self._digital_states.values(), 0)
-        ]
+        return UNIT_IDS.get(unit, "0")
 
-        if len(page) < 32:
-            page = page + [
-                CoEChannel(ChannelMode.DIGITAL, i, False, "")
-                for i in range(len(page), 32)
-            ]
+    def update_digital_manuel(self, entity_id: str, state: bool):
+        """Update a digital state and its page without sending update."""
+        super().update_digital_manuel(entity_id, state)
 
-        return page
+        index = int(self._index_from_id[entity_id])
+        page_nr, position = divmod(index, self.DIGITAL_PAGE_SIZE)
+
+        if page_nr >= self.DIGITAL_PAGE_COUNT:
+            _LOGGER.warning("Digital id %s of %s is not supported", index + 1, entity_id)
+            return
+
+        self._digital_pages[page_nr][position] = CoEChannel(
+            ChannelMode.DIGITAL, index, state, ""
+        )
+        self._dirty_digital_pages.add(page_nr)
+
+    def update_analog_manuel(self, entity_id: str, state: float, unit: str):
+        """Update an analog state and its page without sending update."""
+        super().update_analog_manuel(entity_id, state, unit)
 
-    async def update_digital(self, entity_id: str, state: bool):
-        """Update a digital state with sending update."""
-        self.update_digital_manuel(entity_id, state)
         index = int(self._index_from_id[entity_id])
+        page_nr, position = divmod(index, self.ANALOG_PAGE_SIZE)
 
-        page = self._build_digital_page()
+        if page_nr >= self.ANALOG_PAGE_COUNT:
+            _LOGGER.warning("Analog id %s of %s is not supported", index + 1, entity_id)
+            return
 
-        _LOGGER.debug(f"Send digital update to server: {entity_id}")
+        self._analog_pages[page_nr][position] = CoEChannel(
+            ChannelMode.ANALOG, index, state, self._convert_unit_to_id(unit)
+        )
+        self._dirty_analog_pages.add(page_nr)
 
-        if index >= 15:
-            await self._coe.send_digital_values(page[-16:], True)
-        else:
-            await self._coe.send_digital_values(page[:16], False)
-
-    def _build_analog_page(self) -> list[CoEChannel]:
-        """Build the analog page."""
-        page = [
-            CoEChannel(
-                ChannelMode.ANALOG, i, state.value, self._convert_unit_to_id(state.unit)
-            )
-            for i, state in enumerate(self._analog_states.values(), 0)
-        ]
+    async def _send_analog_page(self, page_nr: int) -> None:
+        """Send an analog page to the server."""
+        await self._coe.send_analog_values(
+            list(self._analog_pages[page_nr]), page_nr + 1
+        )
+        self._mark_sent([(ChannelMode.ANALOG, page_nr)])
 
-        if len(page) < 32:
-            page = page + [
-                CoEChannel(ChannelMode.ANALOG, i, 0, "0") for i in range(len(page), 32)
-            ]
+    async def _send_digital_page(self, page_nr: int) -> None:
+        """Send a digital page to the server."""
+        await self._coe.send_digital_values(
+            list(self._digital_pages[page_nr]), page_nr == 1
+        )
+        self._mark_sent([(ChannelMode.DIGITAL, page_nr)])
+
+    async def _send_dirty_pages(self) -> None:
+        """Send all pages with changes since they were sent the last time."""
+        analog_pages = sorted(self._dirty_analog_pages)
+        digital_pages = sorted(self._dirty_digital_pages)
+
+        self._dirty_analog_pages.clear()
+        self._dirty_digital_pages.clear()
+
+        for page_nr in analog_pages:
+            await self._send_analog_page(page_nr)
 
-        return page
+        for page_nr in digital_pages:
+            await self._send_digital_page(page_nr)
+
+    async def update_digital(self, entity_id: str, state: bool):
+        """Update a digital state with sending update."""
+        self.update_digital_manuel(entity_id, state)
+
+        _LOGGER.debug("Send digital update to server: %s", entity_id)
+
+        await self._send_dirty_pages()
 
     async def update_analog(self, entity_id: str, state: float, unit: str):
         """Update an analog state with sending update."""
         self.update_analog_manuel(entity_id, state, unit)
-        index = int(self._index_from_id[entity_id])
 
-        page = self._build_analog_page()
+        _LOGGER.debug("Send analog update to server: %s", entity_id)
+
+        await self._send_dirty_pages()
 
-        _LOGGER.debug(f"Send analog update to server: {entity_id}")
+    async def update_batch(
+        self, analog_states: dict[str, AnalogValue], digital_states: dict[str, bool]
+    ) -> None:
+        """Update multiple states and send only the changed pages."""
+        for entity_id, state in analog_states.items():
+            self.update_analog_manuel(entity_id, state.value, state.unit)
 
-        page_nr = index // 4
-        index_first = page_nr * 4
-        index_second = (page_nr + 1) * 4
+        for entity_id, value in digital_states.items():
+            self.update_digital_manuel(entity_id, value)
 
-        if page_nr == 0:
-            index_first = 0
+        _LOGGER.debug(
+            "Send %s updates to server", len(analog_states) + len(digital_states)
+        )
 
-        await self._coe.send_analog_values(page[index_first:index_second], page_nr + 1)
+        await self._send_dirty_pages()
 
     async def update(self):
         """Send all values to the server."""
-        _LOGGER.debug(f"Send all {self.entity_count()} values to server")
+        analog_pages = range(self.ANALOG_PAGE_COUNT)
+        digital_pages = range(self.DIGITAL_PAGE_COUNT)
+
+        _LOGGER.debug(
+            "Send %s analog and %s digital pages to server",
+            len(analog_pages),
+            len(digital_pages),
+        )
 
-        analog_page = self._build_analog_page()
+        self._dirty_analog_pages.clear()
+        self._dirty_digital_pages.clear()
 
-        for page_nr in range(8):
-            index_first = page_nr * 4
-            index_second = (page_nr + 1) * 4
+        for page_nr in analog_pages:
+            await self._send_analog_page(page_nr)
 
-            if page_nr == 0:
-                index_first = 0
+        for page_nr in digital_pages:
+            await self._send_digital_page(page_nr)
 
-            await self._coe.send_analog_values(
-                analog_page[index_first:index_second], page_nr + 1
-            )
+        self._spread_last_sent(self._get_slots())
+
+    def _get_slots(self) -> list[SlotKey]:
+        """Return the keys of all pages."""
+        return [(ChannelMode.ANALOG, x) for x in range(self.ANALOG_PAGE_COUNT)] + [
+            (ChannelMode.DIGITAL, x) for x in range(self.DIGITAL_PAGE_COUNT)
+        ]
 
-        digital_page = self._build_digital_page()
-        await self._coe.send_digital_values(digital_page[:16], False)
-        await self._coe.send_digital_values(digital_page[-16:], True)
+    async def _send_slots(self, slots: list[SlotKey]) -> None:
+        """Send the given pages to the server."""
+        for mode, page_nr in slots:
+            if mode is ChannelMode.ANALOG:
+                await self._send_analog_page(page_nr)
+            else:
+                await self._send_digital_page(page_nr)
@@ -2,11 +2,18 @@
 
 from typing import Any
 
-from ta_cmi import ChannelMode, CoE, CoEChannel
-from ta_cmi.const import UNITS_EN
+from ta_cmi import ChannelMode, CoEChannel
 
 from custom_components.ta_coe.const import _LOGGER
-from custom_components.ta_coe.state_sender import StateSender
+from custom_components.ta_coe.state_sender import (
+    AnalogValue,
+    SlotKey,
+    StateSender,
+    build_unit_id_map,
+)
+from custom_components.ta_coe.transport import CoETransport
+
+UNIT_IDS: dict[str, str] = build_unit_id_map({"46": "1"})
 
 
 class StateSenderV2(StateSender):
@@ -14,82 +21,134 @@ class StateSenderV2(StateSender):
 
     DIGITAL_UNIT = "43"
 
-    def __init__(self, coe: CoE, entity_config: dict[str, Any]):
+    def __init__(self, coe: CoETransport, entity_config: dict[str, Any]):
         """Initialize."""
         super().__init__(coe, entity_config)
 
     @staticmethod
     def _convert_unit_to_id(unit: str) -> str:
         """Convert the unit to an id."""
-        unit_id: str = "0"
-        for key, value in UNITS_EN.items():
-            if unit == value:
-                unit_id = key
-                break
+        return UNIT_IDS.get(unit, "0")
+
+    def _build_digital_channel(self, index: str, state: bool) -> CoEChannel:
+        """Build a digital channel for a slot index."""
+        return CoEChannel(
+            mode=ChannelMode.DIGITAL,
+            index=int(index) + 1,
+            value=state,
+            unit=self.DIGITAL_UNIT,
+        )
+
+    def _build_analog_channel(self, index: str, state: AnalogValue) -> CoEChannel:
+        """Build an analog channel for a slot index."""
+        return CoEChannel(
+            mode=ChannelMode.ANALOG,
+            index=int(index) + 1,
+            value=state.value,
+            unit=self._convert_unit_to_id(state.unit),
+        )
 
-        if unit_id == "46":
-            unit_id = "1"
+    async def _send_channels(
+        self, analog_channels: list[CoEChannel], digital_channels: list[CoEChannel]
+    ) -> None:
+        """Send the channels with one message per channel mode."""
+        if len(analog_channels) != 0:
+            await self._coe.send_analog_values_v2(analog_channels)
+
+        if len(digital_channels) != 0:
+            await self._coe.send_digital_values_v2(digital_channels)
 
-        return unit_id
+        self._mark_sent([
+            (channel.mode, channel.index - 1)
+            for channel in analog_channels + digital_channels
+        ])
+
+    def _clear_channel(self, mode: ChannelMode, index: int) -> None:
+        """Remove the state and the send time of an unused channel."""
+        super()._clear_channel(mode, index)
+        self._last_sent.pop((mode, index), None)
 
     async def update_digital(self, entity_id: str, state: bool):
         """Update a digital state with sending update."""
         self.update_digital_manuel(entity_id, state)
 
-        _LOGGER.debug(f"Send digital update to server: {entity_id}")
-
-        index = int(self._index_from_id[entity_id])
-        coe_channel = CoEChannel(
-            mode=ChannelMode.DIGITAL,
-            index=index + 1,
-            value=state,
-            unit=self.DIGITAL_UNIT,
-        )
+        _LOGGER.debug("Send digital update to server: %s", entity_id)
 
-        await self._coe.send_digital_values_v2([coe_channel])
+        index = self._index_from_id[entity_id]
+        await self._send_channels([], [self._build_digital_channel(index, state)])
 
     async def update_analog(self, entity_id: str, state: float, unit: str):
         """Update an analog state with sending update."""
         self.update_analog_manuel(entity_id, state, unit)
 
-        _LOGGER.debug(f"Send digital update to server: {entity_id}")
+        _LOGGER.debug("Send analog update to server: %s", entity_id)
 
-        index = int(self._index_from_id[entity_id])
-        coe_channel = CoEChannel(
-            mode=ChannelMode.ANALOG,
-            index=index + 1,
-            value=state,
-            unit=self._convert_unit_to_id(unit),
+        index = self._index_from_id[entity_id]
+        await self._send_channels(
+            [self._build_analog_channel(index, AnalogValue(state, unit))], []
         )
 
-        await self._coe.send_analog_values_v2([coe_channel])
+    async def update_batch(
+        self, analog_states: dict[str, AnalogValue], digital_states: dict[str, bool]
+    ) -> None:
+        """Update multiple states with one message per channel mode."""
+        for entity_id, state in analog_states.items():
+            self.update_analog_manuel(entity_id, state.value, state.unit)
+
+        for entity_id, value in digital_states.items():
+            self.update_digital_manuel(entity_id, value)
+
+        _LOGGER.debug(
+            "Send %s updates to server", len(analog_states) + len(digital_states)
+        )
+
+        await self._send_channels(
+            [
+                self._build_analog_channel(self._index_from_id[entity_id], state)
+                for entity_id, state in analog_states.items()
+            ],
+            [
+                self._build_digital_channel(self._index_from_id[entity_id], value)
+                for entity_id, value in digital_states.items()
+            ],
+        )
 
     async def update(self):
         """Send all values to the server."""
-        _LOGGER.debug(f"Send all {self.entity_count()} values to server")
-
-        analog_channels = [
-            CoEChannel(
-                mode=ChannelMode.ANALOG,
-                index=int(index) + 1,
-                value=state.value,
-                unit=self._convert_unit_to_id(state.unit),
-            )
-            for index, state in self._analog_states.items()
-        ]
+        _LOGGER.debug("Send all %s values to server", self.entity_count())
+
+        await self._send_channels(
+            [
+                self._build_analog_channel(index, state)
+                for index, state in self._analog_states.items()
+            ],
+            [
+                self._build_digital_channel(index, value)
+                for index, value in self._digital_states.items()
+            ],
+        )
 
-        digital_channels = [
-            CoEChannel(
-                mode=ChannelMode.DIGITAL,
-                index=int(index) + 1,
-                value=value,
-                unit=self.DIGITAL_UNIT,
-            )
-            for index, value in self._digital_states.items()
-        ]
+        self._spread_last_sent(self._get_slots())
 
-        if len(analog_channels) != 0:
-            await self._coe.send_analog_values_v2(analog_channels)
+    def _get_slots(self) -> list[SlotKey]:
+        """Return the keys of all channels with a value."""
+        return [(ChannelMode.ANALOG, int(x)) for x in self._analog_states] + [
+            (ChannelMode.DIGITAL, int(x)) for x in self._digital_states
+        ]
 
-        if len(digital_channels) != 0:
-            await self._coe.send_digital_values_v2(digital_channels)
+    async def _send_slots(self, slots: list[SlotKey]) -> None:
+        """Send the given channels to the server."""
+        await self._send_channels(
+            [
+                self._build_analog_channel(str(index), self._analog_states[str(index)])
+                for mode, index in slots
+                if mode is ChannelMode.ANALOG
+            ],
+            [
+                self._build_digital_channel(
+                    str(index), self._digital_states[str(index)]
+                )
+                for mode, index in slots
+                if mode is ChannelMode.DIGITAL
+            ],
+        )
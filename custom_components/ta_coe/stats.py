@@ -0,0 +1,159 @@
+"""Timings and counters of the CoE hot paths."""
+
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from collections import deque
+from collections.abc import Awaitable
+from dataclasses import dataclass, field
+from typing import Any
+
+from ta_cmi import ChannelMode, CoEChannel, CoEServerConfig
+
+from .const import RECENT_TIMINGS
+from .transport import CoETransport
+
+LATENCY_BUCKETS: tuple[float, ...] = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+@dataclass(slots=True)
+class LatencyHistogram:
+    """Histogram of durations in seconds."""
+
+    buckets: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+    count: int = 0
+    total: float = 0.0
+    last: float = 0.0
+    max: float = 0.0
+    recent: deque[float] = field(default_factory=lambda: deque(maxlen=RECENT_TIMINGS))
+
+    def record(self, seconds: float) -> None:
+        """Add a duration to the histogram."""
+        self.buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.last = seconds
+        self.max = max(self.max, seconds)
+        self.recent.append(seconds)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram as a serializable dict."""
+        return {
+            "count": self.count,
+            "last": self.last,
+            "max": self.max,
+            "mean": self.total / self.count if self.count else 0.0,
+            "buckets": {
+                **{f"le_{x}": y for x, y in zip(LATENCY_BUCKETS, self.buckets)},
+                "le_inf": self.buckets[-1],
+            },
+            "recent": list(self.recent),
+        }
+
+
+@dataclass(slots=True)
+class CoEStats:
+    """Counters and timings of one config entry."""
+
+    poll_latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    request_latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    send_latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    refresh_latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    polls: int = 0
+    poll_errors: int = 0
+    requests: int = 0
+    request_errors: int = 0
+    sent_messages: int = 0
+    sent_channels: int = 0
+    send_errors: int = 0
+    refreshes: int = 0
+    refreshed_slots: int = 0
+
+    setup_time: float | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the stats as a serializable dict."""
+        return {
+            "poll_latency": self.poll_latency.as_dict(),
+            "request_latency": self.request_latency.as_dict(),
+            "send_latency": self.send_latency.as_dict(),
+            "refresh_latency": self.refresh_latency.as_dict(),
+            "polls": self.polls,
+            "poll_errors": self.poll_errors,
+            "requests": self.requests,
+            "request_errors": self.request_errors,
+            "sent_messages": self.sent_messages,
+            "sent_channels": self.sent_channels,
+            "send_errors": self.send_errors,
+            "refreshes": self.refreshes,
+            "refreshed_slots": self.refreshed_slots,
+            "setup_time": self.setup_time,
+        }
+
+
+class StatsTransport:
+    """Count and time all requests and messages of a transport."""
+
+    def __init__(self, transport: CoETransport, stats: CoEStats) -> None:
+        """Initialize."""
+        self._transport = transport
+        self._stats = stats
+
+    async def update(self, can_id: int) -> None:
+        """Fetch the channels of a CAN-ID."""
+        stats = self._stats
+        stats.requests += 1
+        start = time.monotonic()
+
+        try:
+            await self._transport.update(can_id)
+        except Exception:
+            stats.request_errors += 1
+            raise
+        finally:
+            stats.request_latency.record(time.monotonic() - start)
+
+    def get_channels(
+        self, can_id: int, channel_mode: ChannelMode
+    ) -> dict[int, CoEChannel]:
+        """Get the last fetched channels of a CAN-ID."""
+        return self._transport.get_channels(can_id, channel_mode)
+
+    async def get_server_config(self) -> CoEServerConfig:
+        """Get the config of the server."""
+        return await self._transport.get_server_config()
+
+    async def _send(self, channels: list[CoEChannel], send: Awaitable[None]) -> None:
+        """Send one message and record it."""
+        stats = self._stats
+        stats.sent_messages += 1
+        stats.sent_channels += len(channels)
+        start = time.monotonic()
+
+        try:
+            await send
+        except Exception:
+            stats.send_errors += 1
+            raise
+        finally:
+            stats.send_latency.record(time.monotonic() - start)
+
+    async def send_analog_values(self, data: list[CoEChannel], page: int) -> None:
+        """Send an analog page to a V1 server."""
+        await self._send(data, self._transport.send_analog_values(data, page))
+
+    async def send_digital_values(
+        self, data: list[CoEChannel], second_page: bool
+    ) -> None:
+        """Send a digital page to a V1 server."""
+        await self._send(data, self._transport.send_digital_values(data, second_page))
+
+    async def send_analog_values_v2(self, channel: list[CoEChannel]) -> None:
+        """Send analog channels to a V2 server."""
+        await self._send(channel, self._transport.send_analog_values_v2(channel))
+
+    async def send_digital_values_v2(self, channel: list[CoEChannel]) -> None:
+        """Send digital channels to a V2 server."""
+        await self._send(channel, self._transport.send_digital_values_v2(channel))
@@ -0,0 +1,33 @@
+"""Sampled trace logging for the hot paths."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+
+class SampledTrace:
+    """Log only one in N events to a trace logger.
+
+    The trace is off unless debug logging is enabled for the trace logger, so
+    it costs a single level check per event when it is not used.
+    """
+
+    def __init__(self, logger: logging.Logger, rate: int) -> None:
+        """Initialize."""
+        self._logger = logger
+        self._rate = max(rate, 1)
+        self._count = 0
+
+    def __call__(self, msg: str, *args: Any) -> None:
+        """Log the event if it is the N-th since the last logged one."""
+        if not self._logger.isEnabledFor(logging.DEBUG):
+            return
+
+        self._count += 1
+
+        if self._count < self._rate:
+            return
+
+        self._count = 0
+        self._logger.debug(f"{msg} (1 of %s events)", *args, self._rate)
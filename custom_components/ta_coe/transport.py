@@ -0,0 +1,40 @@
+"""Transport used to exchange values with the CoE server."""
+
+from __future__ import annotations
+
+from typing import Protocol
+
+from ta_cmi import ChannelMode, CoEChannel, CoEServerConfig
+
+
+class CoETransport(Protocol):
+    """Interface of the CoE server used by the coordinator and the senders.
+
+    The ta-cmi CoE client implements it. Other implementations can be used to
+    run the integration against a simulated server.
+    """
+
+    async def update(self, can_id: int) -> None:
+        """Fetch the channels of a CAN-ID."""
+
+    def get_channels(
+        self, can_id: int, channel_mode: ChannelMode
+    ) -> dict[int, CoEChannel]:
+        """Get the last fetched channels of a CAN-ID."""
+
+    async def get_server_config(self) -> CoEServerConfig:
+        """Get the config of the server."""
+
+    async def send_analog_values(self, data: list[CoEChannel], page: int) -> None:
+        """Send an analog page to a V1 server."""
+
+    async def send_digital_values(
+        self, data: list[CoEChannel], second_page: bool
+    ) -> None:
+        """Send a digital page to a V1 server."""
+
+    async def send_analog_values_v2(self, channel: list[CoEChannel]) -> None:
+        """Send analog channels to a V2 server."""
+
+    async def send_digital_values_v2(self, channel: list[CoEChannel]) -> None:
+        """Send digital channels to a V2 server."""
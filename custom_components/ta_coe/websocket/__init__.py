@@ -5,6 +5,7 @@ from homeassistant.core import HomeAssistant, callback
 
 from .config import coe_config_entries
 from .expose import coe_exposed_entities_config, coe_exposed_entities_update
+from .stats import coe_stats
 
 
 @callback
@@ -13,4 +14,5 @@ def async_register_websocket_commands(hass: HomeAssistant) -> None:
     websocket_api.async_register_command(hass, coe_exposed_entities_config)
     websocket_api.async_register_command(hass, coe_exposed_entities_update)
     websocket_api.async_register_command(hass, coe_config_entries)
+    websocket_api.async_register_command(hass, coe_stats)
 
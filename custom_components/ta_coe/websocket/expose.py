@@ -1,5 +1,4 @@
 """Websocket commands for configuring exposed entities."""
-from dataclasses import asdict
 from typing import Any
 
 import voluptuous as vol
@@ -49,6 +48,15 @@ async def coe_exposed_entities_config(
                 vol.Schema({
                     vol.Required("id"): vol.All(vol.Coerce(int), vol.Range(min=1)),
                     vol.Required("entity_id"): cv.entity_id,
+                    vol.Optional("min_send_interval"): vol.All(
+                        vol.Coerce(float), vol.Range(min=0)
+                    ),
+                    vol.Optional("deadband"): vol.All(
+                        vol.Coerce(float), vol.Range(min=0)
+                    ),
+                    vol.Optional("deadband_percent"): vol.All(
+                        vol.Coerce(float), vol.Range(min=0, max=100)
+                    ),
                 })
             ],
         ),
@@ -58,6 +66,9 @@ async def coe_exposed_entities_config(
                 vol.Schema({
                     vol.Required("id"): vol.All(vol.Coerce(int), vol.Range(min=1)),
                     vol.Required("entity_id"): cv.entity_id,
+                    vol.Optional("min_send_interval"): vol.All(
+                        vol.Coerce(float), vol.Range(min=0)
+                    ),
                 })
             ],
         ),
@@ -78,8 +89,8 @@ async def coe_exposed_entities_update(
         entry, data={
             **entry.data,
             CONF_ENTITIES_TO_SEND: {
-                CONF_ANALOG_ENTITIES: [asdict(ConfEntityToSend(**x)) for x in msg["config"][CONF_ANALOG_ENTITIES]],
-                CONF_DIGITAL_ENTITIES: [asdict(ConfEntityToSend(**x)) for x in msg["config"][CONF_DIGITAL_ENTITIES]],
+                CONF_ANALOG_ENTITIES: [ConfEntityToSend(**x).to_dict() for x in msg["config"][CONF_ANALOG_ENTITIES]],
+                CONF_DIGITAL_ENTITIES: [ConfEntityToSend(**x).to_dict() for x in msg["config"][CONF_DIGITAL_ENTITIES]],
             }
         }
     )
@@ -0,0 +1,40 @@
+"""Websocket command for the integration stats."""
+from typing import Any
+
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant
+
+from ..const import DOMAIN
+
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "ta_coe/stats",
+    vol.Required("config_entry_id"): str,
+})
+@websocket_api.require_admin
+@websocket_api.async_response
+async def coe_stats(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Return the timings and counters of a config entry."""
+    entry_data = hass.data.get(DOMAIN, {}).get(msg["config_entry_id"])
+
+    if entry_data is None:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Config entry not loaded"
+        )
+        return
+
+    connection.send_message(
+        websocket_api.result_message(
+            msg["id"],
+            {
+                "stats": {
+                    **entry_data["stats"].as_dict(),
+                    "queue_depth": entry_data["observer"].queue_depth,
+                    "queue_dropped": entry_data["observer"].dropped_states,
+                }
+            },
+        )
+    )
@@ -10,6 +10,9 @@ export interface ConfigEntryMetadata {
 export interface ExposedEntityConfig{
   entity_id: string;
   id: number;
+  min_send_interval?: number;
+  deadband?: number;
+  deadband_percent?: number;
 }
 
 export interface ExposedEntitiesConfig{
@@ -0,0 +1 @@
+"""Benchmarks for the Technische Alternative CoE integration."""
@@ -0,0 +1,83 @@
+"""Fixtures for the benchmarks."""
+
+import json
+import os
+import time
+from collections.abc import Awaitable, Callable, Generator
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+BASELINE_FILE = Path(__file__).parent / "baseline.json"
+UPDATE_BASELINE_ENV = "TA_COE_UPDATE_BASELINE"
+
+# Runners are slower and noisier than a developer machine, so only a large
+# slowdown against the stored time fails. Counters must not increase.
+TIME_TOLERANCE = 5.0
+TIME_SLACK = 0.002
+
+
+class Benchmark:
+    """Measure a function and compare the result with the stored baseline."""
+
+    def __init__(self, baselines: dict[str, dict[str, Any]], update: bool) -> None:
+        """Initialize."""
+        self._baselines = baselines
+        self._update = update
+
+    @staticmethod
+    async def measure(
+        func: Callable[[], Awaitable[Any]],
+        rounds: int = 5,
+        setup: Callable[[], Any] | None = None,
+    ) -> float:
+        """Return the fastest duration of all rounds in seconds."""
+        durations = []
+
+        for _ in range(rounds):
+            if setup is not None:
+                setup()
+
+            start = time.perf_counter()
+            await func()
+            durations.append(time.perf_counter() - start)
+
+        return min(durations)
+
+    def check(self, name: str, seconds: float, **counters: int) -> None:
+        """Compare a result with the baseline or store it in update mode."""
+        if self._update:
+            self._baselines[name] = {"seconds": round(seconds, 6), **counters}
+            return
+
+        assert name in self._baselines, (
+            f"No baseline for {name}, run with {UPDATE_BASELINE_ENV}=1"
+        )
+        baseline = self._baselines[name]
+
+        for key, value in counters.items():
+            assert value <= baseline[key], (
+                f"{name}: {key} regressed from {baseline[key]} to {value}"
+            )
+
+        assert seconds <= baseline["seconds"] * TIME_TOLERANCE + TIME_SLACK, (
+            f"{name}: took {seconds:.6f}s, baseline is {baseline['seconds']:.6f}s"
+        )
+
+
+@pytest.fixture(scope="session")
+def benchmark_baselines() -> Generator[dict[str, dict[str, Any]]]:
+    """Load the stored baselines and write them back in update mode."""
+    baselines = json.loads(BASELINE_FILE.read_text()) if BASELINE_FILE.exists() else {}
+
+    yield baselines
+
+    if os.environ.get(UPDATE_BASELINE_ENV):
+        BASELINE_FILE.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+
+
+@pytest.fixture
+def benchmark(benchmark_baselines: dict[str, dict[str, Any]]) -> Benchmark:
+    """Provide the benchmark helper."""
+    return Benchmark(benchmark_baselines, bool(os.environ.get(UPDATE_BASELINE_ENV)))
@@ -0,0 +1,44 @@
+"""Benchmark the poll path of the Technische Alternative CoE coordinator."""
+
+from datetime import timedelta
+
+import pytest
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.ta_coe.coordinator import CoEDataUpdateCoordinator
+from tests.benchmarks.conftest import Benchmark
+from tests.fake_coe import FakeCoE
+
+ROUNDS = 5
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("can_id_count", [1, 8, 64])
+async def test_benchmark_coordinator_update(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    benchmark: Benchmark,
+    can_id_count: int,
+) -> None:
+    """Benchmark a full update of all CAN-IDs."""
+    coe = FakeCoE(node_count=can_id_count, analog_count=32, digital_count=32)
+    coordinator = CoEDataUpdateCoordinator(
+        hass,
+        mock_config_entry,
+        coe,
+        list(range(1, can_id_count + 1)),
+        timedelta(minutes=1),
+    )
+
+    seconds = await benchmark.measure(
+        coordinator._async_update_data,
+        ROUNDS,
+        coordinator._next_update.clear,
+    )
+
+    benchmark.check(
+        f"coordinator_update_{can_id_count}",
+        seconds,
+        requests=coe.stats.requests // ROUNDS,
+    )
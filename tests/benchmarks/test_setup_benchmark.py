@@ -0,0 +1,68 @@
+"""Benchmark the setup of a Technische Alternative CoE config entry."""
+
+from unittest.mock import patch
+
+import pytest
+from homeassistant.const import CONF_HOST
+from homeassistant.core import CoreState, HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.ta_coe.const import (
+    ANALOG_DOMAINS,
+    CONF_ANALOG_ENTITIES,
+    CONF_CAN_IDS,
+    CONF_DIGITAL_ENTITIES,
+    CONF_ENTITIES_TO_SEND,
+    DIGITAL_DOMAINS,
+    DOMAIN,
+)
+from tests.benchmarks.conftest import Benchmark
+from tests.const import COE_CLASS_PACKAGE
+from tests.fake_coe import FakeCoE
+
+ROUNDS = 3
+CAN_ID_COUNT = 64
+ENTITY_COUNT = 32
+
+
+@pytest.mark.asyncio
+async def test_benchmark_setup_entry(hass: HomeAssistant, benchmark: Benchmark) -> None:
+    """Benchmark the setup and unload of an entry during the Home Assistant start."""
+    coe = FakeCoE(node_count=CAN_ID_COUNT, analog_count=4, digital_count=4)
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="CoE",
+        data={
+            CONF_HOST: "http://192.168.2.101",
+            CONF_CAN_IDS: list(range(1, CAN_ID_COUNT + 1)),
+            CONF_ENTITIES_TO_SEND: {
+                CONF_ANALOG_ENTITIES: [
+                    {"id": i, "entity_id": f"{ANALOG_DOMAINS[0]}.test_{i}"}
+                    for i in range(1, ENTITY_COUNT + 1)
+                ],
+                CONF_DIGITAL_ENTITIES: [
+                    {"id": i, "entity_id": f"{DIGITAL_DOMAINS[0]}.test_{i}"}
+                    for i in range(1, ENTITY_COUNT + 1)
+                ],
+            },
+        },
+        minor_version=2,
+        version=1,
+    )
+    entry.add_to_hass(hass)
+
+    hass.set_state(CoreState.not_running)
+
+    async def setup_and_unload() -> None:
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        assert await hass.config_entries.async_unload(entry.entry_id)
+
+    with patch(COE_CLASS_PACKAGE, return_value=coe):
+        seconds = await benchmark.measure(setup_and_unload, ROUNDS)
+
+    benchmark.check(
+        "entry_setup_64",
+        seconds,
+        requests=coe.stats.requests // ROUNDS,
+        messages=coe.stats.messages,
+    )
@@ -0,0 +1,78 @@
+"""Benchmark the state change path of the Technische Alternative CoE observer."""
+
+import pytest
+from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT, EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant, State
+
+from custom_components.ta_coe import StateObserver
+from custom_components.ta_coe.const import (
+    ANALOG_DOMAINS,
+    CONF_ANALOG_ENTITIES,
+    CONF_DIGITAL_ENTITIES,
+    DIGITAL_DOMAINS,
+)
+from custom_components.ta_coe.state_sender_v2 import StateSenderV2
+from tests import create_dummy_conf_entity_to_send
+from tests.benchmarks.conftest import Benchmark
+from tests.fake_coe import FakeCoE
+
+EVENT_COUNT = 2000
+
+
+@pytest.mark.asyncio
+async def test_benchmark_observer_update_listener(
+    hass: HomeAssistant, benchmark: Benchmark
+) -> None:
+    """Benchmark a burst of state changes of all exposed entities."""
+    coe = FakeCoE(node_count=0)
+    entity_config = {
+        CONF_ANALOG_ENTITIES: create_dummy_conf_entity_to_send(ANALOG_DOMAINS[0], 32),
+        CONF_DIGITAL_ENTITIES: create_dummy_conf_entity_to_send(
+            DIGITAL_DOMAINS[0], 32
+        ),
+    }
+    entities = entity_config[CONF_ANALOG_ENTITIES] + entity_config[
+        CONF_DIGITAL_ENTITIES
+    ]
+
+    sender = StateSenderV2(coe, entity_config)
+    observer = StateObserver(hass, coe, sender, entity_config)
+
+    events = []
+    for i in range(EVENT_COUNT):
+        entity_id = entities[i % len(entities)].entity_id
+
+        if entity_id.startswith(ANALOG_DOMAINS[0]):
+            new_state = State(entity_id, str(i), {ATTR_UNIT_OF_MEASUREMENT: "°C"})
+        else:
+            new_state = State(entity_id, "on" if i % 128 < 64 else "off")
+
+        events.append(
+            Event(
+                EVENT_STATE_CHANGED,
+                {"entity_id": entity_id, "old_state": None, "new_state": new_state},
+            )
+        )
+
+    async def handle_events() -> None:
+        for event in events:
+            observer._update_listener(event)
+
+    def reset_states() -> None:
+        for record in observer._entities.values():
+            record.value = None
+            record.unit = None
+
+    seconds = await benchmark.measure(handle_events, setup=reset_states)
+
+    # Send the merged states.
+    await observer._queue.async_flush()
+
+    observer.stop()
+
+    benchmark.check(
+        "observer_update_listener",
+        seconds,
+        messages=coe.stats.messages,
+        channels=coe.stats.channels,
+    )
@@ -0,0 +1,54 @@
+"""Benchmark the full resend of the Technische Alternative CoE state senders."""
+
+import pytest
+
+from custom_components.ta_coe.const import (
+    ANALOG_DOMAINS,
+    CONF_ANALOG_ENTITIES,
+    CONF_DIGITAL_ENTITIES,
+    DIGITAL_DOMAINS,
+)
+from custom_components.ta_coe.state_sender import StateSender
+from custom_components.ta_coe.state_sender_v1 import StateSenderV1
+from custom_components.ta_coe.state_sender_v2 import StateSenderV2
+from tests import create_dummy_conf_entity_to_send
+from tests.benchmarks.conftest import Benchmark
+from tests.fake_coe import FakeCoE
+
+ROUNDS = 5
+UPDATES_PER_ROUND = 100
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("name", "sender_class"), [("v1", StateSenderV1), ("v2", StateSenderV2)]
+)
+async def test_benchmark_sender_update(
+    benchmark: Benchmark, name: str, sender_class: type[StateSender]
+) -> None:
+    """Benchmark the full resend of 32 analog and 32 digital values."""
+    coe = FakeCoE(node_count=0)
+    analog_ids = create_dummy_conf_entity_to_send(ANALOG_DOMAINS[0], 32)
+    digital_ids = create_dummy_conf_entity_to_send(DIGITAL_DOMAINS[0], 32)
+    sender = sender_class(
+        coe, {CONF_ANALOG_ENTITIES: analog_ids, CONF_DIGITAL_ENTITIES: digital_ids}
+    )
+
+    for i, entity in enumerate(analog_ids):
+        sender.update_analog_manuel(entity.entity_id, i / 10, "°C")
+    for i, entity in enumerate(digital_ids):
+        sender.update_digital_manuel(entity.entity_id, i % 2 == 0)
+
+    async def send_updates() -> None:
+        for _ in range(UPDATES_PER_ROUND):
+            await sender.update()
+
+    seconds = await benchmark.measure(send_updates, ROUNDS)
+    update_count = ROUNDS * UPDATES_PER_ROUND
+
+    benchmark.check(
+        f"sender_update_{name}",
+        seconds,
+        messages=coe.stats.messages // update_count,
+        channels=coe.stats.channels // update_count,
+    )
@@ -1,6 +1,7 @@
 from ta_cmi import CoE
 
 from custom_components.ta_coe import ConfEntityToSend, StateSender
+from custom_components.ta_coe.state_sender import SlotKey
 
 
 class StubStateSender(StateSender):
@@ -17,3 +18,10 @@ class StubStateSender(StateSender):
 
     async def update(self) -> None:
         """Send all values to the server."""
+
+    def _get_slots(self) -> list[SlotKey]:
+        """Return the keys of all slots which are sent on an update."""
+        return []
+
+    async def _send_slots(self, slots: list[SlotKey]) -> None:
+        """Send the values of the given slots to the server."""
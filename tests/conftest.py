@@ -52,6 +52,7 @@ def mock_config_entry(hass: HomeAssistant) -> MockConfigEntry:
     config_entry: MockConfigEntry = MockConfigEntry(
         domain=DOMAIN,
         title="CoE",
+        entry_id="01JCOETESTENTRY",
         data=deepcopy(DUMMY_CONFIG_ENTRY),
         minor_version=2,
         version=1,
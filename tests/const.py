@@ -10,6 +10,8 @@ from custom_components.ta_coe import (
 )
 
 COEAPI_PACKAGE = "ta_cmi.coe_api.CoEAPI.get_coe_data"
+COE_UPDATE_PACKAGE = "ta_cmi.coe.CoE.update"
+COE_GET_CHANNELS_PACKAGE = "ta_cmi.coe.CoE.get_channels"
 COE_SEND_ANALOG_VALUES_PACKAGE = "ta_cmi.coe.CoE.send_analog_values"
 COE_SEND_DIGITAL_VALUES_PACKAGE = "ta_cmi.coe.CoE.send_digital_values"
 COE_SEND_ANALOG_VALUES_V2_PACKAGE = "ta_cmi.coe.CoE.send_analog_values_v2"
@@ -28,6 +30,8 @@ STATE_SENDER_UPDATE_ANALOG_MANUEL_PACKAGE = (
 STATE_SENDER_STUB_UPDATE_DIGITAL_PACKAGE = "tests.common.StubStateSender.update_digital"
 STATE_SENDER_STUB_UPDATE_ANALOG_PACKAGE = "tests.common.StubStateSender.update_analog"
 STATE_SENDER_STUB_UPDATE = "tests.common.StubStateSender.update"
+STATE_SENDER_STUB_UPDATE_BATCH = "tests.common.StubStateSender.update_batch"
+STATE_SENDER_STUB_REFRESH = "tests.common.StubStateSender.refresh"
 STATE_SENDER_V1_UPDATE_DIGITAL_MANUEL_PACKAGE = (
     "custom_components.ta_coe.state_sender_v1.StateSenderV1.update_digital_manuel"
 )
@@ -58,6 +62,7 @@ OBSERVER_GET_ALL_STATES = (
     "custom_components.ta_coe.state_observer.StateObserver.get_all_states"
 )
 REFRESH_TASK_START_PACKAGE = "custom_components.ta_coe.refresh_task.RefreshTask.start"
+COE_CLASS_PACKAGE = "custom_components.ta_coe.CoE"
 
 DUMMY_DEVICE_API_DATA: dict[str, Any] = {
     "digital": [{"value": True, "unit": 43}],
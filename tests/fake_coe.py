@@ -0,0 +1,145 @@
+"""Simulated CoE server to test the integration without the CoE to HTTP addon."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from dataclasses import dataclass
+
+from ta_cmi import ApiError, ChannelMode, CoEChannel, CoEServerConfig
+
+DIGITAL_UNIT = "43"
+
+
+@dataclass
+class FakeCoEStats:
+    """Counters of the simulated transfers."""
+
+    requests: int = 0
+    lost: int = 0
+    messages: int = 0
+    channels: int = 0
+
+
+class FakeCoE:
+    """Simulate a CoE server with CAN nodes, latency, jitter and packet loss.
+
+    The random numbers are seeded, so the same configuration always produces
+    the same delays and losses.
+    """
+
+    def __init__(
+        self,
+        node_count: int = 64,
+        analog_count: int = 8,
+        digital_count: int = 8,
+        coe_version: int = 2,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        loss: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        """Initialize."""
+        self.coe_version = coe_version
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        self.stats = FakeCoEStats()
+
+        self._random = random.Random(seed)
+
+        self.nodes: dict[int, dict[ChannelMode, dict[int, CoEChannel]]] = {
+            can_id: {
+                ChannelMode.ANALOG: {
+                    index: CoEChannel(
+                        ChannelMode.ANALOG, index, can_id + index / 10, "1"
+                    )
+                    for index in range(1, analog_count + 1)
+                },
+                ChannelMode.DIGITAL: {
+                    index: CoEChannel(
+                        ChannelMode.DIGITAL, index, index % 2, DIGITAL_UNIT
+                    )
+                    for index in range(1, digital_count + 1)
+                },
+            }
+            for can_id in range(1, node_count + 1)
+        }
+
+        self.received: dict[ChannelMode, dict[int, CoEChannel]] = {
+            ChannelMode.ANALOG: {},
+            ChannelMode.DIGITAL: {},
+        }
+
+        self._channels: dict[int, dict[ChannelMode, dict[int, CoEChannel]]] = {}
+
+    def set_value(
+        self, can_id: int, mode: ChannelMode, index: int, value: float, unit: str
+    ) -> None:
+        """Change the value of a simulated channel."""
+        self.nodes[can_id][mode][index] = CoEChannel(mode, index, value, unit)
+
+    async def _transfer(self) -> None:
+        """Simulate the delay and the loss of a request."""
+        self.stats.requests += 1
+
+        delay = self.latency + self._random.uniform(-self.jitter, self.jitter)
+        await asyncio.sleep(max(delay, 0))
+
+        if self._random.random() < self.loss:
+            self.stats.lost += 1
+            raise ApiError("Simulated packet loss")
+
+    async def update(self, can_id: int) -> None:
+        """Fetch the channels of a CAN-ID."""
+        await self._transfer()
+
+        if can_id not in self.nodes:
+            return
+
+        self._channels[can_id] = {
+            mode: dict(channels) for mode, channels in self.nodes[can_id].items()
+        }
+
+    def get_channels(
+        self, can_id: int, channel_mode: ChannelMode
+    ) -> dict[int, CoEChannel]:
+        """Get the last fetched channels of a CAN-ID."""
+        return self._channels.get(can_id, {}).get(channel_mode, {})
+
+    async def get_server_config(self) -> CoEServerConfig:
+        """Get the config of the server."""
+        await self._transfer()
+        return CoEServerConfig(coe_version=self.coe_version)
+
+    async def _receive(self, channels: list[CoEChannel], offset: int = 0) -> None:
+        """Store the channels sent to the server by their CoE index.
+
+        The V1 pages contain the zero based slot index, so an offset of one is
+        used for them.
+        """
+        await self._transfer()
+
+        self.stats.messages += 1
+        self.stats.channels += len(channels)
+
+        for channel in channels:
+            self.received[channel.mode][channel.index + offset] = channel
+
+    async def send_analog_values(self, data: list[CoEChannel], page: int) -> None:
+        """Receive an analog page from a V1 sender."""
+        await self._receive(data, 1)
+
+    async def send_digital_values(
+        self, data: list[CoEChannel], second_page: bool
+    ) -> None:
+        """Receive a digital page from a V1 sender."""
+        await self._receive(data, 1)
+
+    async def send_analog_values_v2(self, channel: list[CoEChannel]) -> None:
+        """Receive analog channels from a V2 sender."""
+        await self._receive(channel)
+
+    async def send_digital_values_v2(self, channel: list[CoEChannel]) -> None:
+        """Receive digital channels from a V2 sender."""
+        await self._receive(channel)
@@ -16,7 +16,11 @@ from ta_cmi import ApiError
 
 from custom_components.ta_coe.const import (
     CONF_CAN_IDS,
+    CONF_CAN_SCAN_INTERVALS,
+    CONF_REFRESH_INTERVAL,
     CONF_SCAN_INTERVAL,
+    CONF_SEND_DELAY,
+    CONF_SEND_MAX_DELAY,
     DOMAIN,
 )
 from tests import setup_platform
@@ -215,3 +219,96 @@ async def test_option_flow_invalid_can_id(
     assert result["type"] == FlowResultType.FORM
     assert result["step_id"] == "init"
     assert result["errors"] == {"base": "invalid_can_id"}
+
+
+async def test_option_flow_can_scan_intervals(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry
+) -> None:
+    """Test config flow options with update intervals per CAN-ID."""
+    await setup_platform(hass, mock_config_entry)
+
+    result = await hass.config_entries.options.async_init(mock_config_entry.entry_id)
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={
+            CONF_SCAN_INTERVAL: 1,
+            CONF_CAN_IDS: "1,20",
+            CONF_CAN_SCAN_INTERVALS: "1=0.5, 20=10",
+        },
+    )
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["data"] == {
+        **DUMMY_CONFIG_ENTRY,
+        CONF_SCAN_INTERVAL: 1.0,
+        CONF_CAN_IDS: [1, 20],
+        CONF_CAN_SCAN_INTERVALS: {"1": 0.5, "20": 10.0},
+    }
+
+
+async def test_option_flow_send_delay(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry
+) -> None:
+    """Test config flow options with a send delay."""
+    await setup_platform(hass, mock_config_entry)
+
+    result = await hass.config_entries.options.async_init(mock_config_entry.entry_id)
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={
+            CONF_SCAN_INTERVAL: 1,
+            CONF_CAN_IDS: "1,20",
+            CONF_SEND_DELAY: 0.5,
+            CONF_SEND_MAX_DELAY: 2,
+            CONF_REFRESH_INTERVAL: 5,
+        },
+    )
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["data"] == {
+        **DUMMY_CONFIG_ENTRY,
+        CONF_SCAN_INTERVAL: 1.0,
+        CONF_CAN_IDS: [1, 20],
+        CONF_SEND_DELAY: 0.5,
+        CONF_SEND_MAX_DELAY: 2.0,
+        CONF_REFRESH_INTERVAL: 5.0,
+    }
+
+
+@pytest.mark.parametrize(
+    ("can_intervals", "error"),
+    [
+        ("1=0", "invalid_scan_interval"),
+        ("1=abc", "invalid_scan_interval"),
+        ("1=nan", "invalid_scan_interval"),
+        ("1=inf", "invalid_scan_interval"),
+        ("1", "invalid_scan_interval"),
+        ("99=1", "invalid_can_id"),
+        ("19=1", "invalid_can_id"),
+    ],
+)
+async def test_option_flow_invalid_can_scan_intervals(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    can_intervals: str,
+    error: str,
+) -> None:
+    """Test config flow options with invalid update intervals per CAN-ID."""
+    await setup_platform(hass, mock_config_entry)
+
+    result = await hass.config_entries.options.async_init(mock_config_entry.entry_id)
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={
+            CONF_SCAN_INTERVAL: 1,
+            CONF_CAN_IDS: "1,20",
+            CONF_CAN_SCAN_INTERVALS: can_intervals,
+        },
+    )
+
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == "init"
+    assert result["errors"] == {"base": error}
@@ -0,0 +1,497 @@
+"""Test the Technische Alternative CoE data update coordinator."""
+
+import asyncio
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from ta_cmi import ApiError, ChannelMode, CoE, CoEChannel
+
+from custom_components.ta_coe.const import (
+    MAX_PARALLEL_CAN_REQUESTS,
+    MAX_RETRY_BACKOFF,
+    TYPE_BINARY,
+    TYPE_SENSOR,
+)
+from custom_components.ta_coe.coordinator import (
+    ChannelData,
+    CoEDataUpdateCoordinator,
+)
+from custom_components.ta_coe.scheduler import RefreshScheduler
+from custom_components.ta_coe.snapshot_store import SnapshotStore
+from tests.const import COE_GET_CHANNELS_PACKAGE, COE_UPDATE_PACKAGE
+from tests.fake_coe import FakeCoE
+
+CHANNELS: dict[ChannelMode, dict[int, CoEChannel]] = {
+    ChannelMode.ANALOG: {1: CoEChannel(ChannelMode.ANALOG, 1, 34.4, "1")},
+    ChannelMode.DIGITAL: {1: CoEChannel(ChannelMode.DIGITAL, 1, 1, "43")},
+}
+
+
+def create_coordinator(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry, can_ids: list[int]
+) -> CoEDataUpdateCoordinator:
+    """Create a coordinator for the given CAN-IDs."""
+    return CoEDataUpdateCoordinator(
+        hass, mock_config_entry, CoE(""), can_ids, timedelta(minutes=1)
+    )
+
+
+@pytest.mark.asyncio
+async def test_coordinator_update_merge_all_can_ids(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry
+) -> None:
+    """Test that the data of all CAN-IDs is merged into one result."""
+    coordinator = create_coordinator(hass, mock_config_entry, [1, 20])
+
+    with (
+        patch(COE_UPDATE_PACKAGE) as update_mock,
+        patch(
+            COE_GET_CHANNELS_PACKAGE,
+            side_effect=lambda can_id, mode: CHANNELS[mode],
+        ),
+    ):
+        data = await coordinator._async_update_data()
+
+    assert update_mock.call_count == 2
+    assert list(data) == [1, 20]
+
+    for can_id in (1, 20):
+        assert data[can_id][TYPE_SENSOR] == {1: ChannelData(34.4, "°C")}
+        assert data[can_id][TYPE_BINARY] == {1: ChannelData("on", "")}
+
+
+@pytest.mark.asyncio
+async def test_coordinator_update_changed_channels(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry
+) -> None:
+    """Test that only channels with a new value or unit are marked as changed."""
+    coordinator = create_coordinator(hass, mock_config_entry, [1])
+
+    channels = {
+        ChannelMode.ANALOG: {
+            1: CoEChannel(ChannelMode.ANALOG, 1, 34.4, "1"),
+            2: CoEChannel(ChannelMode.ANALOG, 2, 10, "1"),
+        },
+        ChannelMode.DIGITAL: {1: CoEChannel(ChannelMode.DIGITAL, 1, 1, "43")},
+    }
+
+    with (
+        patch(COE_UPDATE_PACKAGE),
+        patch(
+            COE_GET_CHANNELS_PACKAGE,
+            side_effect=lambda can_id, mode: channels[mode],
+        ),
+    ):
+        coordinator.data = await coordinator._async_update_data()
+
+        assert coordinator.has_channel_changed(1, TYPE_SENSOR, 1)
+        assert coordinator.has_channel_changed(1, TYPE_SENSOR, 2)
+        assert coordinator.has_channel_changed(1, TYPE_BINARY, 1)
+
+        channels[ChannelMode.ANALOG][2] = CoEChannel(ChannelMode.ANALOG, 2, 11, "1")
+        coordinator._next_update[1] = 0
+        coordinator.data = await coordinator._async_update_data()
+
+        assert not coordinator.has_channel_changed(1, TYPE_SENSOR, 1)
+        assert coordinator.has_channel_changed(1, TYPE_SENSOR, 2)
+        assert not coordinator.has_channel_changed(1, TYPE_BINARY, 1)
+
+
+@pytest.mark.asyncio
+async def test_coordinator_update_snapshot_in_place(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry
+) -> None:
+    """Test that the snapshot is reused and the channels are updated in place."""
+    coordinator = create_coordinator(hass, mock_config_entry, [1])
+
+    channels = {
+        ChannelMode.ANALOG: {1: CoEChannel(ChannelMode.ANALOG, 1, 34.4, "1")},
+        ChannelMode.DIGITAL: {},
+    }
+
+    with (
+        patch(COE_UPDATE_PACKAGE),
+        patch(
+            COE_GET_CHANNELS_PACKAGE,
+            side_effect=lambda can_id, mode: channels[mode],
+        ),
+    ):
+        first_data = await coordinator._async_update_data()
+        first_channel = first_data[1][TYPE_SENSOR][1]
+
+        channels[ChannelMode.ANALOG][1] = CoEChannel(ChannelMode.ANALOG, 1, 20, "1")
+        coordinator._next_update[1] = 0
+        second_data = await coordinator._async_update_data()
+
+    assert second_data is first_data
+    assert second_data[1][TYPE_SENSOR][1] is first_channel
+    assert first_channel == ChannelData(20, "°C")
+
+
+@pytest.mark.asyncio
+async def test_coordinator_update_can_ids_concurrent(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry
+) -> None:
+    """Test that the CAN-IDs are fetched concurrently with a bounded limit."""
+    can_ids = list(range(1, 3 * MAX_PARALLEL_CAN_REQUESTS + 1))
+    coordinator = create_coordinator(hass, mock_config_entry, can_ids)
+
+    running = 0
+    max_running = 0
+
+    async def fake_update(can_id: int) -> None:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    with (
+        patch(COE_UPDATE_PACKAGE, side_effect=fake_update),
+        patch(COE_GET_CHANNELS_PACKAGE, return_value={}),
+    ):
+        data = await coordinator._async_update_data()
+
+    assert list(data) == can_ids
+    assert max_running == MAX_PARALLEL_CAN_REQUESTS
+
+
+@pytest.mark.asyncio
+async def test_coordinator_update_api_error(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry
+) -> None:
+    """Test that an API error is raised as update failed."""
+    coordinator = create_coordinator(hass, mock_config_entry, [1])
+
+    with (
+        patch(COE_UPDATE_PACKAGE, side_effect=ApiError("Could not connect")),
+        pytest.raises(UpdateFailed),
+    ):
+        await coordinator._async_update_data()
+
+    assert coordinator.stats.polls == 1
+    assert coordinator.stats.poll_errors == 1
+    assert coordinator.stats.poll_latency.count == 1
+
+
+@pytest.mark.asyncio
+async def test_coordinator_update_partial_failure(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry
+) -> None:
+    """Test that a failed CAN-ID keeps the last data and the others are published."""
+    coordinator = create_coordinator(hass, mock_config_entry, [1, 20])
+
+    async def fake_update(can_id: int) -> None:
+        if can_id == 20:
+            raise ApiError("Could not connect")
+
+    with (
+        patch(COE_UPDATE_PACKAGE, side_effect=fake_update),
+        patch(
+            COE_GET_CHANNELS_PACKAGE,
+            side_effect=lambda can_id, mode: CHANNELS[mode],
+        ),
+    ):
+        data = await coordinator._async_update_data()
+
+    assert list(data) == [1, 20]
+    assert data[1][TYPE_SENSOR] == {1: ChannelData(34.4, "°C")}
+    assert data[20][TYPE_SENSOR] == {}
+
+    assert not coordinator.is_stale(1)
+    assert coordinator.is_stale(20)
+
+
+@pytest.mark.asyncio
+async def test_coordinator_update_failed_can_id_backoff(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry
+) -> None:
+    """Test that a failed CAN-ID is only fetched again after the backoff delay."""
+    coordinator = create_coordinator(hass, mock_config_entry, [1, 20])
+
+    async def fake_update(can_id: int) -> None:
+        if can_id == 20:
+            raise ApiError("Could not connect")
+
+    with (
+        patch(COE_UPDATE_PACKAGE, side_effect=fake_update) as update_mock,
+        patch(COE_GET_CHANNELS_PACKAGE, return_value={}),
+    ):
+        await coordinator._async_update_data()
+        coordinator._next_update[1] = 0
+        update_mock.reset_mock()
+
+        await coordinator._async_update_data()
+        update_mock.assert_called_once_with(1)
+
+        coordinator._next_update[1] = 0
+        coordinator._next_update[20] = 0
+        update_mock.reset_mock()
+
+        await coordinator._async_update_data()
+        assert update_mock.call_count == 2
+
+    assert coordinator._failures[20] == 2
+
+
+def test_coordinator_retry_delay_limit(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry
+) -> None:
+    """Test that the retry delay grows exponentially up to the maximum."""
+    coordinator = create_coordinator(hass, mock_config_entry, [1])
+
+    assert coordinator._get_retry_delay(1, 1) == 60
+    assert coordinator._get_retry_delay(1, 2) == 120
+    assert coordinator._get_retry_delay(1, 3) == 240
+    assert coordinator._get_retry_delay(1, 100) == MAX_RETRY_BACKOFF.total_seconds()
+
+
+def test_coordinator_update_interval_fastest_can_id(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry
+) -> None:
+    """Test that the coordinator runs with the fastest CAN-ID update interval."""
+    coordinator = CoEDataUpdateCoordinator(
+        hass,
+        mock_config_entry,
+        CoE(""),
+        [1, 20],
+        timedelta(minutes=1),
+        {20: timedelta(seconds=10)},
+    )
+
+    assert coordinator.update_interval == timedelta(seconds=10)
+
+
+@pytest.mark.asyncio
+async def test_coordinator_update_can_id_own_interval(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry
+) -> None:
+    """Test that every CAN-ID is only fetched when its own interval is due."""
+    coordinator = CoEDataUpdateCoordinator(
+        hass,
+        mock_config_entry,
+        CoE(""),
+        [1, 20],
+        timedelta(minutes=1),
+        {20: timedelta(minutes=10)},
+    )
+
+    with (
+        patch(COE_UPDATE_PACKAGE) as update_mock,
+        patch(COE_GET_CHANNELS_PACKAGE, return_value={}),
+    ):
+        await coordinator._async_update_data()
+        assert update_mock.call_count == 2
+
+        coordinator._next_update[1] = 0
+        update_mock.reset_mock()
+
+        await coordinator._async_update_data()
+        update_mock.assert_called_once_with(1)
+
+    assert coordinator._next_update[20] - coordinator._next_update[1] > 8 * 60
+
+
+@pytest.mark.asyncio
+async def test_coordinator_update_poll_at_phase(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry
+) -> None:
+    """Test that the next poll is moved to the phase of the entry."""
+    scheduler = RefreshScheduler()
+    scheduler.register(mock_config_entry.entry_id)
+
+    coordinator = CoEDataUpdateCoordinator(
+        hass,
+        mock_config_entry,
+        CoE(""),
+        [1],
+        timedelta(minutes=1),
+        scheduler=scheduler,
+    )
+
+    with (
+        patch(COE_UPDATE_PACKAGE),
+        patch(COE_GET_CHANNELS_PACKAGE, return_value={}),
+    ):
+        await coordinator._async_update_data()
+
+    next_poll = hass.loop.time() + coordinator.update_interval.total_seconds()
+    phase = scheduler.get_phase(mock_config_entry.entry_id, "poll", 60)
+
+    assert 59 <= coordinator.update_interval.total_seconds() < 120
+    assert (next_poll - phase) % 60 == pytest.approx(0, abs=0.1) or (
+        next_poll - phase
+    ) % 60 == pytest.approx(60, abs=0.1)
+
+
+@pytest.mark.asyncio
+async def test_coordinator_update_slow_poll_keeps_polling(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry
+) -> None:
+    """Test that a poll longer than the delay to the next phase keeps the polling."""
+    scheduler = RefreshScheduler()
+    scheduler.register(mock_config_entry.entry_id)
+
+    coordinator = CoEDataUpdateCoordinator(
+        hass,
+        mock_config_entry,
+        FakeCoE(node_count=1, latency=1.0),
+        [1],
+        timedelta(seconds=0.4),
+        scheduler=scheduler,
+    )
+    coordinator._phase_aligned = True
+    remove_listener = coordinator.async_add_listener(lambda: None)
+
+    await coordinator.async_refresh()
+
+    assert coordinator.update_interval.total_seconds() >= 0.2
+    assert coordinator._unsub_refresh is not None
+
+    remove_listener()
+
+
+@pytest.mark.asyncio
+async def test_coordinator_update_64_can_ids_fake_coe(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry
+) -> None:
+    """Test that 64 CAN-IDs are fetched with the request limit of the coordinator."""
+    can_ids = list(range(1, 65))
+    coe = FakeCoE(node_count=64, latency=0.01)
+    coordinator = CoEDataUpdateCoordinator(
+        hass, mock_config_entry, coe, can_ids, timedelta(minutes=1)
+    )
+
+    start = hass.loop.time()
+    data = await coordinator._async_update_data()
+    duration = hass.loop.time() - start
+
+    assert coe.stats.requests == 64
+    assert duration >= 64 / MAX_PARALLEL_CAN_REQUESTS * 0.01
+    assert data[64][TYPE_SENSOR][8] == ChannelData(64.8, "°C")
+    assert data[64][TYPE_BINARY][1] == ChannelData("on", "")
+
+
+@pytest.mark.asyncio
+async def test_coordinator_update_fake_coe_loss(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry
+) -> None:
+    """Test that lost requests only mark the affected CAN-IDs as stale."""
+    can_ids = list(range(1, 65))
+    coe = FakeCoE(node_count=64, loss=0.25, seed=1)
+    coordinator = create_coordinator(hass, mock_config_entry, can_ids)
+    coordinator.coe = coe
+
+    data = await coordinator._async_update_data()
+
+    stale = [x for x in can_ids if coordinator.is_stale(x)]
+
+    assert len(stale) == coe.stats.lost > 0
+    assert all(data[x][TYPE_SENSOR] == {} for x in stale)
+    assert all(len(data[x][TYPE_SENSOR]) == 8 for x in can_ids if x not in stale)
+
+
+@pytest.mark.asyncio
+async def test_coordinator_restore_snapshot(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry
+) -> None:
+    """Test that the stored snapshot is restored and saved again after changes."""
+    store = SnapshotStore(hass, mock_config_entry.entry_id, 0)
+    store.async_delay_save({
+        1: {TYPE_SENSOR: {8: ChannelData(1.0, "°C")}, TYPE_BINARY: {}},
+        2: {TYPE_SENSOR: {1: ChannelData(2.0, "°C")}, TYPE_BINARY: {}},
+    })
+    await hass.async_block_till_done()
+
+    coe = FakeCoE(node_count=1)
+    coordinator = CoEDataUpdateCoordinator(
+        hass,
+        mock_config_entry,
+        coe,
+        [1],
+        timedelta(minutes=1),
+        snapshot_store=store,
+    )
+
+    assert await coordinator.async_restore_snapshot()
+    assert coordinator.data == {
+        1: {TYPE_SENSOR: {8: ChannelData(1.0, "°C")}, TYPE_BINARY: {}}
+    }
+
+    await coordinator._async_update_data()
+    await hass.async_block_till_done()
+
+    assert coordinator.has_channel_changed(1, TYPE_SENSOR, 8)
+    assert (await store.async_load())[1][TYPE_SENSOR][8] == ChannelData(1.8, "°C")
+
+
+@pytest.mark.asyncio
+async def test_coordinator_restore_snapshot_empty(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry
+) -> None:
+    """Test that nothing is restored without a stored snapshot."""
+    coordinator = CoEDataUpdateCoordinator(
+        hass,
+        mock_config_entry,
+        FakeCoE(node_count=1),
+        [1],
+        timedelta(minutes=1),
+        snapshot_store=SnapshotStore(hass, mock_config_entry.entry_id),
+    )
+
+    assert not await coordinator.async_restore_snapshot()
+    assert coordinator.data is None
+
+
+@pytest.mark.asyncio
+async def test_coordinator_update_timeout(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry
+) -> None:
+    """Test that a timeout of one CAN-ID only marks this CAN-ID as stale."""
+    coordinator = create_coordinator(hass, mock_config_entry, [1, 2])
+
+    async def fake_update(can_id: int) -> None:
+        if can_id == 2:
+            raise TimeoutError
+
+    with (
+        patch(COE_UPDATE_PACKAGE, side_effect=fake_update),
+        patch(
+            COE_GET_CHANNELS_PACKAGE,
+            side_effect=lambda can_id, mode: CHANNELS[mode],
+        ),
+    ):
+        await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert coordinator.is_stale(2)
+    assert coordinator.get_missing_can_ids() == [2]
+    assert coordinator.get_error_history()[2][0]["error"] == "TimeoutError"
+
+
+@pytest.mark.asyncio
+async def test_coordinator_restore_snapshot_missing_can_id(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry
+) -> None:
+    """Test that nothing is restored if a CAN-ID has no stored channels."""
+    store = SnapshotStore(hass, mock_config_entry.entry_id, 0)
+    store.async_delay_save({
+        1: {TYPE_SENSOR: {8: ChannelData(1.0, "°C")}, TYPE_BINARY: {}},
+    })
+    await hass.async_block_till_done()
+
+    coordinator = CoEDataUpdateCoordinator(
+        hass,
+        mock_config_entry,
+        FakeCoE(node_count=2),
+        [1, 2],
+        timedelta(minutes=1),
+        snapshot_store=store,
+    )
+
+    assert not await coordinator.async_restore_snapshot()
+    assert coordinator.data is None
@@ -0,0 +1,38 @@
+"""Test the Technische Alternative CoE diagnostics."""
+
+import pytest
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.components.diagnostics import (
+    get_diagnostics_for_config_entry,
+)
+from pytest_homeassistant_custom_component.typing import ClientSessionGenerator
+
+from tests import setup_platform
+
+
+@pytest.mark.asyncio
+async def test_diagnostics(
+    hass: HomeAssistant,
+    hass_client: ClientSessionGenerator,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test that the diagnostics contain the snapshot, slot tables and stats."""
+    await setup_platform(hass, mock_config_entry)
+
+    result = await get_diagnostics_for_config_entry(
+        hass, hass_client, mock_config_entry
+    )
+
+    assert result["config_entry"]["host"] == "**REDACTED**"
+    assert result["snapshot"]["1"]["sensor"]["1"] == {"value": 34.4, "unit": "°C"}
+    assert result["stale_can_ids"] == []
+    assert result["error_history"] == {}
+    assert result["sender"] == {
+        "type": "StateSenderV1",
+        "analog_states": {"0": {"value": 0, "unit": "0"}},
+        "digital_states": {"0": False},
+        "index_from_id": {"sensor.coe_analog": "0", "binary_sensor.coe_digital": "0"},
+    }
+    assert result["stats"]["polls"] == 1
+    assert len(result["stats"]["poll_latency"]["recent"]) == 1
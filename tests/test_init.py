@@ -1,12 +1,17 @@
+import asyncio
 from typing import Any
 from unittest.mock import patch
 
 import pytest
 from homeassistant.config_entries import ConfigEntryState
-from homeassistant.const import CONF_HOST
-from homeassistant.core import HomeAssistant
+from homeassistant.const import (
+    CONF_HOST,
+    EVENT_HOMEASSISTANT_CLOSE,
+    EVENT_HOMEASSISTANT_STARTED,
+)
+from homeassistant.core import CoreState, HomeAssistant
 from pytest_homeassistant_custom_component.common import MockConfigEntry
-from ta_cmi import CoEServerConfig
+from ta_cmi import ApiError, CoEServerConfig
 
 from custom_components.ta_coe import (
     CONF_ANALOG_ENTITIES,
@@ -16,10 +21,18 @@ from custom_components.ta_coe import (
     DOMAIN,
     FREE_SLOT_MARKER_ANALOG,
     FREE_SLOT_MARKER_DIGITAL,
+    StateSenderV2,
+)
+from custom_components.ta_coe.const import (
+    HTTP_MAX_CONNECTIONS,
+    TYPE_BINARY,
+    TYPE_SENSOR,
 )
 from tests.const import (
     COEAPI_PACKAGE,
     COE_CHECK_SERVER_VERSION_PACKAGE,
+    COE_SEND_ANALOG_VALUES_V2_PACKAGE,
+    COE_SEND_DIGITAL_VALUES_V2_PACKAGE,
     COE_VERSION_CHECK_PACKAGE,
     DUMMY_DEVICE_API_DATA,
     OBSERVER_GET_ALL_STATES,
@@ -128,3 +141,446 @@ async def test_config_migration_downgrade(
 
     assert dict(conf_entry.data) == ENTRY_DATA
     assert conf_entry.state is ConfigEntryState.MIGRATION_ERROR
+
+
+@pytest.mark.asyncio
+async def test_update_exposed_entities_without_reload(hass: HomeAssistant) -> None:
+    """Test that changed exposed entities are applied without reloading the entry."""
+
+    with (
+        patch(COEAPI_PACKAGE, return_value=DUMMY_DEVICE_API_DATA),
+        patch(OBSERVER_GET_ALL_STATES),
+        patch(REFRESH_TASK_START_PACKAGE),
+        patch(COE_VERSION_CHECK_PACKAGE, return_value=None),
+        patch(COE_CHECK_SERVER_VERSION_PACKAGE, return_value=server_config),
+        patch(COE_SEND_ANALOG_VALUES_V2_PACKAGE),
+        patch(COE_SEND_DIGITAL_VALUES_V2_PACKAGE),
+    ):
+        conf_entry: MockConfigEntry = MockConfigEntry(
+            domain=DOMAIN, title="CoE", data=ENTRY_DATA, minor_version=2, version=1
+        )
+        conf_entry.add_to_hass(hass)
+
+        await hass.config_entries.async_setup(conf_entry.entry_id)
+        await hass.async_block_till_done()
+
+        entry_data = hass.data[DOMAIN][conf_entry.entry_id]
+
+        hass.config_entries.async_update_entry(
+            conf_entry,
+            data={
+                **conf_entry.data,
+                CONF_ENTITIES_TO_SEND: {
+                    CONF_ANALOG_ENTITIES: [{"id": 3, "entity_id": "sensor.coe_analog_3"}],
+                    CONF_DIGITAL_ENTITIES: [],
+                },
+            },
+        )
+        await hass.async_block_till_done()
+
+        assert hass.data[DOMAIN][conf_entry.entry_id] is entry_data
+        assert entry_data["observer"]._entity_list == ["sensor.coe_analog_3"]
+        assert entry_data["sender"]._index_from_id == {"sensor.coe_analog_3": "2"}
+
+        hass.config_entries.async_update_entry(
+            conf_entry, data={**conf_entry.data, CONF_CAN_IDS: [1]}
+        )
+        await hass.async_block_till_done()
+
+        assert hass.data[DOMAIN][conf_entry.entry_id] is not entry_data
+        assert conf_entry.state is ConfigEntryState.LOADED
+
+
+@pytest.mark.asyncio
+async def test_update_exposed_entities_send_error(hass: HomeAssistant) -> None:
+    """Test that the refresh task starts even if the changed states can not be sent."""
+    hass.states.async_set("sensor.test_power", "12", {"unit_of_measurement": "W"})
+
+    with (
+        patch(COEAPI_PACKAGE, return_value=DUMMY_DEVICE_API_DATA),
+        patch(OBSERVER_GET_ALL_STATES),
+        patch(REFRESH_TASK_START_PACKAGE) as task_start_mock,
+        patch(COE_VERSION_CHECK_PACKAGE, return_value=None),
+        patch(COE_CHECK_SERVER_VERSION_PACKAGE, return_value=server_config),
+        patch(
+            COE_SEND_ANALOG_VALUES_V2_PACKAGE, side_effect=ApiError("Server down")
+        ) as send_mock,
+    ):
+        conf_entry: MockConfigEntry = MockConfigEntry(
+            domain=DOMAIN,
+            title="CoE",
+            data={
+                **ENTRY_DATA,
+                CONF_ENTITIES_TO_SEND: {
+                    CONF_ANALOG_ENTITIES: [],
+                    CONF_DIGITAL_ENTITIES: [],
+                },
+            },
+            minor_version=2,
+            version=1,
+        )
+        conf_entry.add_to_hass(hass)
+
+        await hass.config_entries.async_setup(conf_entry.entry_id)
+        await hass.async_block_till_done()
+
+        task_start_mock.assert_not_called()
+
+        hass.config_entries.async_update_entry(
+            conf_entry,
+            data={
+                **conf_entry.data,
+                CONF_ENTITIES_TO_SEND: {
+                    CONF_ANALOG_ENTITIES: [{"id": 1, "entity_id": "sensor.test_power"}],
+                    CONF_DIGITAL_ENTITIES: [],
+                },
+            },
+        )
+        await hass.async_block_till_done()
+
+        send_mock.assert_called_once()
+        task_start_mock.assert_called_once()
+        assert conf_entry.state is ConfigEntryState.LOADED
+
+
+@pytest.mark.asyncio
+async def test_send_all_states_after_start(hass: HomeAssistant) -> None:
+    """Test that the first full send is deferred until Home Assistant has started."""
+    hass.set_state(CoreState.not_running)
+
+    with (
+        patch(COEAPI_PACKAGE, return_value=DUMMY_DEVICE_API_DATA),
+        patch(OBSERVER_GET_ALL_STATES) as get_all_states_mock,
+        patch(REFRESH_TASK_START_PACKAGE) as task_start_mock,
+        patch(COE_VERSION_CHECK_PACKAGE, return_value=None),
+        patch(COE_CHECK_SERVER_VERSION_PACKAGE, return_value=server_config),
+    ):
+        conf_entry: MockConfigEntry = MockConfigEntry(
+            domain=DOMAIN, title="CoE", data=ENTRY_DATA, minor_version=2, version=1
+        )
+        conf_entry.add_to_hass(hass)
+
+        await hass.config_entries.async_setup(conf_entry.entry_id)
+        await hass.async_block_till_done()
+
+        assert conf_entry.state is ConfigEntryState.LOADED
+        assert hass.data[DOMAIN][conf_entry.entry_id]["stats"].setup_time is not None
+        get_all_states_mock.assert_not_called()
+        task_start_mock.assert_not_called()
+
+        hass.bus.async_fire(EVENT_HOMEASSISTANT_STARTED)
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+        get_all_states_mock.assert_called_once()
+        task_start_mock.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_server_config_cached(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test that the detected server config is stored for the next start."""
+
+    with (
+        patch(COEAPI_PACKAGE, return_value=DUMMY_DEVICE_API_DATA),
+        patch(OBSERVER_GET_ALL_STATES),
+        patch(REFRESH_TASK_START_PACKAGE),
+        patch(COE_VERSION_CHECK_PACKAGE, return_value=None),
+        patch(COE_CHECK_SERVER_VERSION_PACKAGE, return_value=server_config),
+    ):
+        conf_entry: MockConfigEntry = MockConfigEntry(
+            domain=DOMAIN, title="CoE", data=ENTRY_DATA, minor_version=2, version=1
+        )
+        conf_entry.add_to_hass(hass)
+
+        await hass.config_entries.async_setup(conf_entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert hass_storage[f"{DOMAIN}.{conf_entry.entry_id}.server_config"]["data"] == {
+        "coe_version": 2
+    }
+
+
+@pytest.mark.asyncio
+async def test_server_config_cache_swap_sender(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test that the cached server config is used and revalidated in the background."""
+    conf_entry: MockConfigEntry = MockConfigEntry(
+        domain=DOMAIN, title="CoE", data=ENTRY_DATA, minor_version=2, version=1
+    )
+    conf_entry.add_to_hass(hass)
+
+    storage_key = f"{DOMAIN}.{conf_entry.entry_id}.server_config"
+    hass_storage[storage_key] = {
+        "version": 1,
+        "key": storage_key,
+        "data": {"coe_version": 1},
+    }
+
+    with (
+        patch(COEAPI_PACKAGE, return_value=DUMMY_DEVICE_API_DATA),
+        patch(OBSERVER_GET_ALL_STATES) as get_all_states_mock,
+        patch(REFRESH_TASK_START_PACKAGE),
+        patch(COE_VERSION_CHECK_PACKAGE, return_value=None),
+        patch(
+            COE_CHECK_SERVER_VERSION_PACKAGE, return_value=server_config
+        ) as server_config_mock,
+    ):
+        await hass.config_entries.async_setup(conf_entry.entry_id)
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+        entry_data = hass.data[DOMAIN][conf_entry.entry_id]
+
+        server_config_mock.assert_called_once()
+        assert isinstance(entry_data["sender"], StateSenderV2)
+        assert entry_data["observer"]._sender is entry_data["sender"]
+        assert entry_data["task"]._sender is entry_data["sender"]
+        assert get_all_states_mock.call_count == 2
+
+    assert hass_storage[storage_key]["data"] == {"coe_version": 2}
+
+
+@pytest.mark.asyncio
+async def test_server_config_cache_swap_sender_send_error(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test that a failed send after swapping the sender is only logged."""
+    conf_entry: MockConfigEntry = MockConfigEntry(
+        domain=DOMAIN, title="CoE", data=ENTRY_DATA, minor_version=2, version=1
+    )
+    conf_entry.add_to_hass(hass)
+
+    storage_key = f"{DOMAIN}.{conf_entry.entry_id}.server_config"
+    hass_storage[storage_key] = {
+        "version": 1,
+        "key": storage_key,
+        "data": {"coe_version": 1},
+    }
+
+    with (
+        patch(COEAPI_PACKAGE, return_value=DUMMY_DEVICE_API_DATA),
+        patch(OBSERVER_GET_ALL_STATES, side_effect=ApiError("Server down")),
+        patch(REFRESH_TASK_START_PACKAGE),
+        patch(COE_VERSION_CHECK_PACKAGE, return_value=None),
+        patch(COE_CHECK_SERVER_VERSION_PACKAGE, return_value=server_config),
+    ):
+        await hass.config_entries.async_setup(conf_entry.entry_id)
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+        assert isinstance(
+            hass.data[DOMAIN][conf_entry.entry_id]["sender"], StateSenderV2
+        )
+        # The first full send and the send after the swap both failed.
+        assert caplog.text.count("Failed to send all states to the server") == 2
+
+
+@pytest.mark.asyncio
+async def test_setup_restore_snapshot_slow_server(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test that the entities start with the stored snapshot while the poll runs."""
+    conf_entry: MockConfigEntry = MockConfigEntry(
+        domain=DOMAIN, title="CoE", data=ENTRY_DATA, minor_version=2, version=1
+    )
+    conf_entry.add_to_hass(hass)
+
+    storage_key = f"{DOMAIN}.{conf_entry.entry_id}.snapshot"
+    hass_storage[storage_key] = {
+        "version": 1,
+        "key": storage_key,
+        "data": {
+            "1": {TYPE_SENSOR: {"1": [12.5, "°C"]}, TYPE_BINARY: {}},
+            "20": {TYPE_SENSOR: {"1": [20.5, "°C"]}, TYPE_BINARY: {}},
+        },
+    }
+
+    server_ready = asyncio.Event()
+
+    async def slow_get_coe_data(*args: Any) -> dict[str, Any]:
+        await server_ready.wait()
+        return DUMMY_DEVICE_API_DATA
+
+    with (
+        patch(COEAPI_PACKAGE, side_effect=slow_get_coe_data),
+        patch(OBSERVER_GET_ALL_STATES),
+        patch(REFRESH_TASK_START_PACKAGE),
+        patch(COE_VERSION_CHECK_PACKAGE, return_value=None),
+        patch(COE_CHECK_SERVER_VERSION_PACKAGE, return_value=server_config),
+    ):
+        await hass.config_entries.async_setup(conf_entry.entry_id)
+        await hass.async_block_till_done()
+
+        assert conf_entry.state is ConfigEntryState.LOADED
+        assert hass.states.get("sensor.coe_analog_can1_1").state == "12.5"
+
+        server_ready.set()
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+        assert hass.states.get("sensor.coe_analog_can1_1").state == "34.4"
+
+
+@pytest.mark.asyncio
+async def test_session_closed_on_unload(hass: HomeAssistant) -> None:
+    """Test that the entry uses its own HTTP session and closes it on unload."""
+
+    with (
+        patch(COEAPI_PACKAGE, return_value=DUMMY_DEVICE_API_DATA),
+        patch(OBSERVER_GET_ALL_STATES),
+        patch(REFRESH_TASK_START_PACKAGE),
+        patch(COE_VERSION_CHECK_PACKAGE, return_value=None),
+        patch(COE_CHECK_SERVER_VERSION_PACKAGE, return_value=server_config),
+    ):
+        conf_entry: MockConfigEntry = MockConfigEntry(
+            domain=DOMAIN, title="CoE", data=ENTRY_DATA, minor_version=2, version=1
+        )
+        conf_entry.add_to_hass(hass)
+
+        await hass.config_entries.async_setup(conf_entry.entry_id)
+        await hass.async_block_till_done()
+
+        session = hass.data[DOMAIN][conf_entry.entry_id]["session"]
+
+        assert session.connector.limit == HTTP_MAX_CONNECTIONS
+        assert not session.closed
+
+        assert await hass.config_entries.async_unload(conf_entry.entry_id)
+        await hass.async_block_till_done()
+
+        assert session.closed
+
+
+@pytest.mark.asyncio
+async def test_session_closed_on_shutdown(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test that the HTTP session is closed when Home Assistant is shut down."""
+
+    with (
+        patch(COEAPI_PACKAGE, return_value=DUMMY_DEVICE_API_DATA),
+        patch(OBSERVER_GET_ALL_STATES),
+        patch(REFRESH_TASK_START_PACKAGE),
+        patch(COE_VERSION_CHECK_PACKAGE, return_value=None),
+        patch(COE_CHECK_SERVER_VERSION_PACKAGE, return_value=server_config),
+    ):
+        conf_entry: MockConfigEntry = MockConfigEntry(
+            domain=DOMAIN, title="CoE", data=ENTRY_DATA, minor_version=2, version=1
+        )
+        conf_entry.add_to_hass(hass)
+
+        await hass.config_entries.async_setup(conf_entry.entry_id)
+        await hass.async_block_till_done()
+
+        session = hass.data[DOMAIN][conf_entry.entry_id]["session"]
+
+        hass.bus.async_fire(EVENT_HOMEASSISTANT_CLOSE)
+        await hass.async_block_till_done()
+
+        assert session.closed
+
+        assert await hass.config_entries.async_unload(conf_entry.entry_id)
+        await hass.async_block_till_done()
+
+        assert "Unable to remove unknown job listener" not in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_setup_retry_server_config_error(hass: HomeAssistant) -> None:
+    """Test that the setup is retried if the server config can not be fetched."""
+
+    with (
+        patch(COEAPI_PACKAGE, side_effect=ApiError("Server down")),
+        patch(COE_VERSION_CHECK_PACKAGE, return_value=None),
+        patch(COE_CHECK_SERVER_VERSION_PACKAGE, side_effect=ApiError("Server down")),
+    ):
+        conf_entry: MockConfigEntry = MockConfigEntry(
+            domain=DOMAIN, title="CoE", data=ENTRY_DATA, minor_version=2, version=1
+        )
+        conf_entry.add_to_hass(hass)
+
+        await hass.config_entries.async_setup(conf_entry.entry_id)
+        await hass.async_block_till_done()
+
+        assert conf_entry.state is ConfigEntryState.SETUP_RETRY
+
+
+@pytest.mark.asyncio
+async def test_setup_retry_server_config_error_cancel_first_refresh(
+    hass: HomeAssistant,
+) -> None:
+    """Test that a failed server config fetch cancels the running first poll."""
+    cancelled = asyncio.Event()
+
+    async def get_coe_data(can_id: int) -> dict[str, Any]:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return DUMMY_DEVICE_API_DATA
+
+    with (
+        patch(COEAPI_PACKAGE, side_effect=get_coe_data),
+        patch(COE_VERSION_CHECK_PACKAGE, return_value=None),
+        patch(COE_CHECK_SERVER_VERSION_PACKAGE, side_effect=TimeoutError()),
+    ):
+        conf_entry: MockConfigEntry = MockConfigEntry(
+            domain=DOMAIN, title="CoE", data=ENTRY_DATA, minor_version=2, version=1
+        )
+        conf_entry.add_to_hass(hass)
+
+        await hass.config_entries.async_setup(conf_entry.entry_id)
+        await hass.async_block_till_done()
+
+        assert conf_entry.state is ConfigEntryState.SETUP_RETRY
+        assert cancelled.is_set()
+
+
+@pytest.mark.asyncio
+async def test_refresh_task_started_after_send_error(hass: HomeAssistant) -> None:
+    """Test that the refresh task starts even if the first full send fails."""
+
+    with (
+        patch(COEAPI_PACKAGE, return_value=DUMMY_DEVICE_API_DATA),
+        patch(OBSERVER_GET_ALL_STATES, side_effect=ApiError("Server down")),
+        patch(REFRESH_TASK_START_PACKAGE) as task_start_mock,
+        patch(COE_VERSION_CHECK_PACKAGE, return_value=None),
+        patch(COE_CHECK_SERVER_VERSION_PACKAGE, return_value=server_config),
+    ):
+        conf_entry: MockConfigEntry = MockConfigEntry(
+            domain=DOMAIN, title="CoE", data=ENTRY_DATA, minor_version=2, version=1
+        )
+        conf_entry.add_to_hass(hass)
+
+        await hass.config_entries.async_setup(conf_entry.entry_id)
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+        assert conf_entry.state is ConfigEntryState.LOADED
+        task_start_mock.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_setup_retry_can_id_without_data(hass: HomeAssistant) -> None:
+    """Test that the setup is retried if a CAN-ID has no data after the first poll."""
+
+    def get_coe_data(can_id: int) -> dict[str, Any]:
+        if can_id == 20:
+            raise ApiError("Could not connect")
+        return DUMMY_DEVICE_API_DATA
+
+    with (
+        patch(COEAPI_PACKAGE, side_effect=get_coe_data),
+        patch(COE_VERSION_CHECK_PACKAGE, return_value=None),
+        patch(COE_CHECK_SERVER_VERSION_PACKAGE, return_value=server_config),
+    ):
+        conf_entry: MockConfigEntry = MockConfigEntry(
+            domain=DOMAIN, title="CoE", data=ENTRY_DATA, minor_version=2, version=1
+        )
+        conf_entry.add_to_hass(hass)
+
+        await hass.config_entries.async_setup(conf_entry.entry_id)
+        await hass.async_block_till_done()
+
+        assert conf_entry.state is ConfigEntryState.SETUP_RETRY
@@ -0,0 +1,72 @@
+"""Test the Technische Alternative CoE refresh task."""
+
+import asyncio
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from ta_cmi import ApiError, CoE
+
+from custom_components.ta_coe.const import (
+    CONF_ANALOG_ENTITIES,
+    CONF_DIGITAL_ENTITIES,
+    ConfEntityToSend,
+)
+from custom_components.ta_coe.refresh_task import RefreshTask
+from tests.common import StubStateSender
+from tests.const import STATE_SENDER_STUB_REFRESH
+
+coe = CoE("")
+state_sender = StubStateSender(
+    coe, {CONF_ANALOG_ENTITIES: [], CONF_DIGITAL_ENTITIES: []}
+)
+
+
+@pytest.mark.asyncio
+async def test_refresh_task_outdated_slots():
+    """Test that every step refreshes the slots outdated before the next step."""
+    task = RefreshTask(state_sender, timedelta(minutes=5))
+
+    with patch(STATE_SENDER_STUB_REFRESH) as refresh_mock:
+        await task._refresh()
+
+    refresh_mock.assert_called_once_with(270)
+
+
+def test_refresh_task_spread():
+    """Test that the refresh task spreads the refreshes of the sender."""
+    sender = StubStateSender(
+        coe, {CONF_ANALOG_ENTITIES: [], CONF_DIGITAL_ENTITIES: []}
+    )
+    task = RefreshTask(sender, timedelta(minutes=5))
+
+    assert sender._refresh_spread == 240
+
+    new_sender = StubStateSender(
+        coe, {CONF_ANALOG_ENTITIES: [], CONF_DIGITAL_ENTITIES: []}
+    )
+    task.set_sender(new_sender)
+
+    assert new_sender._refresh_spread == 240
+
+
+@pytest.mark.asyncio
+async def test_refresh_task_continue_after_error():
+    """Test that a failed refresh does not stop the task."""
+    sender = StubStateSender(
+        coe,
+        {
+            CONF_ANALOG_ENTITIES: [ConfEntityToSend(1, "sensor.test")],
+            CONF_DIGITAL_ENTITIES: [],
+        },
+    )
+    task = RefreshTask(sender, timedelta(seconds=0.1))
+
+    with patch(
+        STATE_SENDER_STUB_REFRESH, side_effect=[ApiError("Failed"), 1, 1, 1, 1]
+    ) as refresh_mock:
+        await task.start()
+        await asyncio.sleep(0.035)
+        await task.stop()
+
+    assert refresh_mock.call_count >= 2
@@ -0,0 +1,60 @@
+"""Test the Technische Alternative CoE refresh scheduler."""
+
+import pytest
+
+from custom_components.ta_coe.scheduler import RefreshScheduler
+
+
+def test_scheduler_phase_staggered():
+    """Test that every entry gets its own share of the period."""
+    scheduler = RefreshScheduler()
+    scheduler.register("b")
+    scheduler.register("a")
+    scheduler.register("c")
+
+    phases = [scheduler.get_phase(x, "poll", 60) for x in ("a", "b", "c")]
+
+    for index, phase in enumerate(phases):
+        assert index * 20 <= phase < (index + 1) * 20
+
+
+def test_scheduler_phase_deterministic():
+    """Test that the phase only depends on the registered entries."""
+    first = RefreshScheduler()
+    first.register("a")
+    first.register("b")
+
+    second = RefreshScheduler()
+    second.register("b")
+    second.register("a")
+
+    assert first.get_phase("a", "poll", 60) == second.get_phase("a", "poll", 60)
+    assert first.get_phase("a", "poll", 60) != first.get_phase("a", "refresh", 60)
+
+
+def test_scheduler_unregister():
+    """Test that an unregistered entry releases its share."""
+    scheduler = RefreshScheduler()
+    scheduler.register("a")
+    scheduler.register("b")
+    scheduler.unregister("a")
+
+    assert scheduler.get_phase("b", "poll", 60) < 60
+    assert scheduler.get_phase("b", "poll", 60) == RefreshScheduler().get_phase(
+        "b", "poll", 60
+    )
+
+
+@pytest.mark.parametrize("now", [0, 12.5, 59, 60, 1000])
+def test_scheduler_delay_at_phase(now: float):
+    """Test that the delay ends at the phase of the job."""
+    scheduler = RefreshScheduler()
+    scheduler.register("a")
+
+    phase = scheduler.get_phase("a", "poll", 60)
+    delay = scheduler.get_delay("a", "poll", 60, now, 30)
+
+    assert 30 <= delay < 90
+    assert (now + delay - phase) % 60 == pytest.approx(0, abs=1e-6) or (
+        now + delay - phase
+    ) % 60 == pytest.approx(60, abs=1e-6)
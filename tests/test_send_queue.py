@@ -0,0 +1,186 @@
+"""Test the Technische Alternative CoE send queue."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from ta_cmi import ApiError, CoE
+
+from custom_components.ta_coe.const import (
+    CONF_ANALOG_ENTITIES,
+    CONF_DIGITAL_ENTITIES,
+)
+from custom_components.ta_coe.send_queue import SendQueue
+from custom_components.ta_coe.state_sender import AnalogValue
+from tests.common import StubStateSender
+from tests.const import STATE_SENDER_STUB_UPDATE_BATCH
+
+coe = CoE("")
+state_sender = StubStateSender(
+    coe, {CONF_ANALOG_ENTITIES: [], CONF_DIGITAL_ENTITIES: []}
+)
+
+
+@pytest.mark.asyncio
+async def test_queue_merge_changes(hass: HomeAssistant):
+    """Test that changes within the delay are sent as one batch with the last value."""
+    queue = SendQueue(hass, state_sender, 0.05, 1)
+
+    with patch(STATE_SENDER_STUB_UPDATE_BATCH) as update_mock:
+        queue.add_analog("sensor.test", 1, "°C")
+        queue.add_digital("binary_sensor.test", True)
+        queue.add_analog("sensor.test", 2, "°C")
+
+        assert queue.pending_count == 2
+        update_mock.assert_not_called()
+
+        await asyncio.sleep(0.1)
+
+        update_mock.assert_called_once_with(
+            {"sensor.test": AnalogValue(2, "°C")}, {"binary_sensor.test": True}
+        )
+        assert queue.pending_count == 0
+
+
+@pytest.mark.asyncio
+async def test_queue_max_delay(hass: HomeAssistant):
+    """Test that continuous changes are sent after the maximum delay."""
+    queue = SendQueue(hass, state_sender, 0.05, 0.1)
+
+    with patch(STATE_SENDER_STUB_UPDATE_BATCH) as update_mock:
+        for i in range(6):
+            queue.add_analog("sensor.test", i, "°C")
+            await asyncio.sleep(0.03)
+
+        update_mock.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_queue_min_send_interval(hass: HomeAssistant):
+    """Test that an entity is not sent more often than its minimum send interval."""
+    queue = SendQueue(hass, state_sender, 0, 0, {"sensor.test": 0.2})
+
+    with patch(STATE_SENDER_STUB_UPDATE_BATCH) as update_mock:
+        queue.add_analog("sensor.test", 1, "°C")
+        await asyncio.sleep(0.05)
+
+        queue.add_analog("sensor.test", 2, "°C")
+        queue.add_digital("binary_sensor.test", True)
+        await asyncio.sleep(0.05)
+
+        assert update_mock.call_count == 2
+        update_mock.assert_called_with({}, {"binary_sensor.test": True})
+        assert queue.pending_count == 1
+
+        await asyncio.sleep(0.2)
+
+        assert update_mock.call_count == 3
+        update_mock.assert_called_with({"sensor.test": AnalogValue(2, "°C")}, {})
+
+
+@pytest.mark.asyncio
+async def test_queue_cancel(hass: HomeAssistant):
+    """Test that a canceled queue drops all pending states."""
+    queue = SendQueue(hass, state_sender, 0.05, 1)
+
+    with patch(STATE_SENDER_STUB_UPDATE_BATCH) as update_mock:
+        queue.add_analog("sensor.test", 1, "°C")
+        queue.cancel()
+
+        await asyncio.sleep(0.1)
+
+        update_mock.assert_not_called()
+        assert queue.pending_count == 0
+
+
+@pytest.mark.asyncio
+async def test_queue_is_pending(hass: HomeAssistant):
+    """Test that queued entities are reported as pending until sent."""
+    queue = SendQueue(hass, state_sender, 0.05, 1)
+
+    with patch(STATE_SENDER_STUB_UPDATE_BATCH):
+        queue.add_analog("sensor.test", 1, "°C")
+
+        assert queue.is_pending("sensor.test")
+        assert not queue.is_pending("binary_sensor.test")
+
+        await queue.async_flush()
+
+        assert not queue.is_pending("sensor.test")
+
+
+@pytest.mark.asyncio
+async def test_queue_worker_drops_oldest_per_entity(hass: HomeAssistant):
+    """Test that changes during a send replace the pending state and keep the order."""
+    queue = SendQueue(hass, state_sender, 0, 0)
+    batches = []
+    release = asyncio.Event()
+
+    async def slow_update_batch(analog_states, digital_states):
+        batches.append((analog_states, digital_states))
+        await release.wait()
+
+    with patch(STATE_SENDER_STUB_UPDATE_BATCH, side_effect=slow_update_batch):
+        queue.add_analog("sensor.test", 1, "°C")
+        await asyncio.sleep(0.01)
+
+        for i in range(2, 6):
+            queue.add_analog("sensor.test", i, "°C")
+            queue.add_digital("binary_sensor.test", i % 2 == 0)
+            await asyncio.sleep(0.01)
+
+        assert len(batches) == 1
+        assert queue.pending_count == 2
+        assert queue.dropped_count == 6
+
+        release.set()
+        await asyncio.sleep(0.01)
+
+        assert batches == [
+            ({"sensor.test": AnalogValue(1, "°C")}, {}),
+            ({"sensor.test": AnalogValue(5, "°C")}, {"binary_sensor.test": False}),
+        ]
+        assert queue.pending_count == 0
+
+    queue.cancel()
+
+
+@pytest.mark.asyncio
+async def test_queue_worker_survives_send_error(hass: HomeAssistant):
+    """Test that the worker keeps sending after a failed batch."""
+    queue = SendQueue(hass, state_sender, 0, 0)
+
+    with patch(
+        STATE_SENDER_STUB_UPDATE_BATCH, side_effect=[ApiError("Failed"), None]
+    ) as update_mock:
+        queue.add_analog("sensor.test", 1, "°C")
+        await asyncio.sleep(0.01)
+
+        queue.add_analog("sensor.test", 2, "°C")
+        await asyncio.sleep(0.01)
+
+        assert update_mock.call_count == 2
+        update_mock.assert_called_with({"sensor.test": AnalogValue(2, "°C")}, {})
+
+    queue.cancel()
+
+
+@pytest.mark.asyncio
+async def test_queue_worker_survives_unexpected_error(hass: HomeAssistant):
+    """Test that the worker keeps sending after an unexpected error."""
+    queue = SendQueue(hass, state_sender, 0, 0)
+
+    with patch(
+        STATE_SENDER_STUB_UPDATE_BATCH, side_effect=[ValueError("Failed"), None]
+    ) as update_mock:
+        queue.add_analog("sensor.test", 1, "°C")
+        await asyncio.sleep(0.01)
+
+        queue.add_analog("sensor.test", 2, "°C")
+        await asyncio.sleep(0.01)
+
+        assert update_mock.call_count == 2
+        update_mock.assert_called_with({"sensor.test": AnalogValue(2, "°C")}, {})
+
+    queue.cancel()
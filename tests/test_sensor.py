@@ -1,7 +1,19 @@
 """Test the Technische Alternative CoE sensor."""
 
+from copy import deepcopy
+from unittest.mock import patch
+
 import pytest
-from homeassistant.const import Platform
+from homeassistant.components.sensor import (
+    ATTR_STATE_CLASS,
+    SensorDeviceClass,
+    SensorStateClass,
+)
+from homeassistant.const import (
+    ATTR_DEVICE_CLASS,
+    ATTR_UNIT_OF_MEASUREMENT,
+    Platform,
+)
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import entity_registry as er
 from pytest_homeassistant_custom_component.common import (
@@ -9,8 +21,11 @@ from pytest_homeassistant_custom_component.common import (
     snapshot_platform,
 )
 from syrupy import SnapshotAssertion
+from ta_cmi import ApiError
 
+from custom_components.ta_coe.const import ATTR_STALE, DOMAIN
 from tests import setup_single_platform
+from tests.const import COEAPI_PACKAGE, DUMMY_DEVICE_API_DATA
 
 
 @pytest.mark.asyncio
@@ -24,3 +39,160 @@ async def test_sensors(
 
     await setup_single_platform(hass, mock_config_entry, Platform.SENSOR)
     await snapshot_platform(hass, entity_registry, snapshot, mock_config_entry.entry_id)
+
+
+@pytest.mark.asyncio
+async def test_write_only_changed_channels(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test that only sensors with a changed channel write a new state."""
+
+    await setup_single_platform(hass, mock_config_entry, Platform.SENSOR)
+
+    coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"]
+
+    unchanged_reported = hass.states.get("sensor.coe_analog_can1_1").last_reported
+    changed_updated = hass.states.get("sensor.coe_analog_can1_2").last_updated
+
+    api_data = deepcopy(DUMMY_DEVICE_API_DATA)
+    api_data["analog"][1]["value"] = 51
+    api_data["last_update_unix"] += 1
+
+    with patch(COEAPI_PACKAGE, return_value=api_data):
+        coordinator._next_update.clear()
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    assert (
+        hass.states.get("sensor.coe_analog_can1_1").last_reported
+        == unchanged_reported
+    )
+
+    assert hass.states.get("sensor.coe_analog_can1_2").state == "51.0"
+    assert hass.states.get("sensor.coe_analog_can1_2").last_updated != changed_updated
+
+
+@pytest.mark.asyncio
+async def test_unit_change_updates_classes(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test that a changed unit updates the unit, device class and state class."""
+
+    await setup_single_platform(hass, mock_config_entry, Platform.SENSOR)
+
+    coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"]
+
+    state = hass.states.get("sensor.coe_analog_can1_1")
+    assert state.attributes[ATTR_DEVICE_CLASS] == SensorDeviceClass.TEMPERATURE
+    assert state.attributes[ATTR_STATE_CLASS] == SensorStateClass.MEASUREMENT
+
+    api_data = deepcopy(DUMMY_DEVICE_API_DATA)
+    api_data["analog"][0]["unit"] = 11
+    api_data["last_update_unix"] += 1
+
+    with patch(COEAPI_PACKAGE, return_value=api_data):
+        coordinator._next_update.clear()
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.coe_analog_can1_1")
+    assert state.attributes[ATTR_UNIT_OF_MEASUREMENT] == "kWh"
+    assert state.attributes[ATTR_DEVICE_CLASS] == SensorDeviceClass.ENERGY
+    assert state.attributes[ATTR_STATE_CLASS] == SensorStateClass.TOTAL
+
+
+@pytest.mark.asyncio
+async def test_stale_can_id_keeps_value(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test that the sensors of a failed CAN-ID keep their value marked as stale."""
+
+    await setup_single_platform(hass, mock_config_entry, Platform.SENSOR)
+
+    coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"]
+
+    def get_coe_data(can_id: int) -> dict:
+        if can_id == 1:
+            raise ApiError("Could not connect")
+        return DUMMY_DEVICE_API_DATA
+
+    with patch(COEAPI_PACKAGE, side_effect=get_coe_data):
+        coordinator._next_update.clear()
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.coe_analog_can1_1")
+    assert state.state == "34.4"
+    assert state.attributes[ATTR_STALE] is True
+    assert hass.states.get("sensor.coe_analog_can20_1").attributes[ATTR_STALE] is False
+
+    with patch(COEAPI_PACKAGE, return_value=DUMMY_DEVICE_API_DATA):
+        coordinator._next_update.clear()
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.coe_analog_can1_1").attributes[ATTR_STALE] is False
+
+
+@pytest.mark.asyncio
+async def test_stats_sensors_poll_and_request_errors(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test that a failed request is not counted as a failed poll as well."""
+
+    await setup_single_platform(hass, mock_config_entry, Platform.SENSOR)
+
+    coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"]
+
+    def get_coe_data(can_id: int) -> dict:
+        if can_id == 1:
+            raise ApiError("Could not connect")
+        return DUMMY_DEVICE_API_DATA
+
+    with patch(COEAPI_PACKAGE, side_effect=get_coe_data):
+        coordinator._next_update.clear()
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.coe_poll_errors").state == "0"
+    assert hass.states.get("sensor.coe_request_errors").state == "1"
+
+    with patch(COEAPI_PACKAGE, side_effect=ApiError("Could not connect")):
+        coordinator._next_update.clear()
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.coe_poll_errors").state == "1"
+    assert hass.states.get("sensor.coe_request_errors").state == "3"
+
+
+@pytest.mark.asyncio
+async def test_stats_sensors_per_entry(
+    hass: HomeAssistant,
+    entity_registry: er.EntityRegistry,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test that every config entry gets its own stats sensors."""
+    second_entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="CoE 2",
+        data=mock_config_entry.data,
+        minor_version=2,
+        version=1,
+    )
+    second_entry.add_to_hass(hass)
+
+    # The setup of the integration sets up both entries.
+    await setup_single_platform(hass, mock_config_entry, Platform.SENSOR)
+
+    for entry in (mock_config_entry, second_entry):
+        entity_id = entity_registry.async_get_entity_id(
+            "sensor", DOMAIN, f"ta-coe-stats-{entry.entry_id}-polls"
+        )
+
+        assert entity_id is not None
+        assert hass.states.get(entity_id) is not None
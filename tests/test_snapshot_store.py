@@ -0,0 +1,50 @@
+"""Test the Technische Alternative CoE snapshot store."""
+
+import asyncio
+from typing import Any
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.ta_coe.const import TYPE_BINARY, TYPE_SENSOR
+from custom_components.ta_coe.coordinator import ChannelData
+from custom_components.ta_coe.snapshot_store import SnapshotStore
+
+STORAGE_KEY = "ta_coe.entry_id.snapshot"
+
+
+@pytest.mark.asyncio
+async def test_snapshot_store_save_and_load(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test that the snapshot is stored as value and unit pairs."""
+    store = SnapshotStore(hass, "entry_id", 0)
+    snapshot = {
+        1: {
+            TYPE_SENSOR: {1: ChannelData(34.4, "°C")},
+            TYPE_BINARY: {2: ChannelData("on", "")},
+        }
+    }
+
+    store.async_delay_save(snapshot)
+    await asyncio.sleep(0)
+    await hass.async_block_till_done()
+
+    assert hass_storage[STORAGE_KEY]["data"] == {
+        "1": {TYPE_SENSOR: {"1": [34.4, "°C"]}, TYPE_BINARY: {"2": ["on", ""]}}
+    }
+    assert await SnapshotStore(hass, "entry_id").async_load() == snapshot
+
+
+@pytest.mark.asyncio
+async def test_snapshot_store_load_invalid(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test that an invalid stored snapshot is ignored."""
+    hass_storage[STORAGE_KEY] = {
+        "version": 1,
+        "key": STORAGE_KEY,
+        "data": {"1": {TYPE_SENSOR: {"1": 34.4}}},
+    }
+
+    assert await SnapshotStore(hass, "entry_id").async_load() == {}
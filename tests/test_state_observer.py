@@ -7,7 +7,7 @@ import pytest
 from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT
 from homeassistant.core import HomeAssistant, State
 from pytest_homeassistant_custom_component.common import mock_state_change_event
-from ta_cmi import CoE
+from ta_cmi import ChannelMode, CoE, CoEChannel
 
 from custom_components.ta_coe import StateObserver
 from custom_components.ta_coe.const import (
@@ -15,10 +15,10 @@ from custom_components.ta_coe.const import (
     CONF_ANALOG_ENTITIES,
     CONF_DIGITAL_ENTITIES,
     DIGITAL_DOMAINS,
-    TYPE_BINARY,
-    TYPE_SENSOR,
     ConfEntityToSend,
 )
+from custom_components.ta_coe.state_observer import ObservedEntity
+from custom_components.ta_coe.state_sender_v2 import StateSenderV2
 from tests.common import StubStateSender
 from tests.const import (
     STATE_AVAILABLE_PACKAGE,
@@ -30,6 +30,7 @@ from tests.const import (
     STATE_SENDER_V1_UPDATE_ANALOG_PACKAGE,
     STATE_SENDER_V1_UPDATE_DIGITAL_PACKAGE,
 )
+from tests.fake_coe import FakeCoE
 
 coe = CoE("")
 state_sender = StubStateSender(
@@ -94,8 +95,7 @@ async def test_observer_update_handler_ignore_state(hass: HomeAssistant, state:
         mock_state_change_event(hass, new_state)
         await hass.async_block_till_done()
 
-        assert len(observer._states[TYPE_BINARY]) == 0
-        assert len(observer._states[TYPE_SENSOR]) == 0
+        assert observer._entities["sensor.test"].value is None
 
         analog_mock.assert_not_called()
         digital_mock.assert_not_called()
@@ -121,8 +121,7 @@ async def test_observer_update_handler_ignore_state_all_states(
         observer = StateObserver(hass, coe, state_sender, entity_list)
         await observer.get_all_states()
 
-        assert len(observer._states[TYPE_BINARY]) == 0
-        assert len(observer._states[TYPE_SENSOR]) == 0
+        assert observer._entities["sensor.test"].value is None
 
         update_mock.assert_called_once()
 
@@ -150,9 +149,7 @@ async def test_observer_update_handler_update_digital_state_on(
         mock_state_change_event(hass, new_state)
         await asyncio.sleep(0.1)
 
-        assert len(observer._states[TYPE_BINARY]) == 1
-        assert len(observer._states[TYPE_SENSOR]) == 0
-        assert observer._states[TYPE_BINARY][entity_id]
+        assert observer._entities[entity_id].value is True
 
         update_mock.assert_called_once_with(entity_id, True)
 
@@ -179,9 +176,7 @@ async def test_observer_update_handler_update_digital_state_off(
         mock_state_change_event(hass, new_state)
         await asyncio.sleep(0.1)
 
-        assert len(observer._states[TYPE_BINARY]) == 1
-        assert len(observer._states[TYPE_SENSOR]) == 0
-        assert not observer._states[TYPE_BINARY][entity_id]
+        assert observer._entities[entity_id].value is False
 
         update_mock.assert_called_once_with(entity_id, False)
 
@@ -208,9 +203,7 @@ async def test_observer_update_handler_update_digital_state_all_states(
         observer = StateObserver(hass, coe, state_sender, entity_list)
         await observer.get_all_states()
 
-        assert len(observer._states[TYPE_BINARY]) == 1
-        assert len(observer._states[TYPE_SENSOR]) == 0
-        assert observer._states[TYPE_BINARY][entity_id]
+        assert observer._entities[entity_id].value is True
 
         get_mock.assert_called_with(entity_id)
 
@@ -240,9 +233,8 @@ async def test_observer_update_handler_update_analog_state(
         mock_state_change_event(hass, new_state)
         await asyncio.sleep(0.1)
 
-        assert len(observer._states[TYPE_BINARY]) == 0
-        assert len(observer._states[TYPE_SENSOR]) == 1
-        assert observer._states[TYPE_SENSOR][entity_id]
+        assert observer._entities[entity_id].value
+        assert observer._entities[entity_id].unit == "°C"
 
         update_mock.assert_called_once_with(entity_id, 5.5, "°C")
 
@@ -269,9 +261,8 @@ async def test_observer_update_handler_update_analog_state_all_states(
         observer = StateObserver(hass, coe, state_sender, entity_list)
         await observer.get_all_states()
 
-        assert len(observer._states[TYPE_BINARY]) == 0
-        assert len(observer._states[TYPE_SENSOR]) == 1
-        assert observer._states[TYPE_SENSOR][entity_id]
+        assert observer._entities[entity_id].value
+        assert observer._entities[entity_id].unit == "°C"
 
         get_mock.assert_called_with(entity_id)
 
@@ -299,7 +290,8 @@ async def test_observer_update_handler_update_same_state_analog(
     ):
         observer = StateObserver(hass, coe, state_sender, entity_list)
 
-        observer._states[TYPE_SENSOR] = {entity_id: "1"}
+        observer._entities[entity_id].value = 1.0
+        observer._entities[entity_id].unit = ""
 
         mock_state_change_event(hass, state, state)
         await asyncio.sleep(0.1)
@@ -328,9 +320,129 @@ async def test_observer_update_handler_update_same_state_digital(
         observer = StateObserver(hass, coe, state_sender, entity_list)
         new_state = State(entity_id, "on")
 
-        observer._states[TYPE_BINARY] = {entity_id: "on"}
+        observer._entities[entity_id].value = True
 
         mock_state_change_event(hass, new_state, new_state)
         await asyncio.sleep(0.1)
 
         sender_mock.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_observer_update_handler_unit_change_analog(hass: HomeAssistant):
+    """Test that an analog state with the same value but a new unit is sent."""
+    entity_id = "sensor.test5"
+    entity_list = {
+        CONF_ANALOG_ENTITIES: [ConfEntityToSend(3, entity_id)],
+        CONF_DIGITAL_ENTITIES: [],
+    }
+
+    with (
+        patch(STATE_AVAILABLE_PACKAGE, return_value=None),
+        patch(STATE_SENDER_STUB_UPDATE_ANALOG_PACKAGE) as update_mock,
+    ):
+        observer = StateObserver(hass, coe, state_sender, entity_list)
+
+        assert not observer._entities[entity_id].is_digital
+
+        observer._entities[entity_id].value = 1.0
+        observer._entities[entity_id].unit = "°C"
+
+        mock_state_change_event(
+            hass, State(entity_id, "1", attributes={ATTR_UNIT_OF_MEASUREMENT: "°C"})
+        )
+        await asyncio.sleep(0.1)
+        update_mock.assert_not_called()
+
+        mock_state_change_event(
+            hass, State(entity_id, "1", attributes={ATTR_UNIT_OF_MEASUREMENT: "K"})
+        )
+        await asyncio.sleep(0.1)
+        update_mock.assert_called_once_with(entity_id, 1, "K")
+
+
+@pytest.mark.asyncio
+async def test_observer_update_handler_deadband(hass: HomeAssistant):
+    """Test that analog changes inside the deadband are only stored in the sender."""
+    entity_id = "sensor.test6"
+    entity_list = {
+        CONF_ANALOG_ENTITIES: [ConfEntityToSend(1, entity_id, deadband=0.05)],
+        CONF_DIGITAL_ENTITIES: [],
+    }
+
+    with (
+        patch(STATE_AVAILABLE_PACKAGE, return_value=None),
+        patch(STATE_SENDER_STUB_UPDATE_ANALOG_PACKAGE) as update_mock,
+        patch(STATE_SENDER_UPDATE_ANALOG_MANUEL_PACKAGE) as manuel_mock,
+    ):
+        observer = StateObserver(hass, coe, state_sender, entity_list)
+
+        mock_state_change_event(hass, State(entity_id, "21.40"))
+        await asyncio.sleep(0.1)
+        update_mock.assert_called_once_with(entity_id, 21.4, "")
+
+        mock_state_change_event(hass, State(entity_id, "21.41"))
+        mock_state_change_event(hass, State(entity_id, "21.44"))
+        await asyncio.sleep(0.1)
+
+        update_mock.assert_called_once()
+        manuel_mock.assert_called_with(entity_id, 21.44, "")
+        assert observer._entities[entity_id].value == pytest.approx(21.4)
+
+        mock_state_change_event(hass, State(entity_id, "21.46"))
+        await asyncio.sleep(0.1)
+        update_mock.assert_called_with(entity_id, 21.46, "")
+
+
+@pytest.mark.parametrize(
+    ("value", "unit", "expected"),
+    [(101, "W", True), (102, "W", True), (103, "W", False), (101, "kW", False)],
+)
+def test_observed_entity_deadband_percent(value: float, unit: str, expected: bool):
+    """Test the relative deadband of an observed entity."""
+    record = ObservedEntity(
+        "sensor.test", False, deadband_percent=2, value=100, unit="W"
+    )
+
+    assert record.is_in_deadband(value, unit) is expected
+
+
+@pytest.mark.asyncio
+async def test_observer_set_entity_config_send_only_changed(hass: HomeAssistant):
+    """Test that a new entity config sends only added entities and tracks them."""
+    fake_coe = FakeCoE(node_count=0)
+    entity_list = {
+        CONF_ANALOG_ENTITIES: [ConfEntityToSend(1, "sensor.test_a")],
+        CONF_DIGITAL_ENTITIES: [ConfEntityToSend(1, "binary_sensor.test_b")],
+    }
+    sender = StateSenderV2(fake_coe, entity_list)
+
+    hass.states.async_set("sensor.test_a", "1", {ATTR_UNIT_OF_MEASUREMENT: "°C"})
+    hass.states.async_set("sensor.test_c", "3", {ATTR_UNIT_OF_MEASUREMENT: "°C"})
+    hass.states.async_set("binary_sensor.test_b", "on")
+
+    observer = StateObserver(hass, fake_coe, sender, entity_list, 0, 0)
+    await observer.get_all_states()
+
+    await observer.async_set_entity_config({
+        CONF_ANALOG_ENTITIES: [
+            ConfEntityToSend(1, "sensor.test_a"),
+            ConfEntityToSend(2, "sensor.test_c"),
+        ],
+        CONF_DIGITAL_ENTITIES: [],
+    })
+
+    assert fake_coe.stats.messages == 3
+    assert fake_coe.received[ChannelMode.ANALOG][2] == CoEChannel(
+        ChannelMode.ANALOG, 2, 3, "1"
+    )
+
+    hass.states.async_set("binary_sensor.test_b", "off")
+    hass.states.async_set("sensor.test_c", "4", {ATTR_UNIT_OF_MEASUREMENT: "°C"})
+    await asyncio.sleep(0.01)
+
+    assert fake_coe.stats.messages == 4
+    assert fake_coe.received[ChannelMode.ANALOG][2].value == 4
+    assert fake_coe.received[ChannelMode.DIGITAL][1].value is True
+
+    observer.stop()
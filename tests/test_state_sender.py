@@ -7,6 +7,7 @@ from custom_components.ta_coe.const import (
     CONF_DIGITAL_ENTITIES,
     ConfEntityToSend,
 )
+from custom_components.ta_coe.state_sender import build_unit_id_map
 from tests.common import StubStateSender
 
 coe = CoE("")
@@ -53,3 +54,13 @@ def test_senser_entity_count():
     """Test the entity count."""
     sender = StubStateSender(coe, DUMMY_SEND_CONFIG)
     assert sender.entity_count() == 4
+
+
+def test_build_unit_id_map():
+    """Test that the unit id map uses the first matching id and the remap."""
+    unit_ids = build_unit_id_map({"10": "99"})
+
+    assert unit_ids["°C"] == "1"
+    assert unit_ids["sec"] == "4"
+    assert unit_ids[""] == "0"
+    assert unit_ids["kW"] == "99"
@@ -12,6 +12,7 @@ from custom_components.ta_coe.const import (
     CONF_ANALOG_ENTITIES,
     CONF_DIGITAL_ENTITIES,
     DIGITAL_DOMAINS,
+    ConfEntityToSend,
 )
 from custom_components.ta_coe.state_sender_v1 import AnalogValue
 from tests import (
@@ -191,3 +192,133 @@ async def test_sender_update_analog():
         assert expected == sent_page
 
         assert expected_page_nr == sent_page_nr
+
+
+@pytest.mark.parametrize(
+    ("unit", "unit_id"),
+    [("°C", "46"), ("kW", "10"), ("K", "7"), ("", "0"), ("unknown", "0")],
+)
+def test_sender_convert_unit_to_id(unit: str, unit_id: str):
+    """Test the conversion of a unit to the unit id."""
+    assert StateSenderV1._convert_unit_to_id(unit) == unit_id
+
+
+@pytest.mark.asyncio
+async def test_sender_digital_last_slot_first_page():
+    """Test that the last slot of the first digital page is sent with the first page."""
+    entities_ids = create_dummy_conf_entity_to_send(DIGITAL_DOMAINS[0], 18)
+    sender = StateSenderV1(coe, {CONF_DIGITAL_ENTITIES: entities_ids})
+
+    with patch(COE_SEND_DIGITAL_VALUES_PACKAGE) as update_mock:
+        await sender.update_digital(entities_ids[15].entity_id, True)
+
+        update_mock.assert_called_once()
+        assert update_mock.call_args.args[0][15] == CoEChannel(
+            ChannelMode.DIGITAL, 15, True, ""
+        )
+        assert update_mock.call_args.args[1] is False
+
+
+@pytest.mark.asyncio
+async def test_sender_analog_slot_position_from_id():
+    """Test that an analog value is placed at the position of its configured id."""
+    entities_ids = [ConfEntityToSend(6, "sensor.test")]
+    sender = StateSenderV1(coe, {CONF_ANALOG_ENTITIES: entities_ids})
+
+    with patch(COE_SEND_ANALOG_VALUES_PACKAGE) as update_mock:
+        await sender.update_analog("sensor.test", 5.5, "°C")
+
+        update_mock.assert_called_once_with(
+            [
+                CoEChannel(ChannelMode.ANALOG, 4, 0, "0"),
+                CoEChannel(ChannelMode.ANALOG, 5, 5.5, "46"),
+                CoEChannel(ChannelMode.ANALOG, 6, 0, "0"),
+                CoEChannel(ChannelMode.ANALOG, 7, 0, "0"),
+            ],
+            2,
+        )
+
+
+@pytest.mark.asyncio
+async def test_sender_update_batch_send_dirty_pages():
+    """Test that a batch only sends the pages with changes."""
+    analog_ids = create_dummy_conf_entity_to_send(ANALOG_DOMAINS[0], 32)
+    digital_ids = create_dummy_conf_entity_to_send(DIGITAL_DOMAINS[0], 32)
+    sender = StateSenderV1(
+        coe, {CONF_ANALOG_ENTITIES: analog_ids, CONF_DIGITAL_ENTITIES: digital_ids}
+    )
+
+    with (
+        patch(COE_SEND_ANALOG_VALUES_PACKAGE) as analog_mock,
+        patch(COE_SEND_DIGITAL_VALUES_PACKAGE) as digital_mock,
+    ):
+        await sender.update_batch(
+            {
+                analog_ids[0].entity_id: AnalogValue(1, "°C"),
+                analog_ids[1].entity_id: AnalogValue(2, "°C"),
+                analog_ids[30].entity_id: AnalogValue(3, "°C"),
+            },
+            {digital_ids[20].entity_id: True},
+        )
+
+        assert [x.args[1] for x in analog_mock.call_args_list] == [1, 8]
+        assert [x.args[1] for x in digital_mock.call_args_list] == [True]
+
+        analog_mock.reset_mock()
+        digital_mock.reset_mock()
+
+        await sender.update_batch({}, {})
+
+        analog_mock.assert_not_called()
+        digital_mock.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_sender_refresh_only_stale_pages():
+    """Test that a refresh only sends the pages not sent within the maximum age."""
+    analog_ids = create_dummy_conf_entity_to_send(ANALOG_DOMAINS[0], 8)
+    sender = StateSenderV1(coe, {CONF_ANALOG_ENTITIES: analog_ids})
+
+    with (
+        patch(COE_SEND_ANALOG_VALUES_PACKAGE) as analog_mock,
+        patch(COE_SEND_DIGITAL_VALUES_PACKAGE) as digital_mock,
+    ):
+        await sender.update()
+        sender._last_sent[(ChannelMode.ANALOG, 1)] -= 100
+        analog_mock.reset_mock()
+        digital_mock.reset_mock()
+
+        assert await sender.refresh(50) == 1
+
+        assert [x.args[1] for x in analog_mock.call_args_list] == [2]
+        digital_mock.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_sender_set_entity_config_reset_removed_channels():
+    """Test that removed channels are reset and only their pages are sent."""
+    analog_ids = create_dummy_conf_entity_to_send(ANALOG_DOMAINS[0], 8)
+    sender = StateSenderV1(coe, {CONF_ANALOG_ENTITIES: analog_ids})
+
+    with patch(COE_SEND_ANALOG_VALUES_PACKAGE) as analog_mock:
+        await sender.update_batch(
+            {
+                analog_ids[0].entity_id: AnalogValue(1, "°C"),
+                analog_ids[5].entity_id: AnalogValue(2, "°C"),
+            },
+            {},
+        )
+        analog_mock.reset_mock()
+
+        sender.set_entity_config({
+            CONF_ANALOG_ENTITIES: [*analog_ids[:5], ConfEntityToSend(10, "sensor.new")]
+        })
+        await sender.update_batch({}, {})
+
+        assert [x.args[1] for x in analog_mock.call_args_list] == [2]
+        assert sender._analog_pages[1][1] == CoEChannel(ChannelMode.ANALOG, 5, 0, "0")
+
+    assert sender._analog_states["0"] == AnalogValue(1, "°C")
+    assert "5" not in sender._analog_states
+    assert sender._analog_states["9"] == AnalogValue(0, "0")
+    assert sender._index_from_id["sensor.new"] == "9"
@@ -23,6 +23,7 @@ from tests.const import (
     STATE_SENDER_V2_UPDATE_ANALOG_MANUEL_PACKAGE,
     STATE_SENDER_V2_UPDATE_DIGITAL_MANUEL_PACKAGE,
 )
+from tests.fake_coe import FakeCoE
 
 coe = CoE("")
 
@@ -154,3 +155,218 @@ async def test_sender_update_test_analog():
             assert actual_item.index == expected_item.index
             assert actual_item.value == expected_item.value
             assert actual_item.unit == expected_item.unit
+
+
+@pytest.mark.parametrize(
+    ("unit", "unit_id"),
+    [("°C", "1"), ("kW", "10"), ("K", "7"), ("", "0"), ("unknown", "0")],
+)
+def test_sender_convert_unit_to_id(unit: str, unit_id: str):
+    """Test the conversion of a unit to the unit id."""
+    assert StateSenderV2._convert_unit_to_id(unit) == unit_id
+
+
+@pytest.mark.asyncio
+async def test_sender_update_batch():
+    """Test that a batch is sent with one message per channel mode."""
+    analog_ids = create_dummy_conf_entity_to_send(ANALOG_DOMAINS[0], 3)
+    digital_ids = create_dummy_conf_entity_to_send(DIGITAL_DOMAINS[0], 2)
+    sender = StateSenderV2(
+        coe, {CONF_ANALOG_ENTITIES: analog_ids, CONF_DIGITAL_ENTITIES: digital_ids}
+    )
+
+    with (
+        patch(COE_SEND_ANALOG_VALUES_V2_PACKAGE) as analog_mock,
+        patch(COE_SEND_DIGITAL_VALUES_V2_PACKAGE) as digital_mock,
+    ):
+        await sender.update_batch(
+            {
+                analog_ids[0].entity_id: AnalogValue(1.5, "kW"),
+                analog_ids[2].entity_id: AnalogValue(3, "°C"),
+            },
+            {digital_ids[1].entity_id: True},
+        )
+
+        analog_mock.assert_called_once_with([
+            CoEChannel(ChannelMode.ANALOG, 1, 1.5, "10"),
+            CoEChannel(ChannelMode.ANALOG, 3, 3, "1"),
+        ])
+        digital_mock.assert_called_once_with([
+            CoEChannel(ChannelMode.DIGITAL, 2, True, "43")
+        ])
+
+    assert sender._analog_states["0"] == AnalogValue(1.5, "kW")
+    assert sender._analog_states["2"] == AnalogValue(3, "°C")
+    assert sender._digital_states["1"]
+
+
+@pytest.mark.asyncio
+async def test_sender_update_batch_only_analog():
+    """Test that no digital message is sent for a batch with only analog states."""
+    analog_ids = create_dummy_conf_entity_to_send(ANALOG_DOMAINS[0], 1)
+    sender = StateSenderV2(coe, {CONF_ANALOG_ENTITIES: analog_ids})
+
+    with (
+        patch(COE_SEND_ANALOG_VALUES_V2_PACKAGE) as analog_mock,
+        patch(COE_SEND_DIGITAL_VALUES_V2_PACKAGE) as digital_mock,
+    ):
+        await sender.update_batch(
+            {analog_ids[0].entity_id: AnalogValue(1.5, "kW")}, {}
+        )
+
+        analog_mock.assert_called_once()
+        digital_mock.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_sender_refresh_only_stale_slots():
+    """Test that a refresh only sends the slots not sent within the maximum age."""
+    analog_ids = create_dummy_conf_entity_to_send(ANALOG_DOMAINS[0], 2)
+    digital_ids = create_dummy_conf_entity_to_send(DIGITAL_DOMAINS[0], 1)
+    sender = StateSenderV2(
+        coe, {CONF_ANALOG_ENTITIES: analog_ids, CONF_DIGITAL_ENTITIES: digital_ids}
+    )
+
+    for entity in analog_ids:
+        sender.update_analog_manuel(entity.entity_id, 0, "")
+    sender.update_digital_manuel(digital_ids[0].entity_id, True)
+
+    with (
+        patch(COE_SEND_ANALOG_VALUES_V2_PACKAGE) as analog_mock,
+        patch(COE_SEND_DIGITAL_VALUES_V2_PACKAGE) as digital_mock,
+    ):
+        await sender.update()
+        sender._last_sent[(ChannelMode.ANALOG, 1)] -= 100
+        analog_mock.reset_mock()
+        digital_mock.reset_mock()
+
+        assert await sender.refresh(50) == 1
+
+        analog_mock.assert_called_once_with([
+            CoEChannel(ChannelMode.ANALOG, 2, 0, "0")
+        ])
+        digital_mock.assert_not_called()
+
+        analog_mock.reset_mock()
+
+        assert await sender.refresh(50) == 0
+        analog_mock.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_sender_refresh_only_outdated_oldest_first():
+    """Test that a refresh sends only the outdated slots, the oldest first."""
+    analog_ids = create_dummy_conf_entity_to_send(ANALOG_DOMAINS[0], 3)
+    sender = StateSenderV2(coe, {CONF_ANALOG_ENTITIES: analog_ids})
+
+    for entity in analog_ids:
+        sender.update_analog_manuel(entity.entity_id, 0, "")
+
+    with patch(COE_SEND_ANALOG_VALUES_V2_PACKAGE) as analog_mock:
+        await sender.update()
+        sender._last_sent[(ChannelMode.ANALOG, 2)] -= 70
+        sender._last_sent[(ChannelMode.ANALOG, 0)] -= 60
+        analog_mock.reset_mock()
+
+        assert await sender.refresh(50) == 2
+
+        analog_mock.assert_called_once_with([
+            CoEChannel(ChannelMode.ANALOG, 3, 0, "0"),
+            CoEChannel(ChannelMode.ANALOG, 1, 0, "0"),
+        ])
+
+
+@pytest.mark.asyncio
+async def test_sender_refresh_never_sent_slots():
+    """Test that a refresh sends the slots which were never sent."""
+    analog_ids = create_dummy_conf_entity_to_send(ANALOG_DOMAINS[0], 2)
+    sender = StateSenderV2(coe, {CONF_ANALOG_ENTITIES: analog_ids})
+
+    for entity in analog_ids:
+        sender.update_analog_manuel(entity.entity_id, 0, "")
+
+    with patch(COE_SEND_ANALOG_VALUES_V2_PACKAGE) as analog_mock:
+        assert await sender.refresh(10**9) == 2
+
+        analog_mock.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_sender_refresh_spread():
+    """Test that slots sent together are refreshed in several steps."""
+    analog_ids = create_dummy_conf_entity_to_send(ANALOG_DOMAINS[0], 10)
+    sender = StateSenderV2(coe, {CONF_ANALOG_ENTITIES: analog_ids})
+    sender.set_refresh_spread(80)
+
+    for entity in analog_ids:
+        sender.update_analog_manuel(entity.entity_id, 0, "")
+
+    refreshed: list[int] = []
+
+    with patch(COE_SEND_ANALOG_VALUES_V2_PACKAGE):
+        await sender.update()
+
+        # Simulate three refresh intervals of 100 seconds with ten steps each.
+        for _ in range(30):
+            for slot in sender._last_sent:
+                sender._last_sent[slot] -= 10
+
+            refreshed.append(await sender.refresh(90))
+
+    assert sum(refreshed[:9]) == 10
+    assert max(refreshed) <= 2
+
+
+@pytest.mark.asyncio
+async def test_sender_update_fake_coe():
+    """Test that all values arrive at a simulated server with one message per mode."""
+    fake_coe = FakeCoE(node_count=0)
+    analog_ids = create_dummy_conf_entity_to_send(ANALOG_DOMAINS[0], 3)
+    digital_ids = create_dummy_conf_entity_to_send(DIGITAL_DOMAINS[0], 2)
+    sender = StateSenderV2(
+        fake_coe,
+        {CONF_ANALOG_ENTITIES: analog_ids, CONF_DIGITAL_ENTITIES: digital_ids},
+    )
+
+    for entity in analog_ids:
+        sender.update_analog_manuel(entity.entity_id, 2.5, "°C")
+    for entity in digital_ids:
+        sender.update_digital_manuel(entity.entity_id, True)
+
+    await sender.update()
+
+    assert fake_coe.stats.messages == 2
+    assert fake_coe.received[ChannelMode.ANALOG] == {
+        i: CoEChannel(ChannelMode.ANALOG, i, 2.5, "1") for i in range(1, 4)
+    }
+    assert fake_coe.received[ChannelMode.DIGITAL] == {
+        i: CoEChannel(ChannelMode.DIGITAL, i, True, "43") for i in range(1, 3)
+    }
+
+
+def test_sender_set_entity_config_remove_channels():
+    """Test that the states of removed channels are no longer sent."""
+    analog_ids = create_dummy_conf_entity_to_send(ANALOG_DOMAINS[0], 2)
+    digital_ids = create_dummy_conf_entity_to_send(DIGITAL_DOMAINS[0], 2)
+    sender = StateSenderV2(
+        coe, {CONF_ANALOG_ENTITIES: analog_ids, CONF_DIGITAL_ENTITIES: digital_ids}
+    )
+
+    for entity in analog_ids:
+        sender.update_analog_manuel(entity.entity_id, 2.5, "°C")
+    for entity in digital_ids:
+        sender.update_digital_manuel(entity.entity_id, True)
+
+    sender.set_entity_config({
+        CONF_ANALOG_ENTITIES: analog_ids[:1],
+        CONF_DIGITAL_ENTITIES: [ConfEntityToSend(1, digital_ids[1].entity_id)],
+    })
+
+    assert sender._get_slots() == [
+        (ChannelMode.ANALOG, 0),
+        (ChannelMode.DIGITAL, 0),
+    ]
+    assert sender._index_from_id == {
+        analog_ids[0].entity_id: "0",
+        digital_ids[1].entity_id: "0",
+    }
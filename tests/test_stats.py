@@ -0,0 +1,104 @@
+"""Test the Technische Alternative CoE stats."""
+
+import pytest
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.typing import WebSocketGenerator
+from ta_cmi import ApiError, ChannelMode, CoEChannel
+
+from custom_components.ta_coe.stats import (
+    LATENCY_BUCKETS,
+    CoEStats,
+    LatencyHistogram,
+    StatsTransport,
+)
+from tests import setup_platform
+from tests.fake_coe import FakeCoE
+
+
+def test_histogram_record():
+    """Test that a duration is counted in the first bucket it fits."""
+    histogram = LatencyHistogram()
+
+    histogram.record(0.005)
+    histogram.record(0.3)
+    histogram.record(100)
+
+    data = histogram.as_dict()
+
+    assert data["count"] == 3
+    assert data["last"] == 100
+    assert data["max"] == 100
+    assert data["mean"] == pytest.approx(100.305 / 3)
+    assert data["buckets"]["le_0.01"] == 1
+    assert data["buckets"]["le_0.5"] == 1
+    assert data["buckets"]["le_inf"] == 1
+    assert len(data["buckets"]) == len(LATENCY_BUCKETS) + 1
+
+
+@pytest.mark.asyncio
+async def test_stats_transport_count_requests_and_messages():
+    """Test that all requests and sent channels are counted."""
+    stats = CoEStats()
+    transport = StatsTransport(FakeCoE(node_count=2), stats)
+
+    await transport.update(1)
+    await transport.send_analog_values_v2([
+        CoEChannel(ChannelMode.ANALOG, 1, 1, "1"),
+        CoEChannel(ChannelMode.ANALOG, 2, 1, "1"),
+    ])
+
+    assert stats.requests == 1
+    assert stats.request_latency.count == 1
+    assert stats.sent_messages == 1
+    assert stats.sent_channels == 2
+    assert stats.send_latency.count == 1
+    assert transport.get_channels(1, ChannelMode.ANALOG) != {}
+
+
+@pytest.mark.asyncio
+async def test_stats_transport_count_errors():
+    """Test that failed requests and messages are counted and raised."""
+    stats = CoEStats()
+    transport = StatsTransport(FakeCoE(node_count=1, loss=1), stats)
+
+    with pytest.raises(ApiError):
+        await transport.update(1)
+
+    with pytest.raises(ApiError):
+        await transport.send_digital_values([], False)
+
+    assert stats.request_errors == 1
+    assert stats.send_errors == 1
+    assert stats.send_latency.count == 1
+
+
+@pytest.mark.asyncio
+async def test_websocket_stats(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test that the stats of a loaded entry are returned."""
+    await setup_platform(hass, mock_config_entry)
+
+    client = await hass_ws_client(hass)
+    await client.send_json_auto_id({
+        "type": "ta_coe/stats",
+        "config_entry_id": mock_config_entry.entry_id,
+    })
+    response = await client.receive_json()
+
+    assert response["success"]
+    assert response["result"]["stats"]["polls"] == 1
+    assert response["result"]["stats"]["requests"] == 2
+    assert response["result"]["stats"]["queue_depth"] == 0
+    assert response["result"]["stats"]["queue_dropped"] == 0
+
+    await client.send_json_auto_id({
+        "type": "ta_coe/stats",
+        "config_entry_id": "unknown",
+    })
+    response = await client.receive_json()
+
+    assert not response["success"]
@@ -0,0 +1,35 @@
+"""Test the Technische Alternative CoE sampled trace."""
+
+import logging
+
+import pytest
+
+from custom_components.ta_coe.trace import SampledTrace
+
+LOGGER_NAME = "custom_components.ta_coe.trace"
+
+
+def test_trace_log_one_in_n(caplog: pytest.LogCaptureFixture):
+    """Test that only every N-th event is logged."""
+    trace = SampledTrace(logging.getLogger(LOGGER_NAME), 3)
+
+    with caplog.at_level(logging.DEBUG, LOGGER_NAME):
+        for i in range(7):
+            trace("Event %s", i)
+
+    assert [x.getMessage() for x in caplog.records] == [
+        "Event 2 (1 of 3 events)",
+        "Event 5 (1 of 3 events)",
+    ]
+
+
+def test_trace_disabled(caplog: pytest.LogCaptureFixture):
+    """Test that nothing is logged and counted without debug logging."""
+    logger = logging.getLogger(LOGGER_NAME)
+    trace = SampledTrace(logger, 1)
+
+    with caplog.at_level(logging.INFO, LOGGER_NAME):
+        trace("Event %s", 1)
+
+    assert caplog.records == []
+    assert trace._count == 0